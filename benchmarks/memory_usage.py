@@ -0,0 +1,59 @@
+"""
+Measures the memory used per object by Bound, Interval and Linked_Interval.
+
+The classes use __slots__; for comparison, each is also measured through a subclass which has a per-instance __dict__,
+like the layout used before __slots__ were introduced (where every Interval also stored an empty _linked_objects tuple).
+
+Run from the repository root:
+	python benchmarks/memory_usage.py
+"""
+
+import sys
+import os
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from nicks_intervals.Bound import Bound, PART_OF_LEFT, PART_OF_RIGHT
+from nicks_intervals.Interval import Interval, Linked_Interval
+
+
+class Bound_With_Dict(Bound):
+	def __init__(self, value, part_of_left):
+		super().__init__(value, part_of_left)
+		self.__dict__
+
+
+class Interval_With_Dict(Interval):
+	def __init__(self, lower_bound, upper_bound):
+		super().__init__(lower_bound, upper_bound)
+		self.__dict__["_linked_objects"] = tuple()
+
+
+COUNT = 100_000
+
+
+def measure_bytes_per_object(factory) -> float:
+	tracemalloc.start()
+	objects = [factory(index) for index in range(COUNT)]
+	size, _ = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	del objects
+	return size / COUNT
+
+
+def main():
+	cases = [
+		("Bound", lambda index: Bound(float(index), PART_OF_RIGHT), lambda index: Bound_With_Dict(float(index), PART_OF_RIGHT)),
+		("Interval (including bounds)", lambda index: Interval(Bound(float(index), PART_OF_RIGHT), Bound(index + 1.0, PART_OF_LEFT)), lambda index: Interval_With_Dict(Bound_With_Dict(float(index), PART_OF_RIGHT), Bound_With_Dict(index + 1.0, PART_OF_LEFT))),
+		("Linked_Interval (including bounds)", lambda index: Linked_Interval(Interval.closed(index, index + 1), ("segment",)), None),
+	]
+	print(f"{'object':<38}{'__slots__':>12}{'__dict__':>12}")
+	for name, slots_factory, dict_factory in cases:
+		slots_bytes = measure_bytes_per_object(slots_factory)
+		dict_bytes = measure_bytes_per_object(dict_factory) if dict_factory is not None else float('nan')
+		print(f"{name:<38}{slots_bytes:>12.1f}{dict_bytes:>12.1f}")
+
+
+if __name__ == "__main__":
+	main()
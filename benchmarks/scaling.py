@@ -0,0 +1,278 @@
+"""
+Scaling benchmarks for the _operators entry points.
+
+Each operation is timed on synthetic workloads at increasing sizes n, and the peak memory of one run is measured with tracemalloc.
+A scaling exponent k (time ~ n^k) is fitted by least squares on log(time) against log(n).
+
+Workloads:
+	road        - disjoint, end to end segments (like a road network ordered by chainage)
+	midi        - heavily overlapping intervals (like notes in a midi file)
+	degenerate  - half of the intervals are degenerate [x, x]
+
+Run from the repository root:
+	python benchmarks/scaling.py                           # n = 10^2 .. 10^4
+	python benchmarks/scaling.py --max-exponent 6          # n = 10^2 .. 10^6
+	python benchmarks/scaling.py --save-baseline           # store the results in benchmarks/baseline.json
+	python benchmarks/scaling.py --operation subtract      # only operations whose name contains 'subtract'
+
+If a baseline file exists, the results are compared against it and regressions are flagged; the exit code is 1 if any were found.
+Larger sizes of an operation are skipped when, assuming linear scaling, a run is expected to take longer than --time-limit seconds.
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple, Any
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from nicks_intervals.Interval import Interval
+from nicks_intervals.Multi_Interval import Multi_Interval
+from nicks_intervals.Interval_Map import Interval_Map
+from nicks_intervals.Interval_Multi_Map import Interval_Multi_Map
+from nicks_intervals.Interval_Multi_Map_Builder import Interval_Multi_Map_Builder
+import nicks_intervals._operators as ops
+
+DEFAULT_BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+##############################################
+# WORKLOADS
+#############################################
+
+def road_workload(n: int, seed: int) -> List[Interval]:
+	rng = random.Random(seed)
+	result = []
+	position = 0.0
+	for _ in range(n):
+		length = rng.randint(1, 100)
+		if rng.random() < 0.1:
+			position += rng.randint(1, 50)
+		result.append(Interval.closed_open(position, position + length))
+		position += length
+	return result
+
+
+def midi_workload(n: int, seed: int) -> List[Interval]:
+	rng = random.Random(seed)
+	# about 20 notes are sounding at any time
+	span = n * 5
+	result = []
+	for _ in range(n):
+		start = rng.randint(0, span)
+		result.append(Interval.closed_open(start, start + rng.randint(1, 200)))
+	return result
+
+
+def degenerate_workload(n: int, seed: int) -> List[Interval]:
+	rng = random.Random(seed)
+	result = []
+	for _ in range(n):
+		position = rng.randint(0, n * 10)
+		if rng.random() < 0.5:
+			result.append(Interval.degenerate(position))
+		else:
+			result.append(rng.choice([Interval.closed, Interval.open, Interval.closed_open, Interval.open_closed])(position, position + rng.randint(1, 20)))
+	return result
+
+
+WORKLOADS: Dict[str, Callable[[int, int], List[Interval]]] = {
+	"road": road_workload,
+	"midi": midi_workload,
+	"degenerate": degenerate_workload,
+}
+
+
+##############################################
+# OPERATIONS
+#  each operation is (name, setup(workload, n) -> arguments, run(arguments))
+#  only the run function is timed
+#############################################
+
+def two_operands(workload: Callable[[int, int], List[Interval]], n: int) -> Tuple[Multi_Interval, Multi_Interval]:
+	return Multi_Interval(workload(n, 0)), Multi_Interval(workload(n, 1))
+
+
+def query_values(workload: Callable[[int, int], List[Interval]], n: int) -> Tuple[Multi_Interval, List[float]]:
+	a = Multi_Interval(sorted(workload(n, 0), key=lambda interval: interval.lower_bound.value))
+	upper_value = max(interval.upper_bound.value for interval in a) if a else 1
+	rng = random.Random(2)
+	return a, [rng.uniform(0, upper_value) for _ in range(1000)]
+
+
+def interval_multi_map(workload: Callable[[int, int], List[Interval]], n: int) -> Interval_Multi_Map:
+	rng = random.Random(3)
+	links = []
+	for interval in workload(n, 0):
+		offset = rng.choice([0, 0, 0, 1000])
+		links.append((interval, ops.translated([interval], offset)[0]))
+	return Interval_Multi_Map(links)
+
+
+def map_values_setup(workload: Callable[[int, int], List[Interval]], n: int) -> Tuple[Interval_Multi_Map, List[float]]:
+	_, values = query_values(workload, n)
+	return interval_multi_map(workload, n), values
+
+
+
+def builder_links(workload: Callable[[int, int], List[Interval]], n: int) -> List[Interval_Map]:
+	"""links from the workload to scattered to-intervals, after one link whose from-interval spans the whole workload"""
+	rng = random.Random(4)
+	intervals = workload(n, 0)
+	upper_value = max((interval.upper_bound.value for interval in intervals), default=1)
+	links = [Interval_Map(Interval.closed_open(0, upper_value), Interval.closed_open(-100, -50))]
+	for interval in intervals:
+		to_lower_value = rng.uniform(0, 100 * upper_value)
+		links.append(Interval_Map(interval, Interval.closed_open(to_lower_value, to_lower_value + interval.length + 1)))
+	return links
+
+
+def build_multi_map(links: List[Interval_Map]) -> Interval_Multi_Map:
+	builder = Interval_Multi_Map_Builder()
+	for link in links:
+		builder.add(link)
+	return builder.freeze()
+
+OPERATIONS: List[Tuple[str, Callable, Callable]] = [
+	("subtract", two_operands, lambda args: ops.subtract(*args)),
+	("intersect", two_operands, lambda args: ops.intersect(*args)),
+	("exterior", lambda workload, n: Multi_Interval(workload(n, 0)), ops.exterior),
+	("interior_merged", lambda workload, n: Multi_Interval(workload(n, 0)), ops.interior_merged),
+	("union_merge_touching", two_operands, lambda args: ops.union_merge_touching(*args)),
+	("union_merge_intersecting", two_operands, lambda args: ops.union_merge_intersecting(*args)),
+	("union_merge_intersecting_or_touching", two_operands, lambda args: ops.union_merge_intersecting_or_touching(*args)),
+	("eq", lambda workload, n: (Multi_Interval(workload(n, 0)), Multi_Interval(reversed(workload(n, 0)))), lambda args: ops.eq(*args)),
+	("contains_value (1000 queries)", query_values, lambda args: [ops.contains_value(args[0], value) for value in args[1]]),
+	("Interval_Multi_Map.map_value (1000 queries)", map_values_setup, lambda args: [args[0].map_value(value) for value in args[1]]),
+	("Interval_Multi_Map.map_values (1000 queries)", map_values_setup, lambda args: args[0].map_values(args[1])),
+	("Interval_Multi_Map.map_intervals", lambda workload, n: (interval_multi_map(workload, n), workload(n, 1)), lambda args: args[0].map_intervals(args[1])),
+	("Interval_Multi_Map_Builder.add", builder_links, build_multi_map),
+	("Interval_Multi_Map.merge_on_predicates", interval_multi_map, lambda multi_map: multi_map.merge_on_predicates(Interval_Multi_Map.predicate_touching, Interval_Multi_Map.predicate_touching)),
+]
+
+
+##############################################
+# MEASUREMENT
+#############################################
+
+def measure(setup: Callable, run: Callable, workload: Callable, n: int, repeats: int) -> Dict[str, float]:
+	best_seconds = math.inf
+	for _ in range(repeats):
+		# fresh arguments each time, so values cached on a Multi_Interval by the previous run are not reused
+		arguments = setup(workload, n)
+		start = time.perf_counter()
+		run(arguments)
+		best_seconds = min(best_seconds, time.perf_counter() - start)
+
+	arguments = setup(workload, n)
+	tracemalloc.start()
+	run(arguments)
+	_, peak_bytes = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	return {"seconds": best_seconds, "peak_bytes": peak_bytes}
+
+
+def fit_scaling_exponent(results: Dict[str, Dict[str, float]]) -> float:
+	"""least squares slope of log(seconds) against log(n); nan if there are not enough points"""
+	points = [(math.log(int(n)), math.log(result["seconds"])) for n, result in results.items() if result["seconds"] > 0]
+	if len(points) < 2:
+		return math.nan
+	mean_x = sum(x for x, _ in points) / len(points)
+	mean_y = sum(y for _, y in points) / len(points)
+	variance = sum((x - mean_x) ** 2 for x, _ in points)
+	if variance == 0:
+		return math.nan
+	return sum((x - mean_x) * (y - mean_y) for x, y in points) / variance
+
+
+def compare_to_baseline(results: Dict[str, Any], baseline: Dict[str, Any], time_tolerance: float, exponent_tolerance: float) -> List[str]:
+	regressions = []
+	for key, result in results.items():
+		if key not in baseline:
+			continue
+		for n, measurement in result["sizes"].items():
+			baseline_measurement = baseline[key]["sizes"].get(n)
+			if baseline_measurement is None:
+				continue
+			ratio = measurement["seconds"] / baseline_measurement["seconds"] if baseline_measurement["seconds"] > 0 else math.inf
+			if ratio > 1 + time_tolerance:
+				regressions.append(f"{key} n={n}: {measurement['seconds']:.4f}s is {ratio:.2f}x the baseline {baseline_measurement['seconds']:.4f}s")
+		exponent = result["exponent"]
+		baseline_exponent = baseline[key].get("exponent")
+		if baseline_exponent is not None and not math.isnan(exponent) and not math.isnan(baseline_exponent) and exponent > baseline_exponent + exponent_tolerance:
+			regressions.append(f"{key}: scaling exponent {exponent:.2f} is above the baseline {baseline_exponent:.2f}")
+	return regressions
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("--min-exponent", type=int, default=2, help="smallest n is 10^min_exponent")
+	parser.add_argument("--max-exponent", type=int, default=4, help="largest n is 10^max_exponent")
+	parser.add_argument("--repeats", type=int, default=3, help="each size is timed this many times and the best time is kept")
+	parser.add_argument("--time-limit", type=float, default=10.0, help="skip sizes of an operation which are expected to take longer than this many seconds")
+	parser.add_argument("--operation", default="", help="only run operations whose name contains this text")
+	parser.add_argument("--workload", default="", help="only run workloads whose name contains this text")
+	parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH, help="path of the baseline json file")
+	parser.add_argument("--save-baseline", action="store_true", help="write the results to the baseline file instead of comparing")
+	parser.add_argument("--time-tolerance", type=float, default=0.5, help="flag a regression if a time exceeds the baseline by this fraction")
+	parser.add_argument("--exponent-tolerance", type=float, default=0.2, help="flag a regression if the scaling exponent exceeds the baseline by this much")
+	arguments = parser.parse_args()
+
+	sizes = [10 ** exponent for exponent in range(arguments.min_exponent, arguments.max_exponent + 1)]
+	results: Dict[str, Any] = {}
+	print(f"{'operation':<46}{'workload':<12}{'n':>10}{'seconds':>12}{'peak MB':>10}")
+	for operation_name, setup, run in OPERATIONS:
+		if arguments.operation not in operation_name:
+			continue
+		for workload_name, workload in WORKLOADS.items():
+			if arguments.workload not in workload_name:
+				continue
+			key = f"{operation_name} / {workload_name}"
+			sizes_results = {}
+			previous_n, previous_seconds = None, 0.0
+			for n in sizes:
+				# assuming at least linear scaling, skip sizes that are expected to go over the time limit
+				if previous_n is not None and previous_seconds * n / previous_n > arguments.time_limit:
+					print(f"{operation_name:<46}{workload_name:<12}{n:>10}  skipped, expected to take over {arguments.time_limit}s")
+					break
+				measurement = measure(setup, run, workload, n, arguments.repeats)
+				sizes_results[str(n)] = measurement
+				print(f"{operation_name:<46}{workload_name:<12}{n:>10}{measurement['seconds']:>12.5f}{measurement['peak_bytes'] / 1e6:>10.2f}")
+				previous_n, previous_seconds = n, measurement["seconds"]
+			results[key] = {"sizes": sizes_results, "exponent": fit_scaling_exponent(sizes_results)}
+
+	print()
+	print(f"{'operation / workload':<60}{'exponent':>10}")
+	for key, result in results.items():
+		print(f"{key:<60}{result['exponent']:>10.2f}")
+
+	if arguments.save_baseline:
+		with open(arguments.baseline, "w") as file:
+			json.dump(results, file, indent="\t")
+		print(f"\nbaseline written to {arguments.baseline}")
+		return 0
+
+	if not os.path.exists(arguments.baseline):
+		print(f"\nno baseline found at {arguments.baseline}; run with --save-baseline to create one")
+		return 0
+
+	with open(arguments.baseline) as file:
+		baseline = json.load(file)
+	regressions = compare_to_baseline(results, baseline, arguments.time_tolerance, arguments.exponent_tolerance)
+	print()
+	if regressions:
+		print("REGRESSIONS:")
+		for regression in regressions:
+			print("  " + regression)
+		return 1
+	print("no regressions against the baseline")
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Union
+from typing import TYPE_CHECKING, Union, Optional
 
 if TYPE_CHECKING:
 	from NicksIntervals.Interval import Interval, Linked_Interval
 import math
+import weakref
 
 
 PART_OF_LEFT = True
@@ -13,6 +14,9 @@ PART_OF_RIGHT = False
 
 class Bound:
 	
+	# __weakref__ is needed by the interning cache, see Bound.enable_interning()
+	__slots__ = ('__value', '__part_of_left', '__weakref__')
+	
 	def __init__(self, value: float, part_of_left: bool):
 		"""
 		:param value: The floating point value of the bound.
@@ -37,15 +41,52 @@ class Bound:
 		elif self.__value == float("inf") and self.part_of_right:
 			raise Exception("Bounds at inf must be included_in_left")
 	
+	@classmethod
+	def get(cls, value: float, part_of_left: bool) -> Bound:
+		"""
+		Same as Bound(value, part_of_left), except that when interning is enabled (see Bound.enable_interning())
+		an existing identical Bound is returned if there is one.
+		The Interval factory methods and the scaled / translated / inverted methods all create bounds through this method.
+		"""
+		if _intern_cache is None:
+			return Bound(value, part_of_left)
+		return _intern_cache.get(value, part_of_left)
+	
+	@classmethod
+	def enable_interning(cls, max_size: int = 1_000_000):
+		"""
+		Opt-in flyweight cache for Bound.get(). Bounds are held by weak references so that unused bounds are still freed.
+		Once the cache holds max_size bounds, new bounds are created but not cached.
+		"""
+		global _intern_cache
+		_intern_cache = _Bound_Intern_Cache(max_size)
+	
+	@classmethod
+	def disable_interning(cls):
+		global _intern_cache
+		_intern_cache = None
+	
+	@classmethod
+	def _unchecked(cls, value: float, part_of_left: bool) -> Bound:
+		"""Skips validation; for a value and direction that are already known to form a valid bound"""
+		result = cls.__new__(cls)
+		result.__value = value
+		result.__part_of_left = part_of_left
+		return result
+	
 	def __hash__(self):
 		return hash((self.__value, self.__part_of_left))
 	
 	def __eq__(self, other):
+		if self is other:
+			return True
 		if isinstance(other, Bound):
 			return math.isclose(self.__value, other.__value) and self.__part_of_left == other.__part_of_left
 		return NotImplemented
 	
 	def __gt__(self, other):
+		if self is other:
+			return False
 		if isinstance(other, Bound):
 			if math.isclose(self.__value, other.__value):
 				return self.part_of_left and other.part_of_right
@@ -53,6 +94,8 @@ class Bound:
 		return NotImplemented
 		
 	def __lt__(self, other):
+		if self is other:
+			return False
 		if isinstance(other, Bound):
 			if math.isclose(self.__value, other.__value):
 				return self.part_of_right and other.part_of_left
@@ -60,16 +103,16 @@ class Bound:
 		return NotImplemented
 	
 	def scaled(self, scale_factor: float) -> Bound:
-		return Bound(self.__value * scale_factor, self.__part_of_left)
+		return Bound.get(self.__value * scale_factor, self.__part_of_left)
 	
 	def translated(self, translation: float) -> Bound:
-		return Bound(self.__value + translation, self.__part_of_left)
+		return Bound.get(self.__value + translation, self.__part_of_left)
 	
 	def translated_then_scaled(self, translation: float, scale_factor: float):
-		return Bound((self.__value + translation) * scale_factor, self.__part_of_left)
+		return Bound.get((self.__value + translation) * scale_factor, self.__part_of_left)
 	
 	def scaled_then_translated(self, scale_factor: float, translation: float):
-		return Bound(self.__value * scale_factor + translation, self.__part_of_left)
+		return Bound.get(self.__value * scale_factor + translation, self.__part_of_left)
 	
 	@property
 	def value(self):
@@ -86,7 +129,7 @@ class Bound:
 		return not self.__part_of_left
 	
 	def inverted(self):
-		return Bound(float(self), not self.__part_of_left)
+		return Bound.get(float(self), not self.__part_of_left)
 	
 	def __format__(self, format_spec):
 		arrow = "🡆"
@@ -101,11 +144,37 @@ class Bound:
 		return Linked_Bound(self, linked_interval, is_lower_bound)
 
 
+class _Bound_Intern_Cache:
+	"""Bounded weak-value cache of Bound objects keyed by (value, type of value, part_of_left)"""
+	
+	def __init__(self, max_size: int):
+		self.__max_size = max_size
+		self.__bounds: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+	
+	def __len__(self):
+		return len(self.__bounds)
+	
+	def get(self, value: float, part_of_left: bool) -> Bound:
+		key = (value, type(value), part_of_left)
+		bound = self.__bounds.get(key)
+		if bound is None:
+			bound = Bound(value, part_of_left)
+			if len(self.__bounds) < self.__max_size:
+				self.__bounds[key] = bound
+		return bound
+
+
+_intern_cache: Optional[_Bound_Intern_Cache] = None
+
+
 iBound_Negative_Infinity = Bound(float('-inf'), PART_OF_RIGHT)
 iBound_Positive_Infinity = Bound(float('inf'), PART_OF_LEFT)
 
 
 class Linked_Bound(Bound):
+	
+	__slots__ = ('__interval', '__is_lower_bound')
+	
 	def __init__(self, bound: Bound, interval: Interval, is_lower_bound: bool):
 		"""
 		This class allows intervals to be decomposed into bounds without forgetting where the bound came from and if it was and an upper or lower bound.
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import bisect
+import itertools
+import math
+from array import array
+from typing import Collection, Dict, List, Optional
+
+from . import _operators as ops
+from . import _sweep as sweep
+from .Bound import Bound, iBound_Negative_Infinity, iBound_Positive_Infinity
+from .Interval import Interval
+
+
+class Coverage_Profile:
+	"""
+	Immutable step function giving the number of sub-intervals of a collection which cover each value (the stack height of the sweep).
+	Overlapping sub-intervals each add one to the depth, so for notes from a midi file the depth is the polyphony.
+
+	The number line is divided into segments at breakpoints; the breakpoints are the bounds where the depth changes.
+	Segment i lies between breakpoint i - 1 and breakpoint i (the first and last segments reach -inf and inf).
+	The value of a breakpoint belongs to the segment on its left if the bound is part_of_left, otherwise to the segment on its right.
+	Breakpoints are stored in a float64 array of values and a bool array of part_of_left, and the depth of each segment in an int64 array.
+
+	The collection is swept once when the profile is built;
+	depth_at() is a binary search, and max_depth_in() is a binary search plus a sparse table lookup.
+	"""
+
+	def __init__(self, intervals: Collection[Interval]):
+		self.__breakpoint_values = array('d')
+		self.__breakpoint_part_of_left = array('B')
+		self.__depths = array('q', [0])
+		self.__sparse_table: Optional[List[array]] = None
+		self.__intervals_with_depth_at_least: Dict[int, Collection[Interval]] = {}
+
+		sorted_events, _ = ops.get_sorted_bound_events(intervals)
+		depth = 0
+		previous_event = sweep.NEGATIVE_INFINITY_EVENT
+		for event in itertools.chain(sorted_events, (sweep.POSITIVE_INFINITY_EVENT,)):
+			# pairs of equal bounds enclose nothing and are skipped
+			if not sweep.bound_eq(previous_event, event) and depth != self.__depths[-1]:
+				self.__breakpoint_values.append(previous_event[0])
+				self.__breakpoint_part_of_left.append(sweep.part_of_left(previous_event))
+				self.__depths.append(depth)
+			if event[2] != sweep.SOURCE_INFINITY:
+				depth += 1 if event[1] & 1 else -1
+			previous_event = event
+
+	def __len__(self):
+		"""The number of segments"""
+		return len(self.__depths)
+
+	def __repr__(self):
+		return f"{self.__class__.__name__}[{len(self)}](max_depth={self.max_depth})"
+
+	@property
+	def breakpoint_values(self) -> memoryview:
+		return memoryview(self.__breakpoint_values).toreadonly()
+
+	@property
+	def breakpoint_part_of_left(self) -> memoryview:
+		return memoryview(self.__breakpoint_part_of_left).toreadonly()
+
+	@property
+	def depths(self) -> memoryview:
+		return memoryview(self.__depths).toreadonly()
+
+	@property
+	def max_depth(self) -> int:
+		return max(self.__depths)
+
+	def segment_index(self, value: float) -> int:
+		"""
+		Index of the segment containing the value. Values which are math.isclose() to a breakpoint are treated as equal to it.
+		The value is to the right of a breakpoint if it is greater, or if it is equal and the breakpoint is not part_of_left;
+		this holds for a prefix of the breakpoints, so the index is the length of that prefix.
+		"""
+		breakpoint_values = self.__breakpoint_values
+		index = bisect.bisect_left(breakpoint_values, value)
+		while index > 0 and math.isclose(breakpoint_values[index - 1], value):
+			index -= 1
+		while index < len(breakpoint_values) and self.__is_right_of_breakpoint(value, index):
+			index += 1
+		return index
+
+	def __is_right_of_breakpoint(self, value: float, index: int) -> bool:
+		breakpoint_value = self.__breakpoint_values[index]
+		if breakpoint_value == value or math.isclose(breakpoint_value, value):
+			return not self.__breakpoint_part_of_left[index]
+		return breakpoint_value < value
+
+	def depth_at(self, value: float) -> int:
+		"""The number of sub-intervals which contain the value"""
+		return self.__depths[self.segment_index(value)]
+
+	def max_depth_in(self, lower_value: float, upper_value: float) -> int:
+		"""The greatest depth at any value from lower_value to upper_value inclusive"""
+		if lower_value > upper_value:
+			raise Exception(f"lower_value must not be greater than upper_value: {lower_value} > {upper_value}")
+		first_index = self.segment_index(lower_value)
+		last_index = self.segment_index(upper_value)
+		sparse_table = self.__get_sparse_table()
+		level = (last_index - first_index + 1).bit_length() - 1
+		return max(sparse_table[level][first_index], sparse_table[level][last_index - (1 << level) + 1])
+
+	def __get_sparse_table(self) -> List[array]:
+		"""sparse_table[level][index] is the max depth of the 2**level segments starting at index. Built on first use."""
+		if self.__sparse_table is None:
+			sparse_table = [self.__depths]
+			width = 1
+			while width * 2 <= len(self.__depths):
+				previous_level = sparse_table[-1]
+				sparse_table.append(array('q', map(max, previous_level[:len(previous_level) - width], previous_level[width:])))
+				width *= 2
+			self.__sparse_table = sparse_table
+		return self.__sparse_table
+
+	def intervals_with_depth_at_least(self, depth: int) -> Collection[Interval]:
+		"""The maximal intervals in which at least depth sub-intervals overlap. Results are cached for each depth."""
+		if depth <= 0:
+			return Interval.complete()
+		if depth not in self.__intervals_with_depth_at_least:
+			result = []
+			run_start: Optional[int] = None
+			for index, segment_depth in enumerate(self.__depths):
+				if segment_depth >= depth:
+					if run_start is None:
+						run_start = index
+				elif run_start is not None:
+					result.append(Interval(self.__lower_bound_of_segment(run_start), self.__upper_bound_of_segment(index - 1)))
+					run_start = None
+			if run_start is not None:
+				result.append(Interval(self.__lower_bound_of_segment(run_start), self.__upper_bound_of_segment(len(self.__depths) - 1)))
+			self.__intervals_with_depth_at_least[depth] = ops.coerce_collection_to_Interval_or_Multi_Interval(result)
+		return self.__intervals_with_depth_at_least[depth]
+
+	def __lower_bound_of_segment(self, index: int) -> Bound:
+		if index == 0:
+			return iBound_Negative_Infinity
+		return self.__breakpoint(index - 1)
+
+	def __upper_bound_of_segment(self, index: int) -> Bound:
+		if index == len(self.__breakpoint_values):
+			return iBound_Positive_Infinity
+		return self.__breakpoint(index)
+
+	def __breakpoint(self, index: int) -> Bound:
+		value = self.__breakpoint_values[index]
+		if value == float('-inf'):
+			return iBound_Negative_Infinity
+		if value == float('inf'):
+			return iBound_Positive_Infinity
+		return Bound._unchecked(value, bool(self.__breakpoint_part_of_left[index]))
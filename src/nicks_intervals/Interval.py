@@ -21,6 +21,7 @@ from .Bound import iBound_Positive_Infinity
 from . import _operators as ops
 if TYPE_CHECKING:
 	from .Multi_Interval import Multi_Interval
+	from .expression import Expression
 
 T = TypeVar("T")
 
@@ -28,6 +29,11 @@ T = TypeVar("T")
 class Interval:
 	"""Immutable Interval based on python's built in floats. Nothing fancy."""
 	
+	__slots__ = ('__lower_bound', '__upper_bound')
+	
+	# Only Linked_Interval stores linked objects; all other intervals share this empty tuple
+	_linked_objects = tuple()
+	
 	@classmethod
 	def complete(cls):
 		"""returns an interval spanning the complete real number line. Or at least all representable python floats."""
@@ -41,39 +47,39 @@ class Interval:
 	@classmethod
 	def degenerate(cls, value: float = 0.0):
 		"""returns a zero-length 'degenerate' interval"""
-		return Interval(Bound(value, PART_OF_RIGHT), Bound(value, PART_OF_LEFT))
+		return Interval(Bound.get(value, PART_OF_RIGHT), Bound.get(value, PART_OF_LEFT))
 	
 	@classmethod
 	def closed(cls, lower_bound: float, upper_bound: float):
-		return Interval(Bound(lower_bound, PART_OF_RIGHT), Bound(upper_bound, PART_OF_LEFT))
+		return Interval(Bound.get(lower_bound, PART_OF_RIGHT), Bound.get(upper_bound, PART_OF_LEFT))
 	
 	@classmethod
 	def open(cls, lower_bound: float, upper_bound: float):
-		return Interval(Bound(lower_bound, PART_OF_LEFT), Bound(upper_bound, PART_OF_RIGHT))
+		return Interval(Bound.get(lower_bound, PART_OF_LEFT), Bound.get(upper_bound, PART_OF_RIGHT))
 	
 	@classmethod
 	def open_closed(cls, lower_bound: float, upper_bound: float):
-		return Interval(Bound(lower_bound, PART_OF_LEFT), Bound(upper_bound, PART_OF_LEFT))
+		return Interval(Bound.get(lower_bound, PART_OF_LEFT), Bound.get(upper_bound, PART_OF_LEFT))
 	
 	@classmethod
 	def closed_open(cls, lower_bound: float, upper_bound: float):
-		return Interval(Bound(lower_bound, PART_OF_RIGHT), Bound(upper_bound, PART_OF_RIGHT))
+		return Interval(Bound.get(lower_bound, PART_OF_RIGHT), Bound.get(upper_bound, PART_OF_RIGHT))
 	
 	@classmethod
 	def inf_open(cls, upper_bound: float):
-		return Interval(iBound_Negative_Infinity, Bound(upper_bound, PART_OF_RIGHT))
+		return Interval(iBound_Negative_Infinity, Bound.get(upper_bound, PART_OF_RIGHT))
 	
 	@classmethod
 	def open_inf(cls, lower_bound: float):
-		return Interval(Bound(lower_bound, PART_OF_LEFT), iBound_Positive_Infinity)
+		return Interval(Bound.get(lower_bound, PART_OF_LEFT), iBound_Positive_Infinity)
 	
 	@classmethod
 	def closed_inf(cls, lower_bound: float):
-		return Interval(Bound(lower_bound, PART_OF_RIGHT), iBound_Positive_Infinity)
+		return Interval(Bound.get(lower_bound, PART_OF_RIGHT), iBound_Positive_Infinity)
 	
 	@classmethod
 	def inf_closed(cls, upper_bound: float):
-		return Interval(iBound_Negative_Infinity, Bound(upper_bound, PART_OF_LEFT))
+		return Interval(iBound_Negative_Infinity, Bound.get(upper_bound, PART_OF_LEFT))
 	
 	@classmethod
 	def empty(cls):
@@ -89,6 +95,14 @@ class Interval:
 	def coerce_collection_to_Interval_or_None(cls, collection: Collection[Interval]):
 		return ops.coerce_collection_to_Interval_or_Multi_Interval(collection)
 	
+	@classmethod
+	def _unchecked(cls, lower_bound: Bound, upper_bound: Bound) -> Interval:
+		"""Skips validation; for bounds that are already known to form a valid interval"""
+		result = cls.__new__(cls)
+		result.__lower_bound = lower_bound
+		result.__upper_bound = upper_bound
+		return result
+	
 	def __init__(self, lower_bound: Bound, upper_bound: Bound):
 		if not (isinstance(lower_bound, Bound) and isinstance(upper_bound, Bound)):
 			raise TypeError("Bounds must be an instance of iBound")
@@ -96,7 +110,6 @@ class Interval:
 		self.__lower_bound: Bound = lower_bound
 		self.__upper_bound: Bound = upper_bound
 		
-		self._linked_objects = tuple()
 		# TODO: consider returning iInterval.empty() instead of throwing exception.
 		#  I am inclined to keep the exceptions as they (may?) prevent hard to track bugs elsewhere in the library
 		if lower_bound.value == upper_bound.value:
@@ -237,6 +250,11 @@ class Interval:
 	def hull(self, other: Iterable[Interval] = tuple()):
 		return ops.coerce_collection_to_Interval_or_Multi_Interval(ops.hull(itertools.chain(self, other)))
 	
+	def lazy(self) -> Expression:
+		"""Starts a lazy expression which is evaluated in a single sweep, see expression.py"""
+		from .expression import Leaf_Expression
+		return Leaf_Expression(self)
+	
 	def union(self, other: Iterable[Interval]) -> Collection[Interval]:
 		return ops.coerce_collection_to_Interval_or_Multi_Interval([*itertools.chain(self, other)])
 	
@@ -301,6 +319,9 @@ class Interval:
 #  then changing all _operators to merge or split the content of the linked_objects array
 #  then we can dispense with the linked objects array
 class Linked_Interval(Interval, Generic[T]):
+	
+	__slots__ = ('_linked_objects',)
+	
 	def __init__(self, original_iInterval: Interval, linked_objects: Iterable[T]):
 		super().__init__(original_iInterval.lower_bound, original_iInterval.upper_bound)
 		self._linked_objects = tuple(linked_objects)
\ No newline at end of file
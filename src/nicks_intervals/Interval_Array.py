@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import bisect
+import math
+from array import array
+from typing import Iterable, Iterator, Collection, Union, List, Tuple, Optional
+
+from . import _operators as ops
+from . import _sweep as sweep
+from .Bound import Bound
+from .Interval import Interval
+from .Multi_Interval import Multi_Interval
+
+
+class Interval_Array:
+	"""
+	Immutable column based collection of intervals.
+	The values of the bounds are stored in two float64 arrays, and the closedness of each bound in two bool arrays (array('B') of 0 or 1).
+	No Bound or Interval objects are created unless the intervals are iterated over or converted to a Multi_Interval.
+
+	Set operations have the same semantics as the functions in _operators,
+	but run on the columns using the _sweep kernel.
+	They are not vectorized: the kernel is the same Python loop over one event tuple per bound,
+	so the columns save memory and Bound / Interval object creation rather than time per row.
+	contains_value() is a binary search over the lower values when the rows are sorted and disjoint.
+	"""
+
+	@classmethod
+	def from_intervals(cls, intervals: Iterable[Interval]) -> Interval_Array:
+		if isinstance(intervals, Interval_Array):
+			return intervals
+		lower_values = array('d')
+		upper_values = array('d')
+		lower_closed = array('B')
+		upper_closed = array('B')
+		for interval in intervals:
+			lower_values.append(interval.lower_bound.value)
+			upper_values.append(interval.upper_bound.value)
+			lower_closed.append(interval.lower_bound.part_of_right)
+			upper_closed.append(interval.upper_bound.part_of_left)
+		return cls._from_trusted_columns(lower_values, upper_values, lower_closed, upper_closed)
+
+	@classmethod
+	def empty(cls) -> Interval_Array:
+		return cls._from_trusted_columns(array('d'), array('d'), array('B'), array('B'))
+
+	@classmethod
+	def _from_trusted_columns(cls, lower_values: array, upper_values: array, lower_closed: array, upper_closed: array) -> Interval_Array:
+		"""Skips validation; for columns that are already known to describe valid intervals"""
+		result = cls.__new__(cls)
+		result.__lower_values = lower_values
+		result.__upper_values = upper_values
+		result.__lower_closed = lower_closed
+		result.__upper_closed = upper_closed
+		result.__is_sorted_and_disjoint = None
+		return result
+
+	def __init__(self, lower_values: Iterable[float], upper_values: Iterable[float], lower_closed: Iterable[bool], upper_closed: Iterable[bool]):
+		"""
+		:param lower_values: The value of the lower bound of each interval
+		:param upper_values: The value of the upper bound of each interval
+		:param lower_closed: True where the value of the lower bound is part of the interval
+		:param upper_closed: True where the value of the upper bound is part of the interval
+		"""
+		self.__lower_values = array('d', lower_values)
+		self.__upper_values = array('d', upper_values)
+		self.__lower_closed = array('B', (bool(item) for item in lower_closed))
+		self.__upper_closed = array('B', (bool(item) for item in upper_closed))
+		self.__is_sorted_and_disjoint: Optional[bool] = None
+
+		if not (len(self.__lower_values) == len(self.__upper_values) == len(self.__lower_closed) == len(self.__upper_closed)):
+			raise Exception(f"Interval_Array columns must all have the same length. Got lengths {len(self.__lower_values)}, {len(self.__upper_values)}, {len(self.__lower_closed)}, {len(self.__upper_closed)}")
+
+		invalid_rows = _get_invalid_rows(self.__lower_values, self.__upper_values, self.__lower_closed, self.__upper_closed)
+		if invalid_rows:
+			raise Exception(f"Interval_Array has {len(invalid_rows)} invalid rows:\n" + "\n".join(f"row {index}: {error}" for index, error in invalid_rows))
+
+	def __len__(self):
+		return len(self.__lower_values)
+
+	def __bool__(self):
+		return len(self.__lower_values) > 0
+
+	def __iter__(self) -> Iterator[Interval]:
+		for row in zip(self.__lower_values, self.__upper_values, self.__lower_closed, self.__upper_closed):
+			yield _row_to_interval(*row)
+
+	def __getitem__(self, index: int) -> Interval:
+		return _row_to_interval(self.__lower_values[index], self.__upper_values[index], self.__lower_closed[index], self.__upper_closed[index])
+
+	def __eq__(self, other: Collection[Interval]):
+		return ops.eq(self, other)
+
+	__hash__ = None
+
+	def __format__(self, format_spec):
+		return f"Interval_Array[{len(self)}]([{', '.join(['...' + str(len(self)) if index == 4 else format(self[index], format_spec) for index in range(min(5, len(self)))])}])"
+
+	def __repr__(self):
+		return format(self, ".2f")
+
+	@property
+	def lower_values(self) -> memoryview:
+		return memoryview(self.__lower_values).toreadonly()
+
+	@property
+	def upper_values(self) -> memoryview:
+		return memoryview(self.__upper_values).toreadonly()
+
+	@property
+	def lower_closed(self) -> memoryview:
+		return memoryview(self.__lower_closed).toreadonly()
+
+	@property
+	def upper_closed(self) -> memoryview:
+		return memoryview(self.__upper_closed).toreadonly()
+
+	def to_multi_interval(self) -> Multi_Interval:
+		return Multi_Interval(self)
+
+	def _events(self, source: int = 0) -> List[sweep.Event]:
+		return sweep.events_from_columns(
+			self.__lower_values,
+			(not closed for closed in self.__lower_closed),
+			self.__upper_values,
+			self.__upper_closed,
+			source
+		)
+
+	@property
+	def is_sorted_and_disjoint(self) -> bool:
+		"""True if the rows are in ascending order and no two of them intersect (touching is permitted). Detected on first access."""
+		if self.__is_sorted_and_disjoint is None:
+			self.__is_sorted_and_disjoint = not any(map(
+				_lower_is_before_upper,
+				self.__lower_values[1:], self.__lower_closed[1:],
+				self.__upper_values[:-1], self.__upper_closed[:-1]
+			))
+		return self.__is_sorted_and_disjoint
+
+	def contains_value(self, value: float) -> bool:
+		rows = range(len(self))
+		if self.is_sorted_and_disjoint:
+			# same window as Multi_Interval.sub_intervals_near_value()
+			index = bisect.bisect_right(self.__lower_values, value)
+			rows = range(max(0, index - 3), min(len(self), index + 2))
+		return any(
+			_row_contains_value(self.__lower_values[index], self.__upper_values[index], self.__lower_closed[index], self.__upper_closed[index], value)
+			for index in rows
+		)
+
+	@property
+	def exterior(self) -> Interval_Array:
+		return _from_event_pairs((lower, upper) for lower, upper, is_interior in sweep.iter_bound_pairs(sweep.sort_events(self._events())) if not is_interior)
+
+	@property
+	def interior(self) -> Interval_Array:
+		return _from_event_pairs((lower, upper) for lower, upper, is_interior in sweep.iter_bound_pairs(sweep.sort_events(self._events())) if is_interior)
+
+	def subtract(self, other: Union[Interval_Array, Iterable[Interval]]) -> Interval_Array:
+		other = Interval_Array.from_intervals(other)
+		return _from_event_pairs(sweep.subtract(sweep.sort_events(self._events(0) + other._events(1)), minuend_source=0))
+
+	def intersect(self, other: Union[Interval_Array, Iterable[Interval]]) -> Interval_Array:
+		other = Interval_Array.from_intervals(other)
+		return _from_event_pairs(sweep.intersect(sweep.sort_events(self._events(0) + other._events(1)), a_source=0))
+
+	def merge_touching(self) -> Interval_Array:
+		"""
+		Same as _operators.union_merge_touching([], self);
+		each connected component of touching sub-intervals (see _operators.touches_atomic) is replaced by its hull.
+		"""
+		return _from_event_pairs(sweep.merge_touching(sweep.sort_events(self._events()), len(self)))
+
+
+def _lower_is_before_upper(lower_value: float, lower_closed: bool, upper_value: float, upper_closed: bool) -> bool:
+	"""Same as Bound.__lt__() for a lower bound and an upper bound; True if an interval starting at the lower bound intersects one ending at the upper bound"""
+	if lower_value == upper_value or math.isclose(lower_value, upper_value):
+		return lower_closed and upper_closed
+	return lower_value < upper_value
+
+
+def _row_contains_value(lower_value: float, upper_value: float, lower_closed: bool, upper_closed: bool, value: float) -> bool:
+	if lower_value < value < upper_value:
+		return True
+	if lower_closed and math.isclose(lower_value, value):
+		return True
+	if upper_closed and math.isclose(upper_value, value):
+		return True
+	return False
+
+
+def _get_invalid_rows(lower_values: array, upper_values: array, lower_closed: array, upper_closed: array) -> List[Tuple[int, str]]:
+	"""Checks every row in one pass and returns (index, error) for each row which is not a valid interval"""
+	return [
+		(index, error)
+		for index, error in enumerate(map(_row_error, lower_values, upper_values, lower_closed, upper_closed))
+		if error is not None
+	]
+
+
+def _row_error(lower_value: float, upper_value: float, lower_closed: bool, upper_closed: bool) -> Optional[str]:
+	"""Applies the same rules as Bound.__init__ and Interval.__init__. Returns None if the row is a valid interval"""
+	if lower_value == float('-inf') and not lower_closed:
+		return "Bounds at -inf must be included_in_right"
+	if upper_value == float('-inf'):
+		return "Bounds at -inf must be included_in_right"
+	if upper_value == float('inf') and not upper_closed:
+		return "Bounds at inf must be included_in_left"
+	if lower_value == float('inf'):
+		return "Bounds at inf must be included_in_left"
+	if lower_value == upper_value:
+		if not (lower_closed and upper_closed):
+			return "Degenerate intervals (lower_bound==upper_bound) are only permitted when both bounds are closed."
+	elif math.isclose(lower_value, upper_value):
+		return f"Infinitesimal intervals are not cool: {lower_value} is close to {upper_value}"
+	elif lower_value > upper_value:
+		return f"reversed intervals are not permitted: {lower_value} > {upper_value}"
+	return None
+
+
+def _row_to_interval(lower_value: float, upper_value: float, lower_closed: bool, upper_closed: bool) -> Interval:
+	"""Rows are validated when the Interval_Array is constructed so the unchecked constructors are used"""
+	return Interval._unchecked(Bound._unchecked(lower_value, not lower_closed), Bound._unchecked(upper_value, bool(upper_closed)))
+
+
+def _from_event_pairs(pairs: Iterable[Tuple[sweep.Event, sweep.Event]]) -> Interval_Array:
+	"""
+	Builds the columns of the pieces produced by a sweep.
+	Closed ends which are math.isclose() are snapped to one value (see _sweep.snap_isclose_piece()),
+	then each row is checked with the same rules as the constructor, so invalid rows are rejected here rather than when they are converted to Interval objects.
+	"""
+	lower_values = array('d')
+	upper_values = array('d')
+	lower_closed = array('B')
+	upper_closed = array('B')
+	for lower_event, upper_event in pairs:
+		lower_event, upper_event = sweep.snap_isclose_piece(lower_event, upper_event)
+		row = (lower_event[0], upper_event[0], not sweep.part_of_left(lower_event), sweep.part_of_left(upper_event))
+		error = _row_error(*row)
+		if error is not None:
+			raise Exception(f"A sweep produced an invalid interval: {error}")
+		lower_values.append(row[0])
+		upper_values.append(row[1])
+		lower_closed.append(row[2])
+		upper_closed.append(row[3])
+	return Interval_Array._from_trusted_columns(lower_values, upper_values, lower_closed, upper_closed)
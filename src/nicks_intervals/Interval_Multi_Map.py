@@ -1,17 +1,24 @@
 from __future__ import annotations
 
+import heapq
 import itertools
-from typing import Tuple, Iterable, Callable, Sequence
+import math
+from array import array
+from typing import Tuple, Iterable, Callable, Sequence, Optional, List, Dict
 
 from .Interval import Interval
 from . import _operators as ops
+from . import _sweep as sweep
 from .Interval_Map import Interval_Map
+from .Interval_Tree import Interval_Tree
+from ._box_index import Box_Index
 
 
 class Interval_Multi_Map:
 	def __init__(self, links: Iterable[Sequence[Interval, Interval]]):
 		self.__links: Tuple[Interval_Map, ...] = tuple(Interval_Map(a, b) for a, b in links)
 		self.__reversed = None
+		self.__compiled: Optional[_Compiled_Links] = None
 	
 	def get_from(self):
 		return Interval.coerce_collection_to_Interval_or_Multi_Interval([item[0] for item in self.__links])
@@ -36,9 +43,30 @@ class Interval_Multi_Map:
 	def unmap_intervals(self):
 		raise Exception("to be implemented if required")
 	
+	def compile(self) -> Interval_Multi_Map:
+		"""
+		Indexes the links by their from-interval and pre-computes the scale factor of each link into arrays.
+		After this, map_value() queries an Interval_Tree of the from-intervals rather than walking over every link,
+		and map_values() sorts the values and maps them all in one pass over the links.
+		Returns self so that calls can be chained.
+		"""
+		if self.__compiled is None:
+			self.__compiled = _Compiled_Links(self.__links)
+		return self
+	
+	@property
+	def is_compiled(self) -> bool:
+		return self.__compiled is not None
+	
 	def map_value(self, value: float) -> Sequence[float]:
+		if self.__compiled is not None:
+			return self.__compiled.map_value(value)
 		return ops.apply_interval_maps_to_value(self.__links, value)
 	
+	def map_values(self, values: Iterable[float]) -> List[Sequence[float]]:
+		"""Same as calling map_value() for each value; compiles this Interval_Multi_Map first if required."""
+		return self.compile().__compiled.map_values(values)
+	
 	def map_value_nearest(self, value: float):
 		"""Same as map_value(), but first ensures that the input value is inside the nearest interval."""
 		return self.map_value(ops.nearest_contained_value(self.get_from(), value))[0]
@@ -68,7 +96,18 @@ class Interval_Multi_Map:
 	
 	def merge_on_predicates(self, from_predicate: Callable[[Interval, Interval], bool], to_predicate: Callable[[Interval, Interval], bool]):
 		"""Merge links based on the provided predicates; the Interval_Map class provide some helpers as @classmethods.
-		All combinations are tested, and the process starts again each time a merge is performed."""
+		Merging continues until no pair of links satisfies both predicates.
+		
+		When from_predicate is one of predicate_touching, predicate_intersecting or predicate_touching_or_intersecting
+		the links are sorted by their from-interval and merged by repeated line-sweeps; see _merge_links_in_one_sweep() for the cost of each sweep.
+		Any other from_predicate falls back to testing all combinations, restarting each time a merge is performed."""
+		if getattr(from_predicate, "__func__", None) in _SWEEPABLE_PREDICATES:
+			result = self.__links
+			must_restart = True
+			while must_restart:
+				result, must_restart = _merge_links_in_one_sweep(result, from_predicate, to_predicate)
+			return Interval_Multi_Map(result)
+		
 		# TODO: this is a very slow algorithm O(n^2) or O(n!) ? not good stuff. We can improve by creating an 'add and merge'
 		# TODO: this algorithm has issues when one interval_map completely contains the other.
 		#  Might be better to progressively build the map using .add_merge_if_contained_or_touching()
@@ -95,6 +134,7 @@ class Interval_Multi_Map:
 		it will be merged, and the check for touching will restart.
 		If the new element is contained within any existing element then no change is made.
 		If any existing element is contained within the new element, it is removed before the new element is added.
+		Each call copies and rescans every link; use Interval_Multi_Map_Builder when adding many elements.
 		"""
 		
 		interval_map_to_add = [interval_map_to_add]
@@ -119,4 +159,151 @@ class Interval_Multi_Map:
 					must_restart = True
 					break
 					
-		return Interval_Multi_Map([*result, *interval_map_to_add])
\ No newline at end of file
+		return Interval_Multi_Map([*result, *interval_map_to_add])
+
+
+# The built in predicates can only be satisfied by a pair of intervals which overlap or share a bound.
+_SWEEPABLE_PREDICATES = (
+	Interval_Multi_Map.predicate_touching.__func__,
+	Interval_Multi_Map.predicate_intersecting.__func__,
+	Interval_Multi_Map.predicate_touching_or_intersecting.__func__,
+)
+
+
+def _merge_links_in_one_sweep(links: Iterable[Sequence[Interval]], from_predicate: Callable[[Interval, Interval], bool], to_predicate: Callable[[Interval, Interval], bool]) -> Tuple[List[Tuple[Interval, Interval]], bool]:
+	"""
+	Visits the links in order of the lower bound of their from-interval.
+	Each link is merged into the first (oldest) still-open run of links that satisfies both predicates, or else starts a new run.
+	A run stays open until the sweep passes the upper value of its from-interval.
+	Returns the merged links and a flag which is True if any merge was performed;
+	since a merged run may now satisfy the predicates with another run, the caller must sweep again until the flag is False.
+	
+	When to_predicate is one of the built in predicates, the open runs are kept in a Box_Index
+	so that only the runs whose to-interval is near the to-interval of the link are checked; a sweep is then O(n log n) expected.
+	Any other to_predicate must be checked against every open run, so a sweep is O(n * r) where r is the largest number of open runs,
+	which is O(n^2) when every from-interval overlaps.
+	Either way, the caller may need up to n sweeps in the worst case, since each sweep after the first only needs to perform one merge.
+	"""
+	links = [(link[0], link[-1]) for link in links]
+	sorted_lower_events = sweep.sort_events([
+		(from_interval.lower_bound.value, sweep.edge_order_code(from_interval.lower_bound.part_of_left, True), 0, index)
+		for index, (from_interval, _) in enumerate(links)
+	])
+	
+	runs: List[Tuple[Interval, Interval]] = []
+	# run indices of the open runs in ascending order, which is the order the runs were started
+	open_runs: Dict[int, None] = {}
+	open_runs_index = Box_Index() if getattr(to_predicate, "__func__", None) in _SWEEPABLE_PREDICATES else None
+	# heap of (from_upper_value, run_index). Entries become stale when a run grows; they are skipped when their value no longer matches the run.
+	open_runs_by_from_upper_value: List[Tuple[float, int]] = []
+	merged_any = False
+	
+	for lower_value, _, _, link_index in sorted_lower_events:
+		link = links[link_index]
+		from_interval, to_interval = link
+		
+		while open_runs_by_from_upper_value and open_runs_by_from_upper_value[0][0] < lower_value and not math.isclose(open_runs_by_from_upper_value[0][0], lower_value):
+			from_upper_value, run_index = heapq.heappop(open_runs_by_from_upper_value)
+			if from_upper_value == runs[run_index][0].upper_bound.value:
+				del open_runs[run_index]
+				if open_runs_index is not None:
+					open_runs_index.remove(run_index, runs[run_index])
+		
+		candidate_run_indices = open_runs if open_runs_index is None else sorted(open_runs_index.candidates(link))
+		for run_index in candidate_run_indices:
+			run_from_interval, run_to_interval = runs[run_index]
+			if from_predicate(run_from_interval, from_interval) and to_predicate(run_to_interval, to_interval):
+				merged_run = (ops.hull_atomic(run_from_interval, from_interval), ops.hull_atomic(run_to_interval, to_interval))
+				if open_runs_index is not None:
+					open_runs_index.remove(run_index, runs[run_index])
+					open_runs_index.insert(run_index, merged_run)
+				runs[run_index] = merged_run
+				if merged_run[0].upper_bound.value != run_from_interval.upper_bound.value:
+					heapq.heappush(open_runs_by_from_upper_value, (merged_run[0].upper_bound.value, run_index))
+				merged_any = True
+				break
+		else:
+			run_index = len(runs)
+			runs.append(link)
+			open_runs[run_index] = None
+			if open_runs_index is not None:
+				open_runs_index.insert(run_index, link)
+			heapq.heappush(open_runs_by_from_upper_value, (from_interval.upper_bound.value, run_index))
+	
+	return runs, merged_any
+
+
+class _Compiled_Links:
+	"""
+	The links of an Interval_Multi_Map with the values used by apply_interval_map_to_value_atomic() stored in arrays,
+	and an Interval_Tree over their from-intervals to find the links which contain a value.
+	"""
+	
+	def __init__(self, links: Sequence[Interval_Map]):
+		self.__from_intervals = tuple(link[0] for link in links)
+		self.__to_intervals = tuple(link[-1] for link in links)
+		self.__from_lower_values = array('d', (interval.lower_bound.value for interval in self.__from_intervals))
+		self.__from_upper_values = array('d', (interval.upper_bound.value for interval in self.__from_intervals))
+		self.__to_lower_values = array('d', (interval.lower_bound.value for interval in self.__to_intervals))
+		# zero length from-intervals have no scale factor; nan marks them so that map_value() fails the same way as the uncompiled links
+		self.__scale_factors = array('d', (
+			to_interval.length / from_interval.length if from_interval.length != 0 else math.nan
+			for from_interval, to_interval in zip(self.__from_intervals, self.__to_intervals)
+		))
+		self.__from_interval_tree = Interval_Tree(self.__from_intervals)
+		# link indices sorted by the lower value of their from-interval; used by map_values()
+		self.__order_by_from_lower_value = array('q', sorted(range(len(links)), key=self.__from_lower_values.__getitem__))
+	
+	def __map_value_by_link(self, link_index: int, value: float) -> Optional[float]:
+		"""Maps a value which is inside the from-interval of the link; returns None if the result is outside the to-interval."""
+		scale_factor = self.__scale_factors[link_index]
+		if math.isnan(scale_factor):
+			# raises ZeroDivisionError, like ops.apply_interval_map_to_value_atomic()
+			scale_factor = self.__to_intervals[link_index].length / self.__from_intervals[link_index].length
+		result_value = (value - self.__from_lower_values[link_index]) * scale_factor + self.__to_lower_values[link_index]
+		if ops.contains_value_atomic(self.__to_intervals[link_index], result_value):
+			return result_value
+		return None
+	
+	def __map_value_by_links(self, link_indices: Iterable[int], value: float) -> List[float]:
+		result = []
+		for link_index in sorted(link_indices):
+			result_value = self.__map_value_by_link(link_index, value)
+			if result_value is not None:
+				result.append(result_value)
+		return result
+	
+	def map_value(self, value: float) -> Sequence[float]:
+		"""Returns the same values, in the same order, as ops.apply_interval_maps_to_value()"""
+		return self.__map_value_by_links(self.__from_interval_tree.indices_containing_value(value), value)
+	
+	def map_values(self, values: Iterable[float]) -> List[Sequence[float]]:
+		"""
+		Same as calling map_value() for each value.
+		The values are visited in sorted order in one pass over the links sorted by the lower value of their from-interval;
+		each link joins the active links when the pass reaches its lower value, and leaves once the pass is beyond its upper value.
+		"""
+		values = list(values)
+		result: List[Optional[Sequence[float]]] = [None] * len(values)
+		from_intervals = self.__from_intervals
+		from_lower_values = self.__from_lower_values
+		from_upper_values = self.__from_upper_values
+		order = self.__order_by_from_lower_value
+		next_order_index = 0
+		# heap of (from_upper_value, link_index) for every link whose from-interval may still contain the current value
+		active_links: List[Tuple[float, int]] = []
+		for value_index in sorted(range(len(values)), key=values.__getitem__):
+			value = values[value_index]
+			while next_order_index < len(order) and (
+				from_lower_values[order[next_order_index]] <= value or math.isclose(from_lower_values[order[next_order_index]], value)
+			):
+				link_index = order[next_order_index]
+				heapq.heappush(active_links, (from_upper_values[link_index], link_index))
+				next_order_index += 1
+			while active_links and active_links[0][0] < value and not math.isclose(active_links[0][0], value):
+				heapq.heappop(active_links)
+			result[value_index] = self.__map_value_by_links(
+				(link_index for _, link_index in active_links if ops.contains_value_atomic(from_intervals[link_index], value)),
+				value
+			)
+		return result
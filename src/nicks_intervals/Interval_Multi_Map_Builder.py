@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, Sequence, Union
+
+from .Interval import Interval
+from .Interval_Map import Interval_Map
+from .Interval_Multi_Map import Interval_Multi_Map
+from ._box_index import Box_Index
+
+
+class Interval_Multi_Map_Builder:
+	"""
+	Mutable builder for an Interval_Multi_Map.
+	Calling .add() repeatedly has the same effect as repeatedly calling Interval_Multi_Map.add_merge_if_contained_or_touching(),
+	but the links are kept in a spatial index so that each call only inspects the links whose (from, to) boxes are near the new link,
+	rather than copying and rescanning every link.
+	Call .freeze() to obtain the finished Interval_Multi_Map.
+	"""
+
+	def __init__(self, links: Iterable[Sequence[Interval]] = tuple()):
+		"""The initial links are added as-is without merging, just like the Interval_Multi_Map constructor"""
+		self.__links: Dict[int, Interval_Map] = {}
+		self.__index = Box_Index()
+		self.__next_link_id = 0
+		for from_interval, to_interval in links:
+			self.__insert(Interval_Map(from_interval, to_interval))
+
+	def __len__(self):
+		return len(self.__links)
+
+	def __insert(self, interval_map: Interval_Map):
+		self.__links[self.__next_link_id] = interval_map
+		self.__index.insert(self.__next_link_id, interval_map)
+		self.__next_link_id += 1
+
+	def __remove(self, link_id: int):
+		self.__index.remove(link_id, self.__links.pop(link_id))
+
+	def add(self, interval_map_to_add: Union[Interval_Map, Sequence[Interval]]) -> Interval_Multi_Map_Builder:
+		"""
+		If the new element is contained within any existing element then no change is made.
+		If any existing element is contained within the new element, it is removed before the new element is added.
+		If the new element touches any existing element (on both dimensions) they are merged, and the checks are repeated with the merged element.
+		Links are checked in the order they were added (link ids increase), which is the order add_merge_if_contained_or_touching() scans its list,
+		so the first link to satisfy any check is the same one.
+		Returns self so that calls can be chained.
+		"""
+		if not isinstance(interval_map_to_add, Interval_Map):
+			interval_map_to_add = Interval_Map(*interval_map_to_add)
+
+		while True:
+			for link_id in sorted(self.__index.candidates(interval_map_to_add)):
+				link = self.__links[link_id]
+				if link.contains(interval_map_to_add):
+					return self
+				if interval_map_to_add.contains(link):
+					self.__remove(link_id)
+					break
+				if link.touches(interval_map_to_add):
+					interval_map_to_add = interval_map_to_add.merge_by_hull(link)
+					self.__remove(link_id)
+					break
+			else:
+				break
+
+		self.__insert(interval_map_to_add)
+		return self
+
+	def freeze(self) -> Interval_Multi_Map:
+		return Interval_Multi_Map(self.__links.values())
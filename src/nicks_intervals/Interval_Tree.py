@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import math
+from array import array
+from typing import Collection, List, Iterator, TYPE_CHECKING
+
+from . import _operators as ops
+from . import _sweep as sweep
+
+if TYPE_CHECKING:
+	from .Interval import Interval
+
+
+class Interval_Tree:
+	"""
+	Static augmented interval tree over the sub-intervals of a collection.
+
+	The sub-intervals are sorted by lower bound and stored in an implicit balanced binary tree;
+	the node for the range [low, high) is at index (low + high) // 2.
+	Each node also records the largest upper bound value in its subtree so that whole subtrees can be skipped.
+
+	Queries return the same sub-intervals as a linear scan with the matching _atomic function,
+	in O(log n + k) time where k is the number of sub-intervals returned.
+	"""
+
+	def __init__(self, intervals: Collection[Interval]):
+		sorted_lower_events = sweep.sort_events([
+			(interval.lower_bound.value, sweep.edge_order_code(interval.lower_bound.part_of_left, True), 0, index)
+			for index, interval in enumerate(intervals)
+		])
+		intervals = tuple(intervals)
+		# position of each sorted sub-interval in the collection the tree was built from
+		self.__original_indices = array('q', (event[3] for event in sorted_lower_events))
+		self.__intervals: Collection[Interval] = tuple(intervals[index] for index in self.__original_indices)
+		self.__lower_values = array('d', (interval.lower_bound.value for interval in self.__intervals))
+		self.__upper_values = array('d', (interval.upper_bound.value for interval in self.__intervals))
+		self.__subtree_max_upper_values = array('d', self.__upper_values)
+		self.__build_subtree_max_upper_values(0, len(self.__intervals))
+
+	def __build_subtree_max_upper_values(self, low: int, high: int) -> float:
+		if low >= high:
+			return float('-inf')
+		middle = (low + high) // 2
+		self.__subtree_max_upper_values[middle] = max(
+			self.__upper_values[middle],
+			self.__build_subtree_max_upper_values(low, middle),
+			self.__build_subtree_max_upper_values(middle + 1, high)
+		)
+		return self.__subtree_max_upper_values[middle]
+
+	def __len__(self):
+		return len(self.__intervals)
+
+	def __iter_candidates(self, lower_value: float, upper_value: float) -> Iterator[Interval]:
+		intervals = self.__intervals
+		return (intervals[position] for position in self.__iter_candidate_positions(lower_value, upper_value))
+
+	def __iter_candidate_positions(self, lower_value: float, upper_value: float) -> Iterator[int]:
+		"""
+		Yields the sorted position of every sub-interval where the range of values [lower, upper] overlaps [lower_value, upper_value], ignoring bound direction.
+		Values which are math.isclose() are treated as overlapping, so this is a superset of any of the _atomic predicates.
+		"""
+		lower_values = self.__lower_values
+		subtree_max_upper_values = self.__subtree_max_upper_values
+		stack = [(0, len(self.__intervals))]
+		while stack:
+			low, high = stack.pop()
+			if low >= high:
+				continue
+			middle = (low + high) // 2
+			subtree_max_upper_value = subtree_max_upper_values[middle]
+			if subtree_max_upper_value < lower_value and not math.isclose(subtree_max_upper_value, lower_value):
+				# nothing in this subtree reaches the query
+				continue
+			stack.append((low, middle))
+			middle_lower_value = lower_values[middle]
+			if middle_lower_value > upper_value and not math.isclose(middle_lower_value, upper_value):
+				# this node, and everything to its right, starts after the query
+				continue
+			yield middle
+			stack.append((middle + 1, high))
+
+	def sub_intervals_intersecting(self, interval: Interval) -> List[Interval]:
+		return [
+			candidate
+			for candidate in self.__iter_candidates(interval.lower_bound.value, interval.upper_bound.value)
+			if ops.intersects_atomic(candidate, interval)
+		]
+
+	def sub_intervals_containing_value(self, value: float) -> List[Interval]:
+		return [
+			candidate
+			for candidate in self.__iter_candidates(value, value)
+			if ops.contains_value_atomic(candidate, value)
+		]
+
+	def indices_containing_value(self, value: float) -> List[int]:
+		"""Same as sub_intervals_containing_value(), but returns the index of each sub-interval in the collection the tree was built from."""
+		intervals = self.__intervals
+		original_indices = self.__original_indices
+		return [
+			original_indices[position]
+			for position in self.__iter_candidate_positions(value, value)
+			if ops.contains_value_atomic(intervals[position], value)
+		]
+
+	def sub_intervals_containing_interval(self, interval: Interval) -> List[Interval]:
+		return [
+			candidate
+			for candidate in self.__iter_candidates(interval.lower_bound.value, interval.upper_bound.value)
+			if ops.contains_interval_atomic(candidate, interval)
+		]
+
+	def sub_intervals_touching(self, interval: Interval) -> List[Interval]:
+		candidates = {
+			id(candidate): candidate
+			for value in (interval.lower_bound.value, interval.upper_bound.value)
+			for candidate in self.__iter_candidates(value, value)
+		}
+		return [candidate for candidate in candidates.values() if ops.touches_atomic(candidate, interval)]
+
+	def any_intersecting(self, interval: Interval) -> bool:
+		return any(ops.intersects_atomic(candidate, interval) for candidate in self.__iter_candidates(interval.lower_bound.value, interval.upper_bound.value))
+
+	def any_containing_interval(self, interval: Interval) -> bool:
+		return any(ops.contains_interval_atomic(candidate, interval) for candidate in self.__iter_candidates(interval.lower_bound.value, interval.upper_bound.value))
+
+	def any_touching(self, interval: Interval) -> bool:
+		return any(
+			ops.touches_atomic(candidate, interval)
+			for value in (interval.lower_bound.value, interval.upper_bound.value)
+			for candidate in self.__iter_candidates(value, value)
+		)
@@ -1,17 +1,51 @@
 from __future__ import annotations
 
-import itertools
-from typing import Iterable, Collection, TYPE_CHECKING, Optional
+import bisect
+import threading
+from array import array
+from typing import Iterable, Collection, TYPE_CHECKING, Optional, Sequence, Dict, Any, Callable, TypeVar, List
 
 from . import Interval
 # if TYPE_CHECKING:
 from . import Bound
+from . import _sweep as sweep
+from .Interval_Tree import Interval_Tree
+
+T = TypeVar("T")
+
+# guards the publication of cached values; the values themselves are computed outside the lock
+_cache_lock = threading.Lock()
 
 
 class Multi_Interval(Interval.Interval):
+	"""
+	Immutable collection of sub-intervals.
+	Values derived from the sub-intervals (sorted bound events, hull, exterior, interior, interior_merged and the interval tree)
+	are computed on first use and cached. If two threads compute the same value at once, both receive the one which was stored first.
+	"""
 	
 	def __init__(self, iter_intervals: Iterable[Interval.Interval]):
 		self.__intervals: Collection[Interval.Interval] = tuple(iter_intervals)
+		self.__cache: Dict[str, Any] = {}
+	
+	def __get_cached(self, key: str, compute: Callable[[], T]) -> T:
+		try:
+			return self.__cache[key]
+		except KeyError:
+			pass
+		value = compute()
+		with _cache_lock:
+			return self.__cache.setdefault(key, value)
+	
+	@classmethod
+	def from_arrays(cls, lower_values: Iterable[float], upper_values: Iterable[float], lower_closed: Iterable[bool], upper_closed: Iterable[bool]) -> Multi_Interval:
+		"""
+		Bulk constructor taking one sequence (or array) per column, see Interval_Array.
+		Every row is validated in a single pass and an Exception listing all invalid rows is raised;
+		the Bound and Interval objects are then created without repeating the validation.
+		"""
+		from .Interval_Array import Interval_Array
+		return cls(Interval_Array(lower_values, upper_values, lower_closed, upper_closed))
 	
 	def __format__(self, format_spec):
 		return f"Multi_Interval[{len(self.__intervals)}]([{', '.join(['...' + str(len(self.__intervals)) if index == 4 else format(interval, format_spec) for index, interval in enumerate(self.__intervals) if index < 5])}])"
@@ -35,21 +69,78 @@ class Multi_Interval(Interval.Interval):
 		print("")
 		return self
 	
+	def _sorted_bound_events(self) -> List[sweep.Event]:
+		"""
+		The sweep events of the sub-intervals (source 0) in sorted order; see _operators.get_sorted_bound_events() which reuses them.
+		The returned list is shared and must not be modified.
+		"""
+		return self.__get_cached("sorted_bound_events", lambda: sweep.sort_events(sweep.events_from_intervals(self.__intervals, 0)))
+	
 	@property
 	def upper_bound(self) -> Optional[Bound.Bound]:
-		# raise Exception("Should not be called internally")
 		if len(self.__intervals) > 0:
-			return max(bound.bound for bound in itertools.chain.from_iterable(interval.get_linked_bounds() for interval in self.__intervals))
+			return Interval.ops.get_bound_of_event((self.__intervals,), self._sorted_bound_events()[-1])
 		else:
 			return None
 	
 	@property
 	def lower_bound(self) -> Optional[Bound.Bound]:
-		# raise Exception("Should not be called internally")
 		if len(self.__intervals) > 0:
-			return min(bound.bound for bound in itertools.chain.from_iterable(interval.get_linked_bounds() for interval in self.__intervals))
+			return Interval.ops.get_bound_of_event((self.__intervals,), self._sorted_bound_events()[0])
 		else:
 			return None
-		
+	
+	def hull(self, other: Iterable[Interval.Interval] = tuple()):
+		if other or not self.__intervals:
+			return super().hull(other)
+		return self.__get_cached("hull", lambda: Interval.Interval(self.lower_bound, self.upper_bound))
+	
+	@property
+	def exterior(self) -> Collection[Interval.Interval]:
+		return self.__get_cached("exterior", lambda: Interval.ops.coerce_collection_to_Interval_or_Multi_Interval(Interval.ops.exterior(self)))
+	
+	@property
+	def interior(self) -> Collection[Interval.Interval]:
+		return self.__get_cached("interior", lambda: Interval.ops.coerce_collection_to_Interval_or_Multi_Interval(Interval.ops.interior(self)))
+	
 	def interior_merged(self):
-		return Interval.ops.coerce_collection_to_Interval_or_Multi_Interval(Interval.ops.interior_merged(self))
+		return self.__get_cached("interior_merged", lambda: Interval.ops.coerce_collection_to_Interval_or_Multi_Interval(Interval.ops.interior_merged(self)))
+	
+	@property
+	def is_sorted_and_disjoint(self) -> bool:
+		"""True if the sub-intervals are in ascending order and no two of them intersect (touching is permitted). Detected on first access."""
+		return self.__get_cached("is_sorted_and_disjoint", lambda: not any(
+			current.lower_bound < previous.upper_bound
+			for previous, current in zip(self.__intervals, self.__intervals[1:])
+		))
+	
+	def sub_intervals_near_value(self, value: float) -> Sequence[Interval.Interval]:
+		"""
+		Returns the sub-intervals which may contain the value, or be nearest to it.
+		If this Multi_Interval is_sorted_and_disjoint, this is a binary search returning at most 5 sub-intervals,
+		otherwise all sub-intervals are returned.
+		"""
+		if not self.is_sorted_and_disjoint:
+			return self.__intervals
+		lower_values = self.__get_cached("lower_values", lambda: array('d', (interval.lower_bound.value for interval in self.__intervals)))
+		# index of the first sub-interval with a lower bound above the value.
+		# Up to three sub-intervals before it may still contain the value (eg. [0, 5), [5, 5], (5, 10] when value is 5)
+		# and up to two after it may have a lower bound which is math.isclose() to the value.
+		index = bisect.bisect_right(lower_values, value)
+		return self.__intervals[max(0, index - 3):index + 2]
+	
+	def sub_interval_containing_value(self, value: float) -> Optional[Interval.Interval]:
+		"""Returns the first sub-interval which contains the value, or None"""
+		return next((interval for interval in self.sub_intervals_near_value(value) if Interval.ops.contains_value_atomic(interval, value)), None)
+	
+	@property
+	def interval_tree(self) -> Interval_Tree:
+		"""
+		An index over the sub-intervals which answers stabbing and overlap queries in O(log n + k).
+		It is built on first access; after that the collection predicates in _operators (intersects, touches, contains_interval) use it automatically.
+		"""
+		return self.__get_cached("interval_tree", lambda: Interval_Tree(self.__intervals))
+	
+	@property
+	def has_interval_tree(self) -> bool:
+		return "interval_tree" in self.__cache
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import math
+import random
+from typing import List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+	from .Interval import Interval
+
+
+class _Box_Node:
+	__slots__ = ("key", "priority", "box", "left", "right", "max_from_upper_value", "min_to_lower_value", "max_to_upper_value")
+
+	def __init__(self, key: Tuple[float, int], priority: float, box: Tuple[float, float, float, float]):
+		self.key = key
+		self.priority = priority
+		self.box = box
+		self.left: Optional[_Box_Node] = None
+		self.right: Optional[_Box_Node] = None
+		self.max_from_upper_value = box[1]
+		self.min_to_lower_value = box[2]
+		self.max_to_upper_value = box[3]
+
+	def update(self):
+		"""Recomputes the extent of this subtree from the node's own box and its children"""
+		_, max_from_upper_value, min_to_lower_value, max_to_upper_value = self.box
+		for child in (self.left, self.right):
+			if child is not None:
+				max_from_upper_value = max(max_from_upper_value, child.max_from_upper_value)
+				min_to_lower_value = min(min_to_lower_value, child.min_to_lower_value)
+				max_to_upper_value = max(max_to_upper_value, child.max_to_upper_value)
+		self.max_from_upper_value = max_from_upper_value
+		self.min_to_lower_value = min_to_lower_value
+		self.max_to_upper_value = max_to_upper_value
+
+
+class Box_Index:
+	"""
+	Index over the (from, to) boxes of Interval_Map objects, or of any (from_interval, to_interval) pair.
+	A treap (a binary search tree balanced by random priorities) keyed on (from lower value, link id),
+	where each node also stores the extent of the boxes in its subtree: the largest from upper value and the range of the to values.
+	Insert and remove are O(log n) expected.
+	A query descends only into subtrees whose keys start before the end of the query and whose extent overlaps the query on both dimensions,
+	so a long link only widens the extent of the subtrees on its own path to the root.
+	Values which are math.isclose() to each other are treated as overlapping, so the result is a superset of the links which contain, are contained by, or touch the query.
+	"""
+
+	def __init__(self):
+		self.__root: Optional[_Box_Node] = None
+		self.__random = random.Random(0)
+
+	def insert(self, link_id: int, interval_map: Sequence[Interval]):
+		from_interval, to_interval = interval_map
+		box = (from_interval.lower_bound.value, from_interval.upper_bound.value, to_interval.lower_bound.value, to_interval.upper_bound.value)
+		node = _Box_Node((box[0], link_id), self.__random.random(), box)
+		left, right = _split(self.__root, node.key)
+		self.__root = _merge(_merge(left, node), right)
+
+	def remove(self, link_id: int, interval_map: Sequence[Interval]):
+		from_interval, _ = interval_map
+		key = (from_interval.lower_bound.value, link_id)
+		left, right = _split(self.__root, key)
+		_, right = _split(right, (key[0], link_id + 1))
+		self.__root = _merge(left, right)
+
+	def candidates(self, interval_map: Sequence[Interval]) -> List[int]:
+		from_interval, to_interval = interval_map
+		from_lower_value = from_interval.lower_bound.value
+		from_upper_value = from_interval.upper_bound.value
+		to_lower_value = to_interval.lower_bound.value
+		to_upper_value = to_interval.upper_bound.value
+
+		result = []
+		stack = [self.__root]
+		while stack:
+			node = stack.pop()
+			if node is None:
+				continue
+			if not (_less_or_close(from_lower_value, node.max_from_upper_value) and _less_or_close(node.min_to_lower_value, to_upper_value) and _less_or_close(to_lower_value, node.max_to_upper_value)):
+				continue
+			stack.append(node.left)
+			node_from_lower_value, node_from_upper_value, node_to_lower_value, node_to_upper_value = node.box
+			if _less_or_close(node_from_lower_value, from_upper_value):
+				# keys to the right are no lower, so they can only overlap if this one does
+				stack.append(node.right)
+				if _ranges_overlap(node_from_lower_value, node_from_upper_value, from_lower_value, from_upper_value) and _ranges_overlap(node_to_lower_value, node_to_upper_value, to_lower_value, to_upper_value):
+					result.append(node.key[1])
+		return result
+
+
+def _split(node: Optional[_Box_Node], key: Tuple[float, int]) -> Tuple[Optional[_Box_Node], Optional[_Box_Node]]:
+	"""Splits a treap into the nodes with keys less than key, and the rest"""
+	if node is None:
+		return None, None
+	if node.key < key:
+		node.right, right = _split(node.right, key)
+		node.update()
+		return node, right
+	left, node.left = _split(node.left, key)
+	node.update()
+	return left, node
+
+
+def _merge(left: Optional[_Box_Node], right: Optional[_Box_Node]) -> Optional[_Box_Node]:
+	"""Joins two treaps where every key in left is less than every key in right"""
+	if left is None:
+		return right
+	if right is None:
+		return left
+	if left.priority > right.priority:
+		left.right = _merge(left.right, right)
+		left.update()
+		return left
+	right.left = _merge(left, right.left)
+	right.update()
+	return right
+
+
+def _less_or_close(a: float, b: float) -> bool:
+	return a <= b or math.isclose(a, b)
+
+
+def _ranges_overlap(a_lower: float, a_upper: float, b_lower: float, b_upper: float) -> bool:
+	"""closed ranges overlap, allowing for values which are math.isclose()"""
+	return _less_or_close(a_lower, b_upper) and _less_or_close(b_lower, a_upper)
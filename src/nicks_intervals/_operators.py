@@ -2,9 +2,10 @@ from __future__ import annotations
 
 import itertools
 import math
-from typing import TypeVar, Generator, Tuple, TYPE_CHECKING, List, Sized, Collection, Union, Iterable, Iterator, Callable, Sequence, Optional
+from typing import TypeVar, Generator, Tuple, TYPE_CHECKING, List, Sized, Collection, Union, Iterable, Iterator, Callable, Sequence, Optional, Dict
 
 from . import util
+from . import _sweep as sweep
 from .Bound import Bound, iBound_Negative_Infinity, iBound_Positive_Infinity, Linked_Bound
 
 
@@ -13,6 +14,7 @@ if TYPE_CHECKING:
 	from .Interval import Interval
 	from .Interval import Linked_Interval
 	from .Multi_Interval import Multi_Interval
+	from .Interval_Tree import Interval_Tree
 
 T = TypeVar('T')
 
@@ -59,7 +61,8 @@ def apply_interval_map_to_interval_atomic(map_from: Interval, map_to: Interval,
 	]
 
 
-def apply_interval_maps_to_intervals(iterable_of_links: Iterable[Sequence[Interval]], a: Iterable[Interval]) -> Collection[Interval]:
+def apply_interval_maps_to_intervals_based_on_atomics(iterable_of_links: Iterable[Sequence[Interval]], a: Iterable[Interval]) -> Collection[Interval]:
+	"""Reference implementation of apply_interval_maps_to_intervals(); tries every pair of interval and link."""
 	result = []
 	for a_interval in a:
 		for link_sequence in iterable_of_links:
@@ -67,6 +70,78 @@ def apply_interval_maps_to_intervals(iterable_of_links: Iterable[Sequence[Interv
 	return result
 
 
+def apply_interval_maps_to_intervals(iterable_of_links: Iterable[Sequence[Interval]], a: Iterable[Interval]) -> Collection[Interval]:
+	"""
+	Returns the same intervals, in the same order, as apply_interval_maps_to_intervals_based_on_atomics().
+	The intervals of 'a' and the from-intervals of the links are joined by one line-sweep over their sorted bounds;
+	when an interval opens it is paired with every interval of the other side which is still open, so only intersecting pairs are visited.
+	Each pair is then mapped by apply_interval_map_to_interval_atomic_inline() and the results are sorted into order of (interval, link).
+	This is O((n+m) log(n+m) + k) for n intervals, m links and k intersecting pairs, rather than n*m applications of the atomic map.
+	"""
+	links = [(link_sequence[0], link_sequence[-1]) for link_sequence in iterable_of_links]
+	sorted_events, (a, _) = get_sorted_bound_events(a, [from_interval for from_interval, _ in links])
+	
+	open_intervals: Dict[int, None] = {}
+	open_links: Dict[int, None] = {}
+	pairs: List[Tuple[int, int]] = []
+	for _, code, source, index in sorted_events:
+		if code & 1:
+			if source == 0:
+				pairs.extend((index, link_index) for link_index in open_links)
+				open_intervals[index] = None
+			else:
+				pairs.extend((interval_index, index) for interval_index in open_intervals)
+				open_links[index] = None
+		elif source == 0:
+			del open_intervals[index]
+		else:
+			del open_links[index]
+	pairs.sort()
+	
+	result = []
+	for interval_index, link_index in pairs:
+		from_interval, to_interval = links[link_index]
+		mapped_interval = apply_interval_map_to_interval_atomic_inline(from_interval, to_interval, a[interval_index])
+		if mapped_interval is not None:
+			result.append(mapped_interval)
+	return result
+
+
+def apply_interval_map_to_interval_atomic_inline(map_from: Interval, map_to: Interval, interval: Interval) -> Optional[Interval]:
+	"""Same as apply_interval_map_to_interval_atomic() but the intersections and the affine transform are computed directly on the bounds"""
+	from .Interval import Interval
+	if map_from.length == 0:
+		return map_to if intersect_bounds_atomic(map_from, interval) is not None else None
+	piece = intersect_bounds_atomic(map_from, interval)
+	if piece is None:
+		return None
+	scale_factor = map_to.length / map_from.length
+	from_lower_value = map_from.lower_bound.value
+	to_lower_value = map_to.lower_bound.value
+	lower_bound, upper_bound = piece
+	mapped_interval = Interval(
+		Bound.get((lower_bound.value - from_lower_value) * scale_factor + to_lower_value, lower_bound.part_of_left),
+		Bound.get((upper_bound.value - from_lower_value) * scale_factor + to_lower_value, upper_bound.part_of_left)
+	)
+	piece = intersect_bounds_atomic(mapped_interval, map_to)
+	if piece is None:
+		return None
+	return Interval(*piece)
+
+
+def intersect_bounds_atomic(a: Interval, b: Interval) -> Optional[Tuple[Bound, Bound]]:
+	"""The (lower_bound, upper_bound) of the intersection of two intervals, or None if they do not intersect"""
+	lower_bound = max(a.lower_bound, b.lower_bound)
+	upper_bound = min(a.upper_bound, b.upper_bound)
+	if lower_bound.value == upper_bound.value or math.isclose(lower_bound.value, upper_bound.value):
+		if lower_bound.part_of_right and upper_bound.part_of_left:
+			return lower_bound, upper_bound
+		return None
+	if lower_bound.value < upper_bound.value:
+		return lower_bound, upper_bound
+	return None
+
+
 def apply_interval_map_to_value_atomic(map_from: Interval, map_to: Interval, value: float) -> Tuple[float, ...]:
 	if contains_value_atomic(map_from, value):
 		scale_factor = map_to.length / map_from.length
@@ -116,6 +191,50 @@ def get_linked_intervals(a: Iterable[Interval], linked_objects: Iterable[T]) ->
 	return list(Linked_Interval(a_interval, linked_objects) for a_interval in a)
 
 
+def get_sorted_bound_events(*operands: Iterable[Interval]) -> Tuple[List[sweep.Event], Tuple[Sequence[Interval], ...]]:
+	"""
+	Returns the sorted sweep events for the bounds of all operands (see _sweep.py), along with each operand as a sequence.
+	The source of each event is the position of its operand in the argument list.
+	Use get_bound_of_event() to look up the original Bound object for an event.
+	
+	The sorted events of a Multi_Interval are cached on it, so they are reused rather than created and sorted again.
+	A single cached operand is returned without sorting; otherwise the cached operands form pre-sorted runs which the builtin sort merges in linear time.
+	"""
+	from .Multi_Interval import Multi_Interval
+	cached_events = [operand._sorted_bound_events() if isinstance(operand, Multi_Interval) else None for operand in operands]
+	operands = tuple(operand if isinstance(operand, Sequence) else tuple(operand) for operand in operands)
+	if len(operands) == 1 and cached_events[0] is not None:
+		return list(cached_events[0]), operands
+	events = []
+	for source, (operand, operand_events) in enumerate(zip(operands, cached_events)):
+		if operand_events is None:
+			events.extend(sweep.events_from_intervals(operand, source))
+		elif source == 0:
+			events.extend(operand_events)
+		else:
+			events.extend((value, code, source, index) for value, code, _, index in operand_events)
+	return sweep.sort_events(events), operands
+
+
+def get_bound_of_event(operands: Sequence[Sequence[Interval]], event: sweep.Event) -> Bound:
+	if event[2] == sweep.SOURCE_INFINITY:
+		return iBound_Negative_Infinity if event[1] & 1 else iBound_Positive_Infinity
+	interval = operands[event[2]][event[3]]
+	return interval.lower_bound if event[1] & 1 else interval.upper_bound
+
+
+def get_interval_of_events(operands: Sequence[Sequence[Interval]], lower_event: sweep.Event, upper_event: sweep.Event) -> Interval:
+	"""
+	The interval between the original Bound objects of two events.
+	Closed bounds from different operands whose values are math.isclose() but not equal become a degenerate interval (see _sweep.isclose_degenerate_value()).
+	"""
+	from .Interval import Interval
+	degenerate_value = sweep.isclose_degenerate_value(lower_event, upper_event)
+	if degenerate_value is not None:
+		return Interval.degenerate(degenerate_value)
+	return Interval(get_bound_of_event(operands, lower_event), get_bound_of_event(operands, upper_event))
+
+
 def is_complete(a: Collection[Interval]) -> bool:
 	bounds = sorted(get_bounds(a))
 	if len(bounds) < 2:
@@ -180,62 +299,17 @@ def subtract_and_flatten(minuend: Iterable[Interval], subtrahend: Iterable[Inter
 
 
 def subtract(minuend: Iterable[Interval], subtrahend: Iterable[Interval]) -> Collection[Interval]:
-	from .Interval import Interval
-	# minuend - subtrahend = difference
-	result = []
-	
-	# TODO: the pollution of the interval class with this linked object idea was not good and needs to be walked back.
-	#  the only significant place it is used is here... and a few other places that don't matter as much.
-	#  linked bounds will still be needed due to thier sorting behaviour, unless we make a function that does
-	#  that on something like a List[Tuple[bound:iBound, is_lower:bool, interval:Interval]]
-	sorted_link_bounds = sorted(itertools.chain(get_linked_bounds(get_linked_intervals(minuend, [minuend])), get_linked_bounds(get_linked_intervals(subtrahend, [subtrahend]))))
-	
-	minuend_intervals_awaiting_lower_bound: List[Interval] = []
-	minuend_intervals_awaiting_upper_bound: List[Tuple[Interval, Linked_Bound]] = []
-	
-	subtrahend_stack_count_previous = 0
-	subtrahend_stack_count = 0
-	
-	for current_bound in sorted_link_bounds:
-		if current_bound.interval.linked_objects[0] is subtrahend:
-			if current_bound.is_lower_bound:
-				subtrahend_stack_count += 1
-			else:
-				subtrahend_stack_count -= 1
-				
-		elif current_bound.interval.linked_objects[0] is minuend:
-			if current_bound.is_lower_bound:
-				if subtrahend_stack_count > 0:
-					minuend_intervals_awaiting_lower_bound.append(current_bound.interval)
-				else:
-					minuend_intervals_awaiting_upper_bound.append((current_bound.interval, current_bound))
-			else:  # current_bound.is_upper_bound
-				try:
-					# this interval was entirely overlapped by the subtrahend, and never found a starting bound. no further action required as it is not to be in the output
-					minuend_intervals_awaiting_lower_bound.remove(current_bound.interval)
-				except:
-					# this interval did find a lower bound, it must be added to the output.
-					interval_to_close = next(item for item in minuend_intervals_awaiting_upper_bound if item[0] == current_bound.interval)
-					minuend_intervals_awaiting_upper_bound.remove(interval_to_close)
-					if interval_to_close[1].bound != current_bound.bound:  # TODO: is this if statement necessary?
-						result.append(Interval(interval_to_close[1].bound, current_bound.bound))
-		
-		if subtrahend_stack_count > 0 and subtrahend_stack_count_previous == 0:  # a lower bound of subtrahend
-			# the current bound should be used to terminate all intervals in awaiting_upper_bound, and all these intervals should be moved into awaiting lower bound.
-			for awaiting_upper_bound in minuend_intervals_awaiting_upper_bound:
-				minuend_intervals_awaiting_lower_bound.append(awaiting_upper_bound[0])
-				if awaiting_upper_bound[1].bound != current_bound.bound:
-					result.append(Interval(awaiting_upper_bound[1].bound, current_bound.bound))
-			minuend_intervals_awaiting_upper_bound = []
-		elif subtrahend_stack_count == 0 and subtrahend_stack_count_previous > 0:  # an upper bound of subtrahend
-			# the current bound should be used to start all intervals in awaiting lower bound, and they should be moved into awaiting upper bound
-			for awaiting_lower_bound in minuend_intervals_awaiting_lower_bound:
-				minuend_intervals_awaiting_upper_bound.append((awaiting_lower_bound, current_bound))
-			minuend_intervals_awaiting_lower_bound = []
-		
-		subtrahend_stack_count_previous = subtrahend_stack_count
-		
-	return result
+	"""
+	minuend - subtrahend = difference
+	The structure of the minuend is kept; overlapping sub-intervals of the minuend produce overlapping results.
+	The minuend intervals awaiting a bound are kept in dicts keyed by interval index (see _sweep.subtract()),
+	so each bound is processed in O(1) and the whole operation is O((n+m) log(n+m)).
+	"""
+	sorted_events, operands = get_sorted_bound_events(minuend, subtrahend)
+	return [
+		get_interval_of_events(operands, lower_event, upper_event)
+		for lower_event, upper_event in sweep.subtract(sorted_events, minuend_source=0)
+	]
 
 
 def subtract_atomic(a: Interval, b: Interval) -> Collection[Interval]:
@@ -291,9 +365,16 @@ def subtract_atomic(a: Interval, b: Interval) -> Collection[Interval]:
 
 
 def intersect(a: Collection[Interval], b: Collection[Interval]) -> Collection[Interval]:
-	# TODO: This will have abysmal performance on large datasets
-	#  I think it can be implemented as a sweep over linked bounds?
-	return subtract(a, exterior(b))
+	"""
+	Each sub-interval of 'a' is clipped to the region covered by 'b'.
+	The structure of 'a' is kept; overlapping sub-intervals of 'a' produce overlapping results.
+	Implemented as a single line-sweep over the merged sorted bounds of both operands; the complement of 'b' is never built.
+	"""
+	sorted_events, operands = get_sorted_bound_events(a, b)
+	return [
+		get_interval_of_events(operands, lower_event, upper_event)
+		for lower_event, upper_event in sweep.intersect(sorted_events, a_source=0)
+	]
 
 
 def intersect_atomic(a: Interval, b: Interval) -> Collection[Interval]:
@@ -332,8 +413,23 @@ def intersect_atomic(a: Interval, b: Interval) -> Collection[Interval]:
 	return tuple()
 
 
+def get_interval_tree(a: Collection[Interval]) -> Optional[Interval_Tree]:
+	"""Returns the Interval_Tree of 'a' if 'a' is a Multi_Interval that has already built one, otherwise None"""
+	from .Multi_Interval import Multi_Interval
+	if isinstance(a, Multi_Interval) and a.has_interval_tree:
+		return a.interval_tree
+	return None
+
+
 def intersects(a: Collection[Interval], b: Collection[Interval]) -> bool:
-	return any(intersects_atomic(a_interval, b_interval) for a_interval in a for b_interval in b)
+	a_tree = get_interval_tree(a)
+	if a_tree is not None:
+		return any(a_tree.any_intersecting(b_interval) for b_interval in b)
+	b_tree = get_interval_tree(b)
+	if b_tree is not None:
+		return any(b_tree.any_intersecting(a_interval) for a_interval in a)
+	sorted_events, _ = get_sorted_bound_events(a, b)
+	return sweep.any_intersecting(sorted_events, a_source=0)
 
 
 def intersects_atomic(a: Interval, b: Interval) -> bool:
@@ -346,9 +442,15 @@ def intersects_atomic(a: Interval, b: Interval) -> bool:
 
 
 def touches(a: Collection[Interval], b: Collection[Interval]):
-	if intersects(a, b):
-		return False
-	return any(touches_atomic(a_interval, b_interval) for a_interval in a for b_interval in b)
+	"""True if some sub-interval of 'a' touches some sub-interval of 'b', and no sub-intervals of 'a' and 'b' intersect"""
+	a_tree = get_interval_tree(a)
+	if a_tree is not None:
+		return not intersects(a, b) and any(a_tree.any_touching(b_interval) for b_interval in b)
+	b_tree = get_interval_tree(b)
+	if b_tree is not None:
+		return not intersects(a, b) and any(b_tree.any_touching(a_interval) for a_interval in a)
+	sorted_events, _ = get_sorted_bound_events(a, b)
+	return sweep.touches(sorted_events, a_source=0)
 
 
 def touches_atomic(a: Interval, b: Interval) -> bool:
@@ -359,12 +461,23 @@ def touches_atomic(a: Interval, b: Interval) -> bool:
 	return False
 
 
+def sub_intervals_near_value(a: Collection[Interval], value: float) -> Iterable[Interval]:
+	"""
+	The sub-intervals of 'a' which may contain the value or be the nearest to it.
+	Uses a binary search when 'a' is a sorted and disjoint Multi_Interval, otherwise returns 'a' unchanged.
+	"""
+	from .Multi_Interval import Multi_Interval
+	if isinstance(a, Multi_Interval):
+		return a.sub_intervals_near_value(value)
+	return a
+
+
 def nearest_contained_value(a: Collection[Interval], value: float, containment_amount: float = 0.000001):
 	"""does not account for bound direction"""
 	nearest_value_so_far = None
 	nearest_so_far_dist = float('inf')
 	
-	for interval in a:
+	for interval in sub_intervals_near_value(a, value):
 		if contains_value_atomic(interval, value):
 			return value
 		else:
@@ -384,7 +497,7 @@ def nearest_contained_value(a: Collection[Interval], value: float, containment_a
 	
 
 def contains_value(a: Collection[Interval], value: float) -> bool:
-	return any(contains_value_atomic(interval, value) for interval in a)
+	return any(contains_value_atomic(interval, value) for interval in sub_intervals_near_value(a, value))
 
 
 def contains_value_atomic(a: Interval, value: float) -> bool:
@@ -398,9 +511,12 @@ def contains_value_atomic(a: Interval, value: float) -> bool:
 
 
 def contains_interval(a: Collection[Interval], b: Collection[Interval]) -> bool:
-	return all(
-		any(contains_interval_atomic(a_interval, b_interval) for a_interval in a) for b_interval in b
-	)
+	"""True if each sub-interval of 'b' is contained by a single sub-interval of 'a'"""
+	a_tree = get_interval_tree(a)
+	if a_tree is not None:
+		return all(a_tree.any_containing_interval(b_interval) for b_interval in b)
+	sorted_events, _ = get_sorted_bound_events(a, b)
+	return sweep.all_contained(sorted_events, container_source=0)
 
 
 def contains_interval_atomic(a: Interval, b: Interval) -> bool:
@@ -514,23 +630,19 @@ def get_sorted_linked_bounds_with_stack_height(a: Collection[Interval]) -> Gener
 		bound:Linked_iBound
 		stack_height_after:int
 	)
+	The sweep itself runs on event tuples (see _sweep.py); Linked_Bound objects are only created as they are yielded.
 	"""
-	# TODO: remove dependence on linked bounds class?
-	sorted_linked_bounds = sorted(itertools.chain.from_iterable(get_linked_bounds(a_interval) for a_interval in a))
-	stack_count_before = 0
-	stack_count_after = 0
-	for previous_bound, current_bound, next_bound in util.iter_previous_current_next(sorted_linked_bounds):
-		if current_bound.is_lower_bound:
-			stack_count_after += 1
-		else:
-			stack_count_after -= 1
-		yield stack_count_before, current_bound, stack_count_after
-		stack_count_before = stack_count_after
+	sorted_events, (intervals,) = get_sorted_bound_events(a)
+	for stack_height_before, event, stack_height_after in sweep.iter_stack_height(sorted_events):
+		interval = intervals[event[3]]
+		is_lower_bound = sweep.is_lower_bound(event)
+		bound = interval.lower_bound if is_lower_bound else interval.upper_bound
+		yield stack_height_before, bound.get_Linked_iBound(linked_interval=interval, is_lower_bound=is_lower_bound), stack_height_after
+
 
-	
 def iter_bound_pairs(a: Collection[Interval]) -> Iterator[Tuple[Bound, Bound, bool]]:
 	"""
-	yields each pair of bounds in a collection of intervals where the bounds are obtained by get_sorted_linked_bounds_with_stack_height().
+	yields each pair of consecutive bounds in a collection of intervals, sorted in the same order as get_sorted_linked_bounds_with_stack_height().
 	Pairs of bounds that do not form a valid interval are ignored.
 	If the first and last bounds are not infinite, these are added as required to make the output a complete traversal of the real number line.
 	(
@@ -539,19 +651,9 @@ def iter_bound_pairs(a: Collection[Interval]) -> Iterator[Tuple[Bound, Bound, bo
 		is_interior_interval: bool
 	)
 	"""
-	INTERIOR = True
-	EXTERIOR = False
-	for ((_, prev_bound, _), (stack_before, bound, stack_after), (_, next_bound, _)) in util.iter_previous_current_next(get_sorted_linked_bounds_with_stack_height(a), (None, None, None)):
-		if prev_bound is None:
-			if bound != iBound_Negative_Infinity:
-				yield iBound_Negative_Infinity, bound.bound, EXTERIOR
-		else:
-			if prev_bound.bound != bound.bound:
-				yield prev_bound.bound, bound.bound, EXTERIOR if stack_before == 0 else INTERIOR
-		
-		if next_bound is None:
-			if bound != iBound_Positive_Infinity:
-				yield bound.bound, iBound_Positive_Infinity, EXTERIOR
+	sorted_events, operands = get_sorted_bound_events(a)
+	for lower_event, upper_event, is_interior in sweep.iter_bound_pairs(sorted_events):
+		yield get_bound_of_event(operands, lower_event), get_bound_of_event(operands, upper_event), is_interior
 
 
 def iter_bound_pairs_merge_touching(a: Collection[Interval]) -> Iterator[Tuple[Bound, Bound, bool]]:
@@ -589,18 +691,71 @@ def eq_atomic(a: Interval, b: Interval):
 
 
 def eq(a: Collection[Interval], b: Collection[Interval]) -> bool:
+	"""
+	True if 'a' and 'b' contain the same sub-intervals, in any order, where bounds are compared with Bound.__eq__().
+	Both sides are sorted once into a canonical order and compared pairwise, which is O(n log n).
+	The sort is skipped for a Multi_Interval which is_sorted_and_disjoint, since it is already in canonical order.
+	"""
+	a_intervals = tuple(a)
+	b_intervals = tuple(b)
+	if len(a_intervals) != len(b_intervals):
+		return False
+	
+	representative_values = _get_representative_values(itertools.chain(a_intervals, b_intervals))
+	a_canonical = _get_canonical_order(a, a_intervals, representative_values)
+	b_canonical = _get_canonical_order(b, b_intervals, representative_values)
+	if any(a_key != b_key for (a_key, _), (b_key, _) in zip(a_canonical, b_canonical)):
+		return False
+	if all(eq_atomic(a_intervals[a_index], b_intervals[b_index]) for (_, a_index), (_, b_index) in zip(a_canonical, b_canonical)):
+		return True
+	# Only reachable when a chain of math.isclose() values joins two values which are not close to each other.
+	return _eq_by_matching(a_intervals, b_intervals)
+
+
+def _get_representative_values(a: Iterable[Interval]) -> Dict[float, float]:
+	"""
+	Maps each bound value to the smallest value in its run of math.isclose() neighbours,
+	so that bounds which are equal under Bound.__eq__() get identical sort keys.
+	"""
+	result = {}
+	representative_value = None
+	previous_value = None
+	for value in sorted(set(itertools.chain.from_iterable((a_interval.lower_bound.value, a_interval.upper_bound.value) for a_interval in a))):
+		if previous_value is None or not math.isclose(previous_value, value):
+			representative_value = value
+		result[value] = representative_value
+		previous_value = value
+	return result
+
+
+def _get_canonical_order(a: Collection[Interval], a_intervals: Sequence[Interval], representative_values: Dict[float, float]) -> List[Tuple[Tuple[float, int, float, int], int]]:
+	"""returns a list of (sort_key, index) for each sub-interval, sorted by sort_key"""
+	result = [
+		(
+			(
+				representative_values[a_interval.lower_bound.value],
+				sweep.edge_order_code(a_interval.lower_bound.part_of_left, True),
+				representative_values[a_interval.upper_bound.value],
+				sweep.edge_order_code(a_interval.upper_bound.part_of_left, False)
+			),
+			index
+		)
+		for index, a_interval in enumerate(a_intervals)
+	]
+	from .Multi_Interval import Multi_Interval
+	if not (isinstance(a, Multi_Interval) and a.is_sorted_and_disjoint):
+		result.sort()
+	return result
+
+
+def _eq_by_matching(a: Collection[Interval], b: Collection[Interval]) -> bool:
+	"""O(n^2) equality; each sub-interval of 'a' is matched against the first equal sub-interval remaining in 'b'"""
 	b_intervals = list(b)
-	if len(a) == len(b):
-		try:
-			for a_interval in a:
-				index_of_first_atomic_match = next(index for index, b_interval in enumerate(b_intervals) if eq_atomic(a_interval, b_interval))
-				b_intervals = b_intervals[:index_of_first_atomic_match] + b_intervals[index_of_first_atomic_match+1:]
-		except ValueError:
-			return False
-		except StopIteration:
+	for a_interval in a:
+		index_of_first_atomic_match = next((index for index, b_interval in enumerate(b_intervals) if eq_atomic(a_interval, b_interval)), None)
+		if index_of_first_atomic_match is None:
 			return False
-	else:
-		return False
+		del b_intervals[index_of_first_atomic_match]
 	return len(b_intervals) == 0
 
 
@@ -634,17 +789,21 @@ def union_merge_touching_OLD(a: Iterable[Interval], b: Iterable[Interval]):
 
 def union_merge_touching(a: Iterable[Interval], b: Iterable[Interval]):
 	"""see union_merge_on_predicate for docs"""
-	return union_merge_on_predicate(a, b, lambda a_sub, b_sub: touches_atomic(a_sub, b_sub))
+	return union_merge_on_predicate(a, b, touches_atomic)
 
 
 def union_merge_intersecting_or_touching(a: Iterable[Interval], b: Iterable[Interval]):
 	"""see union_merge_on_predicate for docs"""
-	return union_merge_on_predicate(a, b, lambda a_sub, b_sub: intersects_atomic(a_sub, b_sub) or touches_atomic(a_sub, b_sub))
+	return union_merge_on_predicate(a, b, intersects_or_touches_atomic)
 
 
 def union_merge_intersecting(a: Iterable[Interval], b: Iterable[Interval]):
 	"""see union_merge_on_predicate for docs"""
-	return union_merge_on_predicate(a, b, lambda a_sub, b_sub: intersects_atomic(a_sub, b_sub))
+	return union_merge_on_predicate(a, b, intersects_atomic)
+
+
+def intersects_or_touches_atomic(a: Interval, b: Interval) -> bool:
+	return intersects_atomic(a, b) or touches_atomic(a, b)
 
 
 def union_merge_on_predicate(a: Iterable[Interval], b: Iterable[Interval], predicate: Callable[[Interval, Interval], bool]):
@@ -654,7 +813,12 @@ def union_merge_on_predicate(a: Iterable[Interval], b: Iterable[Interval], predi
 	then all sub-intervals from 'b' are added to the result one by one,
 	as each sub-interval of 'b' is added it is merged with any intervals already in the result for which the predicate returns true using the hull operation.
 	This means that if 'a' is a flattened multi interval, the result will also be a flat interval.
+	
+	When the predicate is intersects_atomic, touches_atomic or intersects_or_touches_atomic this is computed by union_merge_by_sweep().
 	"""
+	if predicate in SWEEPABLE_MERGE_PREDICATES:
+		merge_intersecting, merge_touching = SWEEPABLE_MERGE_PREDICATES[predicate]
+		return union_merge_by_sweep(a, b, merge_intersecting, merge_touching)
 	results = list(a)
 	for item_to_insert in b:
 		index = 0
@@ -664,14 +828,15 @@ def union_merge_on_predicate(a: Iterable[Interval], b: Iterable[Interval], predi
 				item_to_insert = hull_atomic(item_to_insert, result)
 				results.remove(result)
 				index = 0
-			index += 1
+			else:
+				index += 1
 		results.append(item_to_insert)
 	return results
 
 
 def union_merge_intersecting_or_touching_linked(a: Iterable[Linked_Interval], b: Iterable[Linked_Interval]):
 	"""see union_merge_on_predicate for docs"""
-	return union_merge_on_predicate_linked(a, b, lambda a_sub, b_sub: intersects_atomic(a_sub, b_sub) or touches_atomic(a_sub, b_sub))
+	return union_merge_on_predicate_linked(a, b, intersects_or_touches_atomic)
 
 
 def union_merge_on_predicate_linked(a: Iterable[Linked_Interval], b: Iterable[Linked_Interval], predicate: Callable[[Interval, Interval], bool]) -> Collection[Linked_Interval]:
@@ -681,7 +846,12 @@ def union_merge_on_predicate_linked(a: Iterable[Linked_Interval], b: Iterable[Li
 	then all sub-intervals from 'b' are added to the result one by one,
 	as each sub-interval of 'b' is added it is merged with any intervals already in the result for which the predicate returns true using the hull operation.
 	This means that if 'a' is a flattened multi interval, the result will also be a flat interval.
+	
+	When the predicate is intersects_atomic, touches_atomic or intersects_or_touches_atomic this is computed by union_merge_by_sweep().
 	"""
+	if predicate in SWEEPABLE_MERGE_PREDICATES:
+		merge_intersecting, merge_touching = SWEEPABLE_MERGE_PREDICATES[predicate]
+		return union_merge_by_sweep(a, b, merge_intersecting, merge_touching, link_merge=True)
 	results = list(a)
 	for item_to_insert in b:
 		index = 0
@@ -691,6 +861,90 @@ def union_merge_on_predicate_linked(a: Iterable[Linked_Interval], b: Iterable[Li
 				item_to_insert = hull_atomic(item_to_insert, result).link_merge([*item_to_insert.linked_objects, *result.linked_objects])
 				results.remove(result)
 				index = 0
-			index += 1
+			else:
+				index += 1
 		results.append(item_to_insert)
-	return results
\ No newline at end of file
+	return results
+
+
+def union_merge_by_sweep(a: Iterable[Interval], b: Iterable[Interval], merge_intersecting: bool, merge_touching: bool, link_merge: bool = False) -> List[Interval]:
+	"""
+	Sort based equivalent of union_merge_on_predicate() for the predicates
+	 - intersects_atomic (merge_intersecting=True, merge_touching=False)
+	 - touches_atomic (merge_intersecting=False, merge_touching=True)
+	 - intersects_or_touches_atomic (merge_intersecting=True, merge_touching=True)
+	
+	The intervals of 'a' and 'b' are grouped into connected components under the predicate.
+	Components which contain at least one interval from 'b' are replaced by their hull;
+	intervals in components made only of intervals from 'a' are returned unchanged.
+	If link_merge is True, the hull is a Linked_Interval carrying the linked_objects of every member, concatenated once in order of lower bound.
+	
+	For the predicates involving intersection this is exactly the result of union_merge_on_predicate().
+	For touches_atomic alone the result is the same whenever no two input intervals intersect;
+	when they do intersect, the result of union_merge_on_predicate() depended on the order of the input.
+	"""
+	from .Interval import Interval, Linked_Interval
+	intervals = list(a)
+	first_b_index = len(intervals)
+	intervals.extend(b)
+	
+	if merge_intersecting:
+		components = _components_intersecting(intervals, merge_touching)
+	else:
+		components = _components_touching(intervals)
+	
+	result = []
+	for component in components:
+		if len(component) == 1 or all(index < first_b_index for index in component):
+			result.extend(intervals[index] for index in component)
+		else:
+			members = [intervals[index] for index in component]
+			merged = Interval(min(member.lower_bound for member in members), max(member.upper_bound for member in members))
+			if link_merge:
+				merged = Linked_Interval(merged, itertools.chain.from_iterable(member.linked_objects for member in members))
+			result.append(merged)
+	return result
+
+
+def _sorted_lower_bound_events(intervals: Sequence[Interval]) -> List[sweep.Event]:
+	return sweep.sort_events([
+		(interval.lower_bound.value, sweep.edge_order_code(interval.lower_bound.part_of_left, True), 0, index)
+		for index, interval in enumerate(intervals)
+	])
+
+
+def _components_intersecting(intervals: Sequence[Interval], merge_touching: bool) -> List[List[int]]:
+	"""
+	Sorted by lower bound, intervals form runs which are connected components;
+	each interval joins the current run if its lower bound is before (or equal to, when merge_touching) the furthest upper bound of the run.
+	"""
+	components = []
+	run: List[int] = []
+	run_upper_bound: Optional[Bound] = None
+	for _, _, _, index in _sorted_lower_bound_events(intervals):
+		interval = intervals[index]
+		if run and (interval.lower_bound < run_upper_bound or (merge_touching and interval.lower_bound == run_upper_bound)):
+			run.append(index)
+			if interval.upper_bound > run_upper_bound:
+				run_upper_bound = interval.upper_bound
+		else:
+			if run:
+				components.append(run)
+			run = [index]
+			run_upper_bound = interval.upper_bound
+	if run:
+		components.append(run)
+	return components
+
+
+def _components_touching(intervals: Sequence[Interval]) -> List[List[int]]:
+	"""Two intervals touch when the upper bound of one is equal to the lower bound of the other (see touches_atomic and _sweep.touching_components())."""
+	return sweep.touching_components(sweep.sort_events(sweep.events_from_intervals(intervals)), len(intervals))
+
+
+# The predicates which union_merge_on_predicate() can evaluate with union_merge_by_sweep(); mapped to (merge_intersecting, merge_touching)
+SWEEPABLE_MERGE_PREDICATES = {
+	intersects_atomic: (True, False),
+	touches_atomic: (False, True),
+	intersects_or_touches_atomic: (True, True),
+}
@@ -0,0 +1,111 @@
+"""
+Streaming versions of the sweep operators in _operators.
+
+Each function accepts iterables of intervals which are already sorted by lower bound (eg. read from a file ordered by chainage),
+checks the order as it goes, and yields results as soon as they are known.
+Only the intervals which are open at the sweep position are held in memory, so for disjoint inputs the extra memory is O(1).
+An Exception is raised as soon as an input is found to be out of order.
+
+Results are yielded in the order they are completed;
+for disjoint inputs this is ascending order, but overlapping inputs may produce results out of order.
+"""
+
+from __future__ import annotations
+
+import heapq
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from . import _sweep as sweep
+from .Bound import Bound
+from .Interval import Interval
+
+
+def _iter_keyed_by_lower_bound(intervals: Iterable[Interval], source: int) -> Iterator[Tuple[sweep.Event, Interval]]:
+	"""yields (lower_event, interval) and raises an Exception if the intervals are not sorted by lower bound"""
+	previous_lower_bound: Optional[Bound] = None
+	for index, interval in enumerate(intervals):
+		lower_bound = interval.lower_bound
+		if previous_lower_bound is not None and lower_bound < previous_lower_bound:
+			raise Exception(f"Intervals must be sorted by lower bound; interval {index} {interval} has a lower bound before {previous_lower_bound}")
+		previous_lower_bound = lower_bound
+		yield (lower_bound.value, sweep.edge_order_code(lower_bound.part_of_left, True), source, index), interval
+
+
+def iter_events(intervals: Iterable[Interval], source: int = 0) -> Iterator[sweep.Event]:
+	"""
+	Yields the sweep events of intervals which are sorted by lower bound, in sorted order.
+	Upper bounds are held in a heap until the sweep passes them.
+	"""
+	pending_upper_events: List[sweep.Event] = []
+	for lower_event, interval in _iter_keyed_by_lower_bound(intervals, source):
+		while pending_upper_events and pending_upper_events[0] < lower_event:
+			yield heapq.heappop(pending_upper_events)
+		yield lower_event
+		upper_bound = interval.upper_bound
+		heapq.heappush(pending_upper_events, (upper_bound.value, sweep.edge_order_code(upper_bound.part_of_left, False), source, lower_event[3]))
+	while pending_upper_events:
+		yield heapq.heappop(pending_upper_events)
+
+
+def _iter_merged_events(*operands: Iterable[Interval]) -> Iterator[sweep.Event]:
+	return sweep.iter_sort_isclose_runs(heapq.merge(*(iter_events(operand, source) for source, operand in enumerate(operands))))
+
+
+def _interval_from_events(lower_event: sweep.Event, upper_event: sweep.Event) -> Interval:
+	lower_event, upper_event = sweep.snap_isclose_piece(lower_event, upper_event)
+	return Interval(Bound(lower_event[0], sweep.part_of_left(lower_event)), Bound(upper_event[0], sweep.part_of_left(upper_event)))
+
+
+def subtract(minuend: Iterable[Interval], subtrahend: Iterable[Interval]) -> Iterator[Interval]:
+	"""Same as _operators.subtract()"""
+	for lower_event, upper_event in sweep.subtract(_iter_merged_events(minuend, subtrahend), minuend_source=0):
+		yield _interval_from_events(lower_event, upper_event)
+
+
+def intersect(a: Iterable[Interval], b: Iterable[Interval]) -> Iterator[Interval]:
+	"""Same as _operators.intersect()"""
+	for lower_event, upper_event in sweep.intersect(_iter_merged_events(a, b), a_source=0):
+		yield _interval_from_events(lower_event, upper_event)
+
+
+def exterior(a: Iterable[Interval]) -> Iterator[Interval]:
+	"""Same as _operators.exterior()"""
+	for lower_event, upper_event, is_interior in sweep.iter_bound_pairs(_iter_merged_events(a)):
+		if not is_interior:
+			yield _interval_from_events(lower_event, upper_event)
+
+
+def union_merge_intersecting(a: Iterable[Interval], b: Iterable[Interval]) -> Iterator[Interval]:
+	"""Same as _operators.union_merge_intersecting()"""
+	return _union_merge(a, b, merge_touching=False)
+
+
+def union_merge_intersecting_or_touching(a: Iterable[Interval], b: Iterable[Interval]) -> Iterator[Interval]:
+	"""Same as _operators.union_merge_intersecting_or_touching()"""
+	return _union_merge(a, b, merge_touching=True)
+
+
+def _union_merge(a: Iterable[Interval], b: Iterable[Interval], merge_touching: bool) -> Iterator[Interval]:
+	"""
+	Streaming version of _operators.union_merge_by_sweep() for the predicates involving intersection.
+	Only the members of the current run of connected intervals are held in memory.
+	"""
+	run: List[Tuple[int, Interval]] = []
+	run_upper_bound: Optional[Bound] = None
+	for lower_event, interval in heapq.merge(_iter_keyed_by_lower_bound(a, 0), _iter_keyed_by_lower_bound(b, 1)):
+		if run and (interval.lower_bound < run_upper_bound or (merge_touching and interval.lower_bound == run_upper_bound)):
+			run.append((lower_event[2], interval))
+			if interval.upper_bound > run_upper_bound:
+				run_upper_bound = interval.upper_bound
+		else:
+			yield from _close_run(run, run_upper_bound)
+			run = [(lower_event[2], interval)]
+			run_upper_bound = interval.upper_bound
+	yield from _close_run(run, run_upper_bound)
+
+
+def _close_run(run: List[Tuple[int, Interval]], run_upper_bound: Optional[Bound]) -> Iterator[Interval]:
+	if len(run) == 1 or all(source == 0 for source, _ in run):
+		yield from (interval for _, interval in run)
+	elif run:
+		yield Interval(run[0][1].lower_bound, run_upper_bound)
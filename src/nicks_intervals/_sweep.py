@@ -0,0 +1,407 @@
+"""
+Line-sweep kernel working on compact event tuples instead of Bound / Linked_Bound objects.
+
+Each bound of each interval is represented by an event tuple:
+(
+	value: float,
+	edge_order_code: int,
+	source: int,  # which operand the interval came from
+	index: int    # position of the interval within its operand
+)
+
+Sorting a list of these tuples with the builtin sort reproduces the ordering of Linked_Bound:
+bounds are ordered by value, then PART_OF_RIGHT before PART_OF_LEFT, then upper bounds before lower bounds.
+Values which are math.isclose() to each other are treated as equal, just like Bound.__eq__().
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Tuple, List, Iterable, Iterator, Dict, Optional
+
+Event = Tuple[float, int, int, int]
+
+# the order of these codes matches the order of Linked_Bound objects which share the same value
+UPPER_PART_OF_RIGHT = 0  # the upper bound of [0, 1)
+LOWER_PART_OF_RIGHT = 1  # the lower bound of [1, 2]
+UPPER_PART_OF_LEFT = 2   # the upper bound of [0, 1]
+LOWER_PART_OF_LEFT = 3   # the lower bound of (1, 2]
+
+# source id used by the events which stand in for the bounds at infinity
+SOURCE_INFINITY = -1
+
+NEGATIVE_INFINITY_EVENT: Event = (float('-inf'), LOWER_PART_OF_RIGHT, SOURCE_INFINITY, -1)
+POSITIVE_INFINITY_EVENT: Event = (float('inf'), UPPER_PART_OF_LEFT, SOURCE_INFINITY, -1)
+
+INTERIOR = True
+EXTERIOR = False
+
+
+def edge_order_code(part_of_left: bool, is_lower_bound: bool) -> int:
+	return (2 if part_of_left else 0) + (1 if is_lower_bound else 0)
+
+
+def is_lower_bound(event: Event) -> bool:
+	return event[1] & 1 == 1
+
+
+def part_of_left(event: Event) -> bool:
+	return event[1] >= 2
+
+
+def bound_eq(a: Event, b: Event) -> bool:
+	"""Same as Bound.__eq__(); the values are close and the bounds point in the same direction."""
+	return (a[1] >> 1) == (b[1] >> 1) and (a[0] == b[0] or math.isclose(a[0], b[0]))
+
+
+def _key_without_value(event: Event) -> Tuple[int, int, int]:
+	return event[1], event[2], event[3]
+
+
+def sort_events(events: List[Event]) -> List[Event]:
+	"""
+	Sorts the list in place and returns it.
+	The tuples are sorted once by the builtin sort, then any run of values that are math.isclose() to each other (but not exactly equal)
+	is re-ordered by edge order code alone so that the result agrees with the ordering of Bound objects.
+	"""
+	events.sort()
+	run_start = 0
+	run_needs_sort = False
+	for index in range(1, len(events)):
+		value = events[index][0]
+		run_value = events[run_start][0]
+		if value == run_value:
+			continue
+		if math.isclose(run_value, value):
+			run_needs_sort = True
+			continue
+		if run_needs_sort:
+			events[run_start:index] = sorted(events[run_start:index], key=_key_without_value)
+			run_needs_sort = False
+		run_start = index
+	if run_needs_sort:
+		events[run_start:] = sorted(events[run_start:], key=_key_without_value)
+	return events
+
+
+def iter_sort_isclose_runs(events: Iterable[Event]) -> Iterator[Event]:
+	"""
+	Streaming version of sort_events() for events which are already sorted by the builtin sort (eg. the output of heapq.merge()).
+	Only a run of values which are math.isclose() to each other is held in memory while it is re-ordered.
+	"""
+	run: List[Event] = []
+	run_needs_sort = False
+	for event in events:
+		if run and event[0] != run[0][0]:
+			if math.isclose(run[0][0], event[0]):
+				run_needs_sort = True
+			else:
+				if run_needs_sort:
+					run.sort(key=_key_without_value)
+					run_needs_sort = False
+				yield from run
+				run = []
+		run.append(event)
+	if run_needs_sort:
+		run.sort(key=_key_without_value)
+	yield from run
+
+
+def events_from_columns(lower_values: Iterable[float], lower_part_of_left: Iterable[bool], upper_values: Iterable[float], upper_part_of_left: Iterable[bool], source: int = 0) -> List[Event]:
+	"""Unsorted events for a column based collection of intervals."""
+	events = []
+	for index, (lower_value, lower_left, upper_value, upper_left) in enumerate(zip(lower_values, lower_part_of_left, upper_values, upper_part_of_left)):
+		events.append((lower_value, LOWER_PART_OF_LEFT if lower_left else LOWER_PART_OF_RIGHT, source, index))
+		events.append((upper_value, UPPER_PART_OF_LEFT if upper_left else UPPER_PART_OF_RIGHT, source, index))
+	return events
+
+
+def events_from_intervals(intervals: Iterable, source: int = 0) -> List[Event]:
+	"""Unsorted events for any iterable of objects with .lower_bound and .upper_bound"""
+	events = []
+	for index, interval in enumerate(intervals):
+		lower_bound = interval.lower_bound
+		upper_bound = interval.upper_bound
+		events.append((lower_bound.value, LOWER_PART_OF_LEFT if lower_bound.part_of_left else LOWER_PART_OF_RIGHT, source, index))
+		events.append((upper_bound.value, UPPER_PART_OF_LEFT if upper_bound.part_of_left else UPPER_PART_OF_RIGHT, source, index))
+	return events
+
+
+def isclose_degenerate_value(lower_event: Event, upper_event: Event) -> Optional[float]:
+	"""
+	A closed lower bound and a closed upper bound whose values are math.isclose() but not equal (usually from different operands) enclose a single value.
+	Returns that value; the value of the bound from source 0 if only one of them is, otherwise the value of the lower bound.
+	Returns None for any other pair.
+	An interval built directly from both values would be rejected as infinitesimal (or reversed) by Interval.__init__().
+	"""
+	# the events of a piece may be the opposite kind of bound of another operand, so closedness is read from part_of_left rather than the code
+	if lower_event[0] == upper_event[0] or part_of_left(lower_event) or not part_of_left(upper_event) or not math.isclose(lower_event[0], upper_event[0]):
+		return None
+	if upper_event[2] == 0 and lower_event[2] != 0:
+		return upper_event[0]
+	return lower_event[0]
+
+
+def snap_isclose_piece(lower_event: Event, upper_event: Event) -> Tuple[Event, Event]:
+	"""The pair of events with both values set to isclose_degenerate_value(), if it is not None"""
+	value = isclose_degenerate_value(lower_event, upper_event)
+	if value is None:
+		return lower_event, upper_event
+	return (value, *lower_event[1:]), (value, *upper_event[1:])
+
+
+##############################################
+# SWEEPS
+#  All sweeps take a sorted list of events and return pairs of events (lower, upper) which describe the result intervals.
+#############################################
+
+def iter_stack_height(events: Iterable[Event]) -> Iterator[Tuple[int, Event, int]]:
+	"""yields (stack_height_before, event, stack_height_after)"""
+	stack_height = 0
+	for event in events:
+		stack_height_before = stack_height
+		stack_height += 1 if event[1] & 1 else -1
+		yield stack_height_before, event, stack_height
+
+
+def iter_bound_pairs(events: Iterable[Event]) -> Iterator[Tuple[Event, Event, bool]]:
+	"""
+	Same as _operators.iter_bound_pairs();
+	yields consecutive pairs of events which form a complete traversal of the real number line, and a flag indicating if each pair is interior.
+	Pairs of equal bounds (which cannot form a valid interval) are skipped.
+	"""
+	previous_event: Optional[Event] = None
+	stack_height = 0
+	for event in events:
+		if previous_event is None:
+			if not bound_eq(event, NEGATIVE_INFINITY_EVENT):
+				yield NEGATIVE_INFINITY_EVENT, event, EXTERIOR
+		elif not bound_eq(previous_event, event):
+			yield previous_event, event, EXTERIOR if stack_height == 0 else INTERIOR
+		stack_height += 1 if event[1] & 1 else -1
+		previous_event = event
+	if previous_event is not None and not bound_eq(previous_event, POSITIVE_INFINITY_EVENT):
+		yield previous_event, POSITIVE_INFINITY_EVENT, EXTERIOR
+
+
+def any_intersecting(events: Iterable[Event], a_source: int = 0) -> bool:
+	"""True if any interval from a_source intersects any other interval. Stops at the first intersection."""
+	a_stack_count = 0
+	b_stack_count = 0
+	for event in events:
+		if event[1] & 1:
+			if event[2] == a_source:
+				a_stack_count += 1
+			else:
+				b_stack_count += 1
+			if a_stack_count > 0 and b_stack_count > 0:
+				return True
+		elif event[2] == a_source:
+			a_stack_count -= 1
+		else:
+			b_stack_count -= 1
+	return False
+
+
+def touches(events: Iterable[Event], a_source: int = 0) -> bool:
+	"""
+	True if any interval from a_source touches any other interval, and none of them intersect.
+	Equal bounds are adjacent in sorted order, so a touch is an upper and a lower bound from different sources in the same group of equal bounds.
+	Stops at the first intersection.
+	"""
+	a_stack_count = 0
+	b_stack_count = 0
+	found_touching = False
+	group_first_event: Optional[Event] = None
+	group_has_a_upper = group_has_a_lower = group_has_b_upper = group_has_b_lower = False
+	for event in events:
+		if group_first_event is None or not bound_eq(group_first_event, event):
+			group_first_event = event
+			group_has_a_upper = group_has_a_lower = group_has_b_upper = group_has_b_lower = False
+		is_a = event[2] == a_source
+		if event[1] & 1:
+			if is_a:
+				a_stack_count += 1
+				group_has_a_lower = True
+			else:
+				b_stack_count += 1
+				group_has_b_lower = True
+			if a_stack_count > 0 and b_stack_count > 0:
+				return False
+		elif is_a:
+			a_stack_count -= 1
+			group_has_a_upper = True
+		else:
+			b_stack_count -= 1
+			group_has_b_upper = True
+		if (group_has_a_upper and group_has_b_lower) or (group_has_b_upper and group_has_a_lower):
+			found_touching = True
+	return found_touching
+
+
+def _upper_event_lt(a: Event, b: Event) -> bool:
+	"""Same as Bound.__lt__() for two upper bounds"""
+	if a[0] == b[0] or math.isclose(a[0], b[0]):
+		return a[1] < b[1]
+	return a[0] < b[0]
+
+
+def all_contained(events: List[Event], container_source: int = 0) -> bool:
+	"""
+	True if every interval which is not from container_source is contained by a single interval from container_source.
+	Container intervals whose lower bound sorts before (or equal to) the lower bound of an interval are the only ones that can contain it;
+	of those it is enough to check the one with the greatest upper bound.
+	Stops at the first interval which is not contained.
+	"""
+	upper_events: Dict[Tuple[int, int], Event] = {(event[2], event[3]): event for event in events if not event[1] & 1}
+	max_container_upper_event: Optional[Event] = None
+	for event in events:
+		if not event[1] & 1:
+			continue
+		upper_event = upper_events[(event[2], event[3])]
+		if event[2] == container_source:
+			if max_container_upper_event is None or _upper_event_lt(max_container_upper_event, upper_event):
+				max_container_upper_event = upper_event
+		elif max_container_upper_event is None or _upper_event_lt(max_container_upper_event, upper_event):
+			return False
+	return True
+
+
+def subtract(events: Iterable[Event], minuend_source: int = 0) -> Iterator[Tuple[Event, Event]]:
+	"""
+	minuend - subtrahend = difference
+	Events from minuend_source are the minuend, all other events are the subtrahend.
+	Pieces are yielded as soon as they are complete.
+	"""
+
+	# minuend intervals that are currently overlapped by the subtrahend
+	minuend_awaiting_lower_bound: Dict[int, None] = {}
+	# minuend intervals that are currently outside the subtrahend, mapped to the event where their current piece starts
+	minuend_awaiting_upper_bound: Dict[int, Event] = {}
+
+	subtrahend_stack_count = 0
+
+	for event in events:
+		if event[2] != minuend_source:
+			if event[1] & 1:
+				subtrahend_stack_count += 1
+				if subtrahend_stack_count == 1:
+					for piece_lower_event in minuend_awaiting_upper_bound.values():
+						if not bound_eq(piece_lower_event, event):
+							yield piece_lower_event, event
+					minuend_awaiting_lower_bound.update(dict.fromkeys(minuend_awaiting_upper_bound))
+					minuend_awaiting_upper_bound = {}
+			else:
+				subtrahend_stack_count -= 1
+				if subtrahend_stack_count == 0:
+					minuend_awaiting_upper_bound.update(dict.fromkeys(minuend_awaiting_lower_bound, event))
+					minuend_awaiting_lower_bound = {}
+		elif event[1] & 1:
+			if subtrahend_stack_count > 0:
+				minuend_awaiting_lower_bound[event[3]] = None
+			else:
+				minuend_awaiting_upper_bound[event[3]] = event
+		elif event[3] in minuend_awaiting_lower_bound:
+			del minuend_awaiting_lower_bound[event[3]]
+		else:
+			piece_lower_event = minuend_awaiting_upper_bound.pop(event[3])
+			if not bound_eq(piece_lower_event, event):
+				yield piece_lower_event, event
+
+
+def intersect(events: Iterable[Event], a_source: int = 0) -> Iterator[Tuple[Event, Event]]:
+	"""
+	Each interval from a_source is clipped to the region covered by all other events.
+	Same as _operators.intersect()
+	Pieces are yielded as soon as they are complete.
+	"""
+
+	# intervals of 'a' which are open at the sweep position mapped to the event where their current piece starts (None if 'b' is not covering the sweep position)
+	a_intervals_open: Dict[int, Optional[Event]] = {}
+
+	b_stack_count = 0
+	b_gap_lower_event: Optional[Event] = None
+
+	def close_pieces(upper_event: Event):
+		for key, piece_lower_event in a_intervals_open.items():
+			if piece_lower_event is not None and not bound_eq(piece_lower_event, upper_event):
+				yield piece_lower_event, upper_event
+			a_intervals_open[key] = None
+
+	for event in events:
+		if b_gap_lower_event is not None and not bound_eq(b_gap_lower_event, event):
+			yield from close_pieces(b_gap_lower_event)
+			b_gap_lower_event = None
+
+		if event[2] != a_source:
+			if event[1] & 1:
+				b_stack_count += 1
+				if b_stack_count == 1:
+					if b_gap_lower_event is None:
+						for key in a_intervals_open:
+							a_intervals_open[key] = event
+					b_gap_lower_event = None
+			else:
+				b_stack_count -= 1
+				if b_stack_count == 0:
+					b_gap_lower_event = event
+		elif event[1] & 1:
+			a_intervals_open[event[3]] = event if b_stack_count > 0 or b_gap_lower_event is not None else None
+		else:
+			piece_lower_event = a_intervals_open.pop(event[3])
+			if piece_lower_event is not None and not bound_eq(piece_lower_event, event):
+				yield piece_lower_event, event
+
+	if b_gap_lower_event is not None:
+		yield from close_pieces(b_gap_lower_event)
+
+
+
+def touching_components(events: List[Event], count: int) -> List[List[int]]:
+	"""
+	Groups the indices 0..count-1 of a single source into connected components of touching intervals (see _operators.touches_atomic).
+	Two intervals touch when the upper bound of one is equal to the lower bound of the other;
+	within each group of equal bounds every upper bound touches every lower bound, so they are joined with a union-find.
+	Components are in order of their first lower bound, and the indices within each component are in order of lower bound.
+	"""
+	parents = list(range(count))
+
+	def find(index: int) -> int:
+		while parents[index] != index:
+			parents[index] = parents[parents[index]]
+			index = parents[index]
+		return index
+
+	group_start = 0
+	for group_end in range(1, len(events) + 1):
+		if group_end < len(events) and bound_eq(events[group_start], events[group_end]):
+			continue
+		group = events[group_start:group_end]
+		if any(is_lower_bound(event) for event in group) and not all(is_lower_bound(event) for event in group):
+			root = find(group[0][3])
+			for event in group[1:]:
+				parents[find(event[3])] = root
+		group_start = group_end
+
+	components: Dict[int, List[int]] = {}
+	for event in events:
+		if event[1] & 1:
+			components.setdefault(find(event[3]), []).append(event[3])
+	return list(components.values())
+
+
+def merge_touching(events: List[Event], count: int) -> List[Tuple[Event, Event]]:
+	"""The hull of each component of touching_components(); the lowest lower bound and the highest upper bound of its members"""
+	lower_events: List[Optional[Event]] = [None] * count
+	upper_events: List[Optional[Event]] = [None] * count
+	upper_positions = [0] * count
+	for position, event in enumerate(events):
+		if event[1] & 1:
+			lower_events[event[3]] = event
+		else:
+			upper_events[event[3]] = event
+			upper_positions[event[3]] = position
+	return [
+		(lower_events[component[0]], upper_events[max(component, key=upper_positions.__getitem__)])
+		for component in touching_components(events, count)
+	]
@@ -0,0 +1,387 @@
+"""
+Lazy expressions over collections of intervals.
+
+Operations on an Expression only record a tree; nothing is computed until evaluate() is called.
+The bounds of every leaf are then sorted once and the whole tree is evaluated in a single sweep,
+keeping one stack counter per leaf.
+
+Usage:
+	result = a.lazy().subtract(b).intersect(c).merge_touching().evaluate()
+
+The result is equal (see _operators.eq()) to calling the same methods one after another.
+Like _operators.subtract() and intersect(), the structure of the left-most operand is kept;
+each of its sub-intervals is clipped to the region described by the other operands.
+After exterior, or a merge, the result is the set of maximal runs of the region described by the expression.
+
+merge_touching() and merge_intersecting() of sub-intervals which overlap each other cannot be expressed as a region.
+If that case is found during the sweep, the expression is evaluated step by step with the eager methods instead.
+The same happens if an exterior is taken of an empty collection (which is empty, rather than the complete number line).
+"""
+
+from __future__ import annotations
+
+import itertools
+from abc import ABC, abstractmethod
+from typing import Callable, Collection, Dict, List, Optional, Sequence, Tuple, Union
+
+from . import _operators as ops
+from . import _sweep as sweep
+from .Interval import Interval
+
+# takes the stack count of each leaf inside a segment of the number line and returns True if the segment is covered
+Predicate = Callable[[List[int]], bool]
+
+
+class Expression(ABC):
+
+	def subtract(self, other: Union[Expression, Collection[Interval]]) -> Expression:
+		return Subtract_Expression(self, _coerce_to_expression(other))
+
+	def intersect(self, other: Union[Expression, Collection[Interval]]) -> Expression:
+		return Intersect_Expression(self, _coerce_to_expression(other))
+
+	@property
+	def exterior(self) -> Expression:
+		return Exterior_Expression(self)
+
+	def merge_touching(self) -> Expression:
+		return Merge_Expression(self, merge_intersecting=False, merge_touching=True)
+
+	def merge_intersecting(self) -> Expression:
+		return Merge_Expression(self, merge_intersecting=True, merge_touching=False)
+
+	def merge_intersecting_or_touching(self) -> Expression:
+		return Merge_Expression(self, merge_intersecting=True, merge_touching=True)
+
+	def evaluate(self) -> Collection[Interval]:
+		# a leaf may appear more than once in the tree; it only needs one stack counter
+		leaves = list({id(leaf): leaf for leaf in self._leaves()}.values())
+		result = _evaluate_fused(self, leaves)
+		if result is None:
+			return self._evaluate_eagerly()
+		return ops.coerce_collection_to_Interval_or_Multi_Interval(result)
+
+	@abstractmethod
+	def _leaves(self) -> List[Leaf_Expression]:
+		pass
+
+	@abstractmethod
+	def _coverage(self, context: _Context) -> Predicate:
+		"""
+		True for segments of the number line which are covered by the result of this expression.
+		Every operand is evaluated (there is no short circuit) so that _Context.exterior_operand_is_covered is complete after the sweep.
+		"""
+		pass
+
+	@abstractmethod
+	def _evaluate_eagerly(self) -> Collection[Interval]:
+		pass
+
+
+class Leaf_Expression(Expression):
+	def __init__(self, intervals: Collection[Interval]):
+		self.__intervals = intervals
+
+	@property
+	def intervals(self) -> Collection[Interval]:
+		return self.__intervals
+
+	def __repr__(self):
+		return f"{self.__class__.__name__}({self.__intervals!r})"
+
+	def _leaves(self) -> List[Leaf_Expression]:
+		return [self]
+
+	def _coverage(self, context: _Context) -> Predicate:
+		source = context.sources[id(self)]
+		return lambda counts: counts[source] > 0
+
+	def _evaluate_eagerly(self) -> Collection[Interval]:
+		return ops.coerce_collection_to_Interval_or_Multi_Interval(self.__intervals)
+
+
+class Subtract_Expression(Expression):
+	def __init__(self, minuend: Expression, subtrahend: Expression):
+		self.minuend = minuend
+		self.subtrahend = subtrahend
+
+	def __repr__(self):
+		return f"{self.minuend!r}.subtract({self.subtrahend!r})"
+
+	def _leaves(self) -> List[Leaf_Expression]:
+		return self.minuend._leaves() + self.subtrahend._leaves()
+
+	def _coverage(self, context: _Context) -> Predicate:
+		minuend_coverage = self.minuend._coverage(context)
+		subtrahend_coverage = self.subtrahend._coverage(context)
+		return lambda counts: minuend_coverage(counts) > subtrahend_coverage(counts)
+
+	def _evaluate_eagerly(self) -> Collection[Interval]:
+		return self.minuend._evaluate_eagerly().subtract(self.subtrahend._evaluate_eagerly())
+
+
+class Intersect_Expression(Expression):
+	def __init__(self, a: Expression, b: Expression):
+		self.a = a
+		self.b = b
+
+	def __repr__(self):
+		return f"{self.a!r}.intersect({self.b!r})"
+
+	def _leaves(self) -> List[Leaf_Expression]:
+		return self.a._leaves() + self.b._leaves()
+
+	def _coverage(self, context: _Context) -> Predicate:
+		a_coverage = self.a._coverage(context)
+		b_coverage = self.b._coverage(context)
+		return lambda counts: a_coverage(counts) & b_coverage(counts)
+
+	def _evaluate_eagerly(self) -> Collection[Interval]:
+		return self.a._evaluate_eagerly().intersect(self.b._evaluate_eagerly())
+
+
+class Exterior_Expression(Expression):
+	def __init__(self, a: Expression):
+		self.a = a
+
+	def __repr__(self):
+		return f"{self.a!r}.exterior"
+
+	def _leaves(self) -> List[Leaf_Expression]:
+		return self.a._leaves()
+
+	def _coverage(self, context: _Context) -> Predicate:
+		a_coverage = self.a._coverage(context)
+		key = id(self)
+		context.exterior_operand_is_covered[key] = False
+
+		def coverage(counts: List[int]) -> bool:
+			if a_coverage(counts):
+				context.exterior_operand_is_covered[key] = True
+				return False
+			return True
+		return coverage
+
+	def _evaluate_eagerly(self) -> Collection[Interval]:
+		return self.a._evaluate_eagerly().exterior
+
+
+class Merge_Expression(Expression):
+	def __init__(self, a: Expression, merge_intersecting: bool, merge_touching: bool):
+		self.a = a
+		self.intersecting = merge_intersecting
+		self.touching = merge_touching
+
+	def __repr__(self):
+		if self.intersecting and self.touching:
+			return f"{self.a!r}.merge_intersecting_or_touching()"
+		if self.intersecting:
+			return f"{self.a!r}.merge_intersecting()"
+		return f"{self.a!r}.merge_touching()"
+
+	def _leaves(self) -> List[Leaf_Expression]:
+		return self.a._leaves()
+
+	def _coverage(self, context: _Context) -> Predicate:
+		return self.a._coverage(context)
+
+	def _evaluate_eagerly(self) -> Collection[Interval]:
+		a = self.a._evaluate_eagerly()
+		if self.intersecting and self.touching:
+			return a.merge_intersecting_or_touching()
+		if self.intersecting:
+			return a.merge_intersecting()
+		return a.merge_touching()
+
+
+def lazy(a: Union[Expression, Collection[Interval]]) -> Expression:
+	return _coerce_to_expression(a)
+
+
+def _coerce_to_expression(a: Union[Expression, Collection[Interval]]) -> Expression:
+	if isinstance(a, Expression):
+		return a
+	return Leaf_Expression(a)
+
+
+##############################################
+# FUSED EVALUATION
+#############################################
+
+class _Plan:
+	"""
+	How the result of an expression is read off the sweep.
+	clip: the sub-intervals of the primary leaf, each clipped to the segments where all mask terms hold.
+	region: the maximal runs of segments covered by the expression (primary is None).
+	If disjoint_leaf is not None, the result is only correct when no two sub-intervals of disjoint_leaf overlap inside the segments where the disjoint mask terms hold.
+	Each term is (expression, covered).
+	"""
+	def __init__(self, primary: Optional[Leaf_Expression], mask_terms: Tuple[Tuple[Expression, bool], ...], disjoint_leaf: Optional[Leaf_Expression] = None, disjoint_mask_terms: Tuple[Tuple[Expression, bool], ...] = tuple()):
+		self.primary = primary
+		self.mask_terms = mask_terms
+		self.disjoint_leaf = disjoint_leaf
+		self.disjoint_mask_terms = disjoint_mask_terms
+
+	@property
+	def is_clip(self) -> bool:
+		return self.primary is not None
+
+	def as_region(self) -> _Plan:
+		return _Plan(None, tuple(), self.disjoint_leaf, self.disjoint_mask_terms)
+
+	def requiring_disjoint(self) -> _Plan:
+		"""Sub-intervals of the primary leaf which are disjoint stay disjoint when clipped further, so only the first requirement is kept"""
+		if self.disjoint_leaf is not None:
+			return self
+		return _Plan(self.primary, self.mask_terms, self.primary, self.mask_terms)
+
+
+def _plan(expression: Expression) -> _Plan:
+	"""
+	Follows the left-most operand down to a leaf.
+	Subtract and intersect keep the sub-intervals of their left operand, so they add a term to the mask.
+	Exterior and merge_intersecting_or_touching always produce maximal runs.
+	merge_touching of disjoint sub-intervals produces maximal runs, and merge_intersecting of disjoint sub-intervals changes nothing.
+	"""
+	if isinstance(expression, Leaf_Expression):
+		return _Plan(expression, tuple())
+	if isinstance(expression, (Subtract_Expression, Intersect_Expression)):
+		if isinstance(expression, Subtract_Expression):
+			left, term = expression.minuend, (expression.subtrahend, False)
+		else:
+			left, term = expression.a, (expression.b, True)
+		plan = _plan(left)
+		if plan.is_clip:
+			return _Plan(plan.primary, plan.mask_terms + (term,), plan.disjoint_leaf, plan.disjoint_mask_terms)
+		return plan
+	if isinstance(expression, Exterior_Expression):
+		return _plan(expression.a).as_region()
+	if isinstance(expression, Merge_Expression):
+		plan = _plan(expression.a)
+		if not plan.is_clip:
+			return plan
+		plan = plan.requiring_disjoint()
+		if expression.touching:
+			return plan.as_region()
+		return plan
+	raise TypeError(f"Unknown expression {expression!r}")
+
+
+class _Context:
+	def __init__(self, leaves: List[Leaf_Expression]):
+		# id of each leaf mapped to its source in the sweep events
+		self.sources: Dict[int, int] = {id(leaf): source for source, leaf in enumerate(leaves)}
+		# id of each Exterior_Expression mapped to True once its operand has been found to cover some segment
+		self.exterior_operand_is_covered: Dict[int, bool] = {}
+
+
+def _compile_mask(terms: Sequence[Tuple[Expression, bool]], context: _Context) -> Predicate:
+	predicates = [(expression._coverage(context), covered) for expression, covered in terms]
+	return lambda counts: all([predicate(counts) == covered for predicate, covered in predicates])
+
+
+def _evaluate_fused(expression: Expression, leaves: List[Leaf_Expression]) -> Optional[List[Interval]]:
+	"""
+	Evaluates the expression in one sweep over the sorted bounds of all leaves.
+	Returns None if the result cannot be read off the sweep:
+	 - the plan required the primary leaf to be disjoint and it was not
+	 - an exterior was taken of an empty collection; _operators.exterior() of an empty collection is empty rather than the complete number line
+	"""
+	context = _Context(leaves)
+	sources = context.sources
+	sorted_events, operands = ops.get_sorted_bound_events(*(leaf.intervals for leaf in leaves))
+	plan = _plan(expression)
+	if plan.is_clip:
+		covered = _compile_mask(plan.mask_terms, context)
+	else:
+		covered = expression._coverage(context)
+	if plan.disjoint_leaf is not None:
+		disjoint_check = (sources[id(plan.disjoint_leaf)], _compile_mask(plan.disjoint_mask_terms, context))
+	else:
+		disjoint_check = None
+	if plan.is_clip:
+		pairs, has_overlap = _sweep_clip(sorted_events, len(leaves), sources[id(plan.primary)], covered, disjoint_check)
+	else:
+		pairs, has_overlap = _sweep_region(sorted_events, len(leaves), covered, disjoint_check)
+	if has_overlap or not all(context.exterior_operand_is_covered.values()):
+		return None
+	return [ops.get_interval_of_events(operands, lower_event, upper_event) for lower_event, upper_event in pairs]
+
+
+def _has_overlap(counts: List[int], disjoint_check: Optional[Tuple[int, Predicate]]) -> bool:
+	return disjoint_check is not None and counts[disjoint_check[0]] > 1 and disjoint_check[1](counts)
+
+
+def _sweep_clip(sorted_events: List[sweep.Event], leaf_count: int, primary_source: int, mask: Predicate, disjoint_check: Optional[Tuple[int, Predicate]]) -> Tuple[List[Tuple[sweep.Event, sweep.Event]], bool]:
+	"""
+	Like _sweep.subtract() and _sweep.intersect(), but the other operands are replaced by the mask.
+	The segments between consecutive bounds are visited in order (pairs of equal bounds enclose nothing and are skipped);
+	while a segment is visited counts holds the stack count of each leaf inside it.
+	The primary intervals which are open are mapped to the event where their current piece starts (None while the mask is False).
+	"""
+	counts = [0] * leaf_count
+	result = []
+	has_overlap = False
+	open_pieces: Dict[int, Optional[sweep.Event]] = {}
+	# primary intervals opened since the last segment, mapped to their lower event
+	opened: Dict[int, sweep.Event] = {}
+	mask_is_true = False
+	previous_event = sweep.NEGATIVE_INFINITY_EVENT
+	for event in itertools.chain(sorted_events, (sweep.POSITIVE_INFINITY_EVENT,)):
+		if not sweep.bound_eq(previous_event, event):
+			# counts describe the segment between previous_event and event
+			segment_mask = mask(counts)
+			if segment_mask and not mask_is_true:
+				for index in open_pieces:
+					open_pieces[index] = previous_event
+			elif mask_is_true and not segment_mask:
+				for index, piece_lower_event in open_pieces.items():
+					if piece_lower_event is not None and not sweep.bound_eq(piece_lower_event, previous_event):
+						result.append((piece_lower_event, previous_event))
+					open_pieces[index] = None
+			for index, lower_event in opened.items():
+				open_pieces[index] = lower_event if segment_mask else None
+			opened = {}
+			mask_is_true = segment_mask
+			if _has_overlap(counts, disjoint_check):
+				has_overlap = True
+				break
+		if event[2] == primary_source:
+			if event[1] & 1:
+				opened[event[3]] = event
+			elif event[3] in opened:
+				del opened[event[3]]
+			else:
+				piece_lower_event = open_pieces.pop(event[3])
+				if piece_lower_event is not None and not sweep.bound_eq(piece_lower_event, event):
+					result.append((piece_lower_event, event))
+		if event[2] != sweep.SOURCE_INFINITY:
+			counts[event[2]] += 1 if event[1] & 1 else -1
+		previous_event = event
+	return result, has_overlap
+
+
+def _sweep_region(sorted_events: List[sweep.Event], leaf_count: int, coverage: Predicate, disjoint_check: Optional[Tuple[int, Predicate]]) -> Tuple[List[Tuple[sweep.Event, sweep.Event]], bool]:
+	"""Maximal runs of consecutive segments which are covered. Segments are visited as in _sweep_clip()"""
+	counts = [0] * leaf_count
+	result = []
+	run_lower_event: Optional[sweep.Event] = None
+	run_upper_event: Optional[sweep.Event] = None
+	previous_event = sweep.NEGATIVE_INFINITY_EVENT
+	for event in itertools.chain(sorted_events, (sweep.POSITIVE_INFINITY_EVENT,)):
+		if not sweep.bound_eq(previous_event, event):
+			if _has_overlap(counts, disjoint_check):
+				return result, True
+			if coverage(counts):
+				if run_lower_event is None:
+					run_lower_event = previous_event
+				run_upper_event = event
+			elif run_lower_event is not None:
+				result.append((run_lower_event, run_upper_event))
+				run_lower_event = None
+		if event[2] != sweep.SOURCE_INFINITY:
+			counts[event[2]] += 1 if event[1] & 1 else -1
+		previous_event = event
+	if run_lower_event is not None:
+		result.append((run_lower_event, run_upper_event))
+	return result, False
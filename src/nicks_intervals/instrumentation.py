@@ -0,0 +1,272 @@
+"""
+Opt-in instrumentation of the functions in _operators.
+
+While disabled nothing is wrapped, so there is no cost at all.
+While enabled, each call to an instrumented operator records:
+ - the shape of its inputs (the len() of each collection argument)
+ - the size of its output
+ - the wall time
+ - the number of sweep events sorted (by _sweep.sort_events())
+ - the number of Bound and Interval objects created
+Nested calls are included in the totals of every operator that is running, so time and counts are inclusive.
+
+Usage:
+	from nicks_intervals import instrumentation
+
+	with instrumentation.measure() as recorder:
+		a.subtract(b)
+	print(recorder.snapshot()["operators"]["subtract"])
+	recorder.dump_slowest_calls(5)
+
+or enable() / snapshot() / disable() for measurements which span more than one block.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import functools
+import heapq
+import itertools
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, TextIO, Iterator
+
+from . import _operators as ops
+from . import _sweep as sweep
+from .Bound import Bound
+from .Interval import Interval
+
+# The functions in _operators which are wrapped while instrumentation is enabled.
+# The _atomic functions are left out; they are called once per pair of intervals and the wrapper would dominate their cost.
+INSTRUMENTED_OPERATORS = (
+	"subtract",
+	"intersect",
+	"exterior",
+	"interior",
+	"interior_merged",
+	"hull",
+	"eq",
+	"intersects",
+	"touches",
+	"contains_value",
+	"contains_interval",
+	"union_merge_touching",
+	"union_merge_intersecting",
+	"union_merge_intersecting_or_touching",
+	"union_merge_on_predicate",
+	"union_merge_on_predicate_linked",
+	"union_merge_by_sweep",
+	"apply_interval_maps_to_intervals",
+)
+
+
+class Operator_Call:
+	__slots__ = ("operator", "input_shape", "output_size", "seconds", "sweep_events", "bounds_allocated", "intervals_allocated")
+
+	def __init__(self, operator: str, input_shape: Tuple[Any, ...]):
+		self.operator = operator
+		self.input_shape = input_shape
+		self.output_size: Optional[int] = None
+		self.seconds = 0.0
+		self.sweep_events = 0
+		self.bounds_allocated = 0
+		self.intervals_allocated = 0
+
+	def as_dict(self) -> Dict[str, Any]:
+		return {name: getattr(self, name) for name in self.__slots__}
+
+	def __lt__(self, other: Operator_Call):
+		return self.seconds < other.seconds
+
+
+class Recorder:
+	"""Collects the calls made while instrumentation is enabled. Obtained from enable() or measure()."""
+
+	def __init__(self, slowest_calls_kept: int = 20):
+		self.__lock = threading.Lock()
+		self.__local = threading.local()
+		self.__operators: Dict[str, Dict[str, float]] = {}
+		self.__slowest_calls: List[Tuple[float, int, Operator_Call]] = []
+		self.__slowest_calls_kept = slowest_calls_kept
+		self.__call_counter = itertools.count()
+		self.__sweep_events = 0
+		self.__bounds_allocated = 0
+		self.__intervals_allocated = 0
+
+	@property
+	def _active_calls(self) -> List[Operator_Call]:
+		"""The calls running on the current thread, outermost first"""
+		if not hasattr(self.__local, "active_calls"):
+			self.__local.active_calls = []
+		return self.__local.active_calls
+
+	def _count(self, attribute: str, amount: int):
+		for call in self._active_calls:
+			setattr(call, attribute, getattr(call, attribute) + amount)
+		with self.__lock:
+			if attribute == "sweep_events":
+				self.__sweep_events += amount
+			elif attribute == "bounds_allocated":
+				self.__bounds_allocated += amount
+			else:
+				self.__intervals_allocated += amount
+
+	def _finish(self, call: Operator_Call):
+		with self.__lock:
+			totals = self.__operators.setdefault(call.operator, {
+				"calls": 0,
+				"seconds": 0.0,
+				"input_size": 0,
+				"output_size": 0,
+				"sweep_events": 0,
+				"bounds_allocated": 0,
+				"intervals_allocated": 0,
+			})
+			totals["calls"] += 1
+			totals["seconds"] += call.seconds
+			totals["input_size"] += sum(size for size in call.input_shape if isinstance(size, int))
+			totals["output_size"] += call.output_size or 0
+			totals["sweep_events"] += call.sweep_events
+			totals["bounds_allocated"] += call.bounds_allocated
+			totals["intervals_allocated"] += call.intervals_allocated
+			entry = (call.seconds, next(self.__call_counter), call)
+			if len(self.__slowest_calls) < self.__slowest_calls_kept:
+				heapq.heappush(self.__slowest_calls, entry)
+			else:
+				heapq.heappushpop(self.__slowest_calls, entry)
+
+	def snapshot(self) -> Dict[str, Any]:
+		"""A copy of everything recorded so far, as plain dicts"""
+		with self.__lock:
+			return {
+				"operators": {name: dict(totals) for name, totals in self.__operators.items()},
+				"sweep_events": self.__sweep_events,
+				"bounds_allocated": self.__bounds_allocated,
+				"intervals_allocated": self.__intervals_allocated,
+			}
+
+	def slowest_calls(self, count: Optional[int] = None) -> List[Dict[str, Any]]:
+		"""The slowest calls recorded, slowest first. At most slowest_calls_kept calls are retained."""
+		with self.__lock:
+			calls = sorted(self.__slowest_calls, reverse=True)
+		return [call.as_dict() for _, _, call in calls[:count]]
+
+	def dump_slowest_calls(self, count: int = 10, file: TextIO = None):
+		file = file if file is not None else sys.stdout
+		for call in self.slowest_calls(count):
+			print(
+				f"{call['seconds']:10.6f}s  {call['operator']}{call['input_shape']} -> {call['output_size']}"
+				f"  events={call['sweep_events']} bounds={call['bounds_allocated']} intervals={call['intervals_allocated']}",
+				file=file
+			)
+
+
+_recorder: Optional[Recorder] = None
+_originals: Dict[Tuple[Any, str], Any] = {}
+
+
+def _shape(argument: Any) -> Any:
+	"""len() of collections, otherwise a short description of the argument"""
+	if isinstance(argument, (int, float)):
+		return "value"
+	if callable(argument) and not hasattr(argument, "__len__"):
+		return getattr(argument, "__name__", type(argument).__name__)
+	try:
+		return len(argument)
+	except TypeError:
+		return type(argument).__name__
+
+
+def _wrap_operator(name: str, function: Callable) -> Callable:
+	@functools.wraps(function)
+	def wrapper(*args, **kwargs):
+		recorder = _recorder
+		if recorder is None:
+			return function(*args, **kwargs)
+		call = Operator_Call(name, tuple(_shape(argument) for argument in itertools.chain(args, kwargs.values())))
+		active_calls = recorder._active_calls
+		active_calls.append(call)
+		start = time.perf_counter()
+		try:
+			result = function(*args, **kwargs)
+		finally:
+			call.seconds = time.perf_counter() - start
+			active_calls.pop()
+		output_size = _shape(result)
+		call.output_size = output_size if isinstance(output_size, int) else None
+		recorder._finish(call)
+		return result
+	return wrapper
+
+
+def _wrap_counter(function: Callable, attribute: str, get_amount: Callable[..., int]) -> Callable:
+	@functools.wraps(function)
+	def wrapper(*args, **kwargs):
+		recorder = _recorder
+		if recorder is not None:
+			recorder._count(attribute, get_amount(*args, **kwargs))
+		return function(*args, **kwargs)
+	return wrapper
+
+
+def _patch(owner: Any, name: str, replacement: Any):
+	_originals[(owner, name)] = owner.__dict__[name] if isinstance(owner, type) else getattr(owner, name)
+	setattr(owner, name, replacement)
+
+
+def enable(slowest_calls_kept: int = 20) -> Recorder:
+	"""Starts recording into a new Recorder and returns it. If instrumentation is already enabled the recorder is replaced."""
+	global _recorder
+	if not _originals:
+		for name in INSTRUMENTED_OPERATORS:
+			_patch(ops, name, _wrap_operator(name, getattr(ops, name)))
+		_patch(sweep, "sort_events", _wrap_counter(sweep.sort_events, "sweep_events", lambda events: len(events)))
+		for cls, attribute in ((Bound, "bounds_allocated"), (Interval, "intervals_allocated")):
+			_patch(cls, "__init__", _wrap_counter(cls.__dict__["__init__"], attribute, lambda *args, **kwargs: 1))
+			unchecked = cls.__dict__["_unchecked"].__func__
+			_patch(cls, "_unchecked", classmethod(_wrap_counter(unchecked, attribute, lambda *args, **kwargs: 1)))
+	_recorder = Recorder(slowest_calls_kept)
+	return _recorder
+
+
+def disable():
+	"""Stops recording and restores the original functions"""
+	global _recorder
+	_recorder = None
+	for (owner, name), original in _originals.items():
+		setattr(owner, name, original)
+	_originals.clear()
+
+
+def is_enabled() -> bool:
+	return _recorder is not None
+
+
+def get_recorder() -> Optional[Recorder]:
+	return _recorder
+
+
+def snapshot() -> Dict[str, Any]:
+	"""Snapshot of the current recorder; raises an Exception if instrumentation is not enabled"""
+	if _recorder is None:
+		raise Exception("Instrumentation is not enabled. Call instrumentation.enable() or use instrumentation.measure()")
+	return _recorder.snapshot()
+
+
+@contextlib.contextmanager
+def measure(slowest_calls_kept: int = 20) -> Iterator[Recorder]:
+	"""
+	Records the operator calls made inside the with block.
+	If instrumentation was already enabled, the previous recorder is restored afterwards (it does not see the calls made inside the block).
+	"""
+	global _recorder
+	previous_recorder = _recorder
+	recorder = enable(slowest_calls_kept)
+	try:
+		yield recorder
+	finally:
+		if previous_recorder is None:
+			disable()
+		else:
+			_recorder = previous_recorder
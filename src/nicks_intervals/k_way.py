@@ -0,0 +1,107 @@
+"""
+Set operations over many collections of intervals at once.
+
+The binary operators in _operators combine two collections at a time, so overlaying k layers takes k - 1 passes
+over a growing intermediate result. These functions merge the sorted bounds of all k collections through a heap
+(see _streaming.iter_events()) and sweep them once, counting how many collections cover each segment of the number line.
+For N intervals in total this is O(N log k) once each collection is sorted by lower bound;
+collections which are not sorted are sorted first.
+
+The results describe regions of the number line: they are the maximal runs of covered segments,
+so they never intersect or touch each other (like merge_intersecting_or_touching()).
+
+Usage:
+	from nicks_intervals import k_way
+	k_way.union(layers)
+	k_way.at_least(layers, 3)
+"""
+
+from __future__ import annotations
+
+import heapq
+from typing import Callable, Collection, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from . import _operators as ops
+from . import _streaming as streaming
+from . import _sweep as sweep
+from .Interval import Interval
+from .Multi_Interval import Multi_Interval
+
+
+def union(operands: Iterable[Collection[Interval]]) -> Collection[Interval]:
+	"""The region covered by at least one operand"""
+	return _sweep_coverage(operands, lambda covering_count, operand_count: covering_count > 0)
+
+
+def intersect(operands: Iterable[Collection[Interval]]) -> Collection[Interval]:
+	"""The region covered by every operand"""
+	operands = list(operands)
+	if not operands:
+		raise Exception("The intersection of no operands is not defined")
+	return _sweep_coverage(operands, lambda covering_count, operand_count: covering_count == operand_count)
+
+
+def at_least(operands: Iterable[Collection[Interval]], threshold: int) -> Collection[Interval]:
+	"""The region covered by at least threshold operands; overlapping intervals within one operand only count once"""
+	if threshold < 1:
+		raise Exception(f"threshold must be at least 1, got {threshold}")
+	return _sweep_coverage(operands, lambda covering_count, operand_count: covering_count >= threshold)
+
+
+def symmetric_difference(operands: Iterable[Collection[Interval]]) -> Collection[Interval]:
+	"""The region covered by an odd number of operands"""
+	return _sweep_coverage(operands, lambda covering_count, operand_count: covering_count % 2 == 1)
+
+
+def _sorted_by_lower_bound(operand: Collection[Interval]) -> Sequence[Interval]:
+	intervals = tuple(operand)
+	if isinstance(operand, Multi_Interval) and operand.is_sorted_and_disjoint:
+		return intervals
+	if all(not (current.lower_bound < previous.lower_bound) for previous, current in zip(intervals, intervals[1:])):
+		return intervals
+	return sorted(intervals, key=lambda interval: interval.lower_bound)
+
+
+def _iter_merged_events(operands: Sequence[Sequence[Interval]]) -> Iterator[sweep.Event]:
+	return sweep.iter_sort_isclose_runs(heapq.merge(*(streaming.iter_events(operand, source) for source, operand in enumerate(operands))))
+
+
+def _sweep_coverage(operands: Iterable[Collection[Interval]], is_covered: Callable[[int, int], bool]) -> Collection[Interval]:
+	"""
+	Sweeps the merged events of all operands, keeping a stack count per operand and the number of operands with a count above 0.
+	Segments between consecutive bounds (pairs of equal bounds enclose nothing and are skipped) are covered if is_covered(covering_count, operand_count).
+	Runs of covered segments are joined into one interval.
+	"""
+	operands = [_sorted_by_lower_bound(operand) for operand in operands]
+	operand_count = len(operands)
+	counts = [0] * operand_count
+	covering_count = 0
+	pairs: List[Tuple[sweep.Event, sweep.Event]] = []
+	run_lower_event: Optional[sweep.Event] = None
+	run_upper_event: Optional[sweep.Event] = None
+	previous_event: Optional[sweep.Event] = None
+	for event in _iter_merged_events(operands):
+		if previous_event is not None and not sweep.bound_eq(previous_event, event):
+			if is_covered(covering_count, operand_count):
+				if run_lower_event is None:
+					run_lower_event = previous_event
+				run_upper_event = event
+			elif run_lower_event is not None:
+				pairs.append((run_lower_event, run_upper_event))
+				run_lower_event = None
+		source = event[2]
+		if event[1] & 1:
+			counts[source] += 1
+			if counts[source] == 1:
+				covering_count += 1
+		else:
+			counts[source] -= 1
+			if counts[source] == 0:
+				covering_count -= 1
+		previous_event = event
+	if run_lower_event is not None:
+		pairs.append((run_lower_event, run_upper_event))
+	return ops.coerce_collection_to_Interval_or_Multi_Interval([
+		ops.get_interval_of_events(operands, lower_event, upper_event)
+		for lower_event, upper_event in pairs
+	])
@@ -0,0 +1,229 @@
+"""
+Process pool versions of subtract, intersect and exterior.
+
+The number line is cut at split values chosen so that the slabs between them hold roughly equal numbers of bounds.
+Split values are placed between consecutive bound values, never math.isclose() to any bound, so they may fall inside touching or overlapping runs of intervals.
+Intervals of the operand whose structure is kept (the minuend, 'a', or the only operand of exterior) are clipped at each split value;
+the part left of a split value ends with an open bound there and the part to the right starts with a closed bound, so every slab can be swept independently by the _sweep kernel in a worker process.
+Intervals of the other operand are sent whole to every slab they overlap.
+
+The results of the slabs are stitched back together: a piece which ends at a split value is joined to the piece of the same interval which starts there in the next slab.
+For exterior the pieces in the gaps between slabs (and out to infinity) are added back.
+The output is equal to that of the serial function in _operators.
+
+Intervals are sent to the workers as plain tuples of (value, part_of_left) columns rather than pickled Bound / Interval objects.
+Inputs too small to be worth splitting are passed straight to the serial function.
+"""
+
+from __future__ import annotations
+
+import bisect
+import concurrent.futures
+import math
+import os
+from typing import Collection, Dict, List, Optional, Tuple, Sequence
+
+from . import _operators as ops
+from . import _sweep as sweep
+from .Bound import Bound, iBound_Negative_Infinity, iBound_Positive_Infinity
+from .Interval import Interval
+
+# (lower_value, lower_part_of_left, upper_value, upper_part_of_left, source, index)
+Row = Tuple[float, bool, float, bool, int, int]
+# (value, part_of_left)
+Bound_Row = Tuple[float, bool]
+# (lower, upper, index of the clipped interval the piece continues from in the previous slab or None, index of the clipped interval it continues into in the next slab or None)
+Piece_Row = Tuple[Bound_Row, Bound_Row, Optional[int], Optional[int]]
+# (rows, split value at the left of the slab or None, split value at the right of the slab or None)
+Slab = Tuple[List[Row], Optional[float], Optional[float]]
+
+DEFAULT_MIN_SLAB_SIZE = 10_000
+
+
+def subtract(minuend: Collection[Interval], subtrahend: Collection[Interval], processes: Optional[int] = None, executor: Optional[concurrent.futures.Executor] = None, min_slab_size: int = DEFAULT_MIN_SLAB_SIZE) -> Collection[Interval]:
+	"""Same as _operators.subtract()"""
+	slabs = _get_slabs((minuend, subtrahend), processes, min_slab_size)
+	if slabs is None:
+		return ops.subtract(minuend, subtrahend)
+	return _join_pieces(_map_slabs("subtract", slabs, processes, executor))
+
+
+def intersect(a: Collection[Interval], b: Collection[Interval], processes: Optional[int] = None, executor: Optional[concurrent.futures.Executor] = None, min_slab_size: int = DEFAULT_MIN_SLAB_SIZE) -> Collection[Interval]:
+	"""Same as _operators.intersect()"""
+	slabs = _get_slabs((a, b), processes, min_slab_size)
+	if slabs is None:
+		return ops.intersect(a, b)
+	return _join_pieces(_map_slabs("intersect", slabs, processes, executor))
+
+
+def exterior(a: Collection[Interval], processes: Optional[int] = None, executor: Optional[concurrent.futures.Executor] = None, min_slab_size: int = DEFAULT_MIN_SLAB_SIZE) -> Collection[Interval]:
+	"""
+	Same as _operators.exterior()
+	Each slab only returns the exterior pieces between its own first and last bound;
+	the pieces before the first slab, between slabs, and after the last slab are stitched on here.
+	Where intervals were clipped at a split value the last bound of one slab and the first bound of the next are both at the split value, and there is no gap.
+	"""
+	slabs = _get_slabs((a,), processes, min_slab_size)
+	if slabs is None:
+		return ops.exterior(a)
+	result = []
+	previous_last_bound: Bound = iBound_Negative_Infinity
+	for (_, left_split_value, _), (pieces, first_bound, last_bound) in zip(slabs, _map_slabs("exterior", slabs, processes, executor)):
+		if previous_last_bound is iBound_Negative_Infinity:
+			if first_bound != iBound_Negative_Infinity:
+				result.append(Interval._unchecked(iBound_Negative_Infinity, first_bound))
+		elif first_bound.value != left_split_value:
+			result.append(Interval._unchecked(previous_last_bound, first_bound))
+		result.extend(Interval._unchecked(lower, upper) for lower, upper, _, _ in pieces)
+		previous_last_bound = last_bound
+	if previous_last_bound != iBound_Positive_Infinity:
+		result.append(Interval._unchecked(previous_last_bound, iBound_Positive_Infinity))
+	return ops.coerce_collection_to_Interval_or_Multi_Interval(result)
+
+
+def _join_pieces(slab_results: List[Tuple[List[Tuple[Bound, Bound, Optional[int], Optional[int]]], Bound, Bound]]) -> List[Interval]:
+	"""Joins each piece that ends at a split value to the piece of the same clipped interval that starts there in the next slab"""
+	result = []
+	continued_lower_bounds: Dict[int, Bound] = {}
+	for pieces, _, _ in slab_results:
+		for lower, upper, continues_from, continues_into in pieces:
+			if continues_from is not None:
+				lower = continued_lower_bounds.pop(continues_from)
+			if continues_into is not None:
+				continued_lower_bounds[continues_into] = lower
+			else:
+				result.append(Interval._unchecked(lower, upper))
+	return result
+
+
+def _get_slabs(operands: Sequence[Collection[Interval]], processes: Optional[int], min_slab_size: int) -> Optional[List[Slab]]:
+	"""
+	Returns the rows of each slab along with the split values on either side of it, or None if the input is not worth splitting.
+	Intervals of the first operand are clipped at the split values; intervals of the other operands are copied whole into every slab they overlap.
+	"""
+	processes = processes if processes is not None else os.cpu_count() or 1
+	rows: List[Row] = [
+		(interval.lower_bound.value, interval.lower_bound.part_of_left, interval.upper_bound.value, interval.upper_bound.part_of_left, source, index)
+		for source, operand in enumerate(operands)
+		for index, interval in enumerate(operand)
+	]
+	if processes < 2 or len(rows) < 2 * min_slab_size:
+		return None
+
+	# more slabs than processes so that uneven slabs still keep every process busy
+	target_slab_size = max(min_slab_size, math.ceil(len(rows) / (processes * 4)))
+	split_values = _get_split_values(rows, math.ceil(len(rows) / target_slab_size))
+	if not split_values:
+		return None
+
+	slab_rows: List[List[Row]] = [[] for _ in range(len(split_values) + 1)]
+	for row in rows:
+		lower_value, lower_part_of_left, upper_value, upper_part_of_left, source, index = row
+		first_slab = bisect.bisect_left(split_values, lower_value)
+		last_slab = bisect.bisect_left(split_values, upper_value)
+		if first_slab == last_slab or source != 0:
+			for slab in range(first_slab, last_slab + 1):
+				slab_rows[slab].append(row)
+			continue
+		for slab in range(first_slab, last_slab + 1):
+			slab_rows[slab].append((
+				lower_value if slab == first_slab else split_values[slab - 1],
+				lower_part_of_left if slab == first_slab else False,
+				upper_value if slab == last_slab else split_values[slab],
+				upper_part_of_left if slab == last_slab else False,
+				source,
+				index
+			))
+	return [
+		(rows, split_values[slab - 1] if slab > 0 else None, split_values[slab] if slab < len(split_values) else None)
+		for slab, rows in enumerate(slab_rows)
+	]
+
+
+def _get_split_values(rows: List[Row], slab_count: int) -> List[float]:
+	"""
+	Up to slab_count - 1 increasing split values which divide the finite bound values into runs of roughly equal length.
+	Each split value is the midpoint of two consecutive bound values, and is not math.isclose() to either of them (or to any other bound).
+	"""
+	values = sorted(value for row in rows for value in (row[0], row[2]) if math.isfinite(value))
+	split_values = []
+	position = 0
+	for slab in range(1, slab_count):
+		position = max(position, slab * len(values) // slab_count)
+		while position + 1 < len(values):
+			lower_value = values[position]
+			upper_value = values[position + 1]
+			split_value = (lower_value + upper_value) / 2
+			position += 1
+			if lower_value < split_value < upper_value and not math.isclose(lower_value, split_value) and not math.isclose(split_value, upper_value):
+				split_values.append(split_value)
+				break
+	return split_values
+
+
+def _map_slabs(operation: str, slabs: List[Slab], processes: Optional[int], executor: Optional[concurrent.futures.Executor]) -> List[Tuple[List[Tuple[Bound, Bound, Optional[int], Optional[int]]], Bound, Bound]]:
+	"""Runs _sweep_slab on each slab and converts the rows it returns back into Bound objects"""
+	if executor is None:
+		with concurrent.futures.ProcessPoolExecutor(max_workers=processes) as new_executor:
+			slab_results = list(new_executor.map(_sweep_slab, [operation] * len(slabs), slabs))
+	else:
+		slab_results = list(executor.map(_sweep_slab, [operation] * len(slabs), slabs))
+	return [
+		(
+			[(_bound_from_row(lower), _bound_from_row(upper), continues_from, continues_into) for lower, upper, continues_from, continues_into in pieces],
+			_bound_from_row(first_bound),
+			_bound_from_row(last_bound)
+		)
+		for pieces, first_bound, last_bound in slab_results
+	]
+
+
+def _bound_from_row(row: Bound_Row) -> Bound:
+	if row == (-math.inf, False):
+		return iBound_Negative_Infinity
+	if row == (math.inf, True):
+		return iBound_Positive_Infinity
+	return Bound._unchecked(*row)
+
+
+def _bound_row(event: sweep.Event) -> Bound_Row:
+	return event[0], sweep.part_of_left(event)
+
+
+def _sweep_slab(operation: str, slab: Slab) -> Tuple[List[Piece_Row], Bound_Row, Bound_Row]:
+	"""
+	Runs in the worker process.
+	Returns the pieces of the result as pairs of bound rows, along with the first and last bound of the slab.
+	No bound other than a clipped one lies at a split value, so a piece which starts or ends at a split value continues in the neighbouring slab;
+	the index of its interval is returned so that the parts can be joined.
+	"""
+	rows, left_split_value, right_split_value = slab
+	events = []
+	for lower_value, lower_part_of_left, upper_value, upper_part_of_left, source, index in rows:
+		events.append((lower_value, sweep.LOWER_PART_OF_LEFT if lower_part_of_left else sweep.LOWER_PART_OF_RIGHT, source, index))
+		events.append((upper_value, sweep.UPPER_PART_OF_LEFT if upper_part_of_left else sweep.UPPER_PART_OF_RIGHT, source, index))
+	sweep.sort_events(events)
+
+	if operation == "subtract":
+		pairs = sweep.subtract(events, minuend_source=0)
+	elif operation == "intersect":
+		pairs = sweep.intersect(events, a_source=0)
+	elif operation == "exterior":
+		pairs = (
+			(lower_event, upper_event)
+			for lower_event, upper_event, is_interior in sweep.iter_bound_pairs(events)
+			if not is_interior and lower_event[2] != sweep.SOURCE_INFINITY and upper_event[2] != sweep.SOURCE_INFINITY
+		)
+	else:
+		raise Exception(f"Unknown operation '{operation}'")
+
+	pieces = [
+		(
+			_bound_row(lower_event),
+			_bound_row(upper_event),
+			lower_event[3] if lower_event[0] == left_split_value else None,
+			upper_event[3] if upper_event[0] == right_split_value else None
+		)
+		for lower_event, upper_event in (sweep.snap_isclose_piece(*pair) for pair in pairs)
+	]
+	return pieces, _bound_row(events[0]), _bound_row(events[-1])
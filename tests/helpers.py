@@ -0,0 +1,19 @@
+"""Helpers shared by the tests. pytest puts this directory on sys.path, so test modules import it as `from helpers import ...`"""
+
+import random
+
+from nicks_intervals.Interval import Interval
+
+
+def random_interval(rng: random.Random, max_lower: int = 30, max_length: int = 8, divisor: int = 1, min_length: int = 0) -> Interval:
+	"""
+	An interval with random closedness whose bounds are multiples of 1 / divisor.
+	The lower value is at most max_lower / divisor and the length is between min_length / divisor and max_length / divisor; a length of 0 gives a degenerate interval.
+	"""
+	lower = rng.randint(0, max_lower)
+	upper = lower + rng.randint(min_length, max_length)
+	if divisor != 1:
+		lower, upper = lower / divisor, upper / divisor
+	if lower == upper:
+		return Interval.degenerate(lower)
+	return rng.choice([Interval.closed, Interval.open, Interval.closed_open, Interval.open_closed])(lower, upper)
@@ -0,0 +1,37 @@
+import gc
+
+from nicks_intervals.Bound import Bound, PART_OF_LEFT, PART_OF_RIGHT
+from nicks_intervals.Interval import Interval
+
+
+def test_interning_is_opt_in():
+	assert Interval.closed_open(0, 5).upper_bound is not Interval.closed_open(5, 10).lower_bound
+
+
+def test_interning_shares_bounds():
+	Bound.enable_interning()
+	try:
+		a = Interval.closed_open(0, 5)
+		b = Interval.closed_open(5, 10)
+		assert a.upper_bound is b.lower_bound
+		assert Bound.get(5, PART_OF_LEFT) is not a.upper_bound
+		assert a.lower_bound.translated(5) is b.lower_bound
+		assert Bound.get(5.0, PART_OF_RIGHT) is not a.upper_bound  # int and float values are kept distinct
+		assert a.upper_bound == b.lower_bound
+		assert not a.upper_bound < b.lower_bound
+	finally:
+		Bound.disable_interning()
+	assert Interval.closed_open(0, 5).upper_bound is not Interval.closed_open(5, 10).lower_bound
+
+
+def test_interning_cache_is_bounded_and_weak():
+	Bound.enable_interning(max_size=2)
+	try:
+		kept = [Bound.get(value, PART_OF_RIGHT) for value in range(3)]
+		assert Bound.get(0, PART_OF_RIGHT) is kept[0]
+		assert Bound.get(2, PART_OF_RIGHT) is not kept[2]
+		del kept
+		gc.collect()
+		assert Bound.get(5, PART_OF_RIGHT) is Bound.get(5, PART_OF_RIGHT)
+	finally:
+		Bound.disable_interning()
@@ -0,0 +1,28 @@
+import random
+
+from nicks_intervals.Interval import Interval
+import nicks_intervals._operators as ops
+
+from helpers import random_interval
+
+
+def test_sweep_predicates_same_as_nested_loops():
+	rng = random.Random(0)
+	for _ in range(2000):
+		a = [random_interval(rng) for _ in range(rng.randint(0, 5))]
+		b = [random_interval(rng) for _ in range(rng.randint(0, 5))]
+		intersects = any(ops.intersects_atomic(a_interval, b_interval) for a_interval in a for b_interval in b)
+		touches = not intersects and any(ops.touches_atomic(a_interval, b_interval) for a_interval in a for b_interval in b)
+		contains_interval = all(any(ops.contains_interval_atomic(a_interval, b_interval) for a_interval in a) for b_interval in b)
+		assert ops.intersects(a, b) == intersects
+		assert ops.touches(a, b) == touches
+		assert ops.contains_interval(a, b) == contains_interval
+
+
+def test_predicates():
+	assert Interval.closed(0, 10).intersects(Interval.closed(10, 20))
+	assert not Interval.closed_open(0, 10).intersects(Interval.closed(10, 20))
+	assert Interval.closed_open(0, 10).touches(Interval.closed(10, 20))
+	assert not Interval.closed(0, 10).touches(Interval.closed(10, 20))
+	assert Interval.closed(0, 10).contains_interval(Interval.open(0, 10))
+	assert not Interval.open(0, 10).contains_interval(Interval.closed_open(0, 10))
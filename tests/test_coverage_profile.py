@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+from nicks_intervals.Interval import Interval
+from nicks_intervals.Multi_Interval import Multi_Interval
+from nicks_intervals.Coverage_Profile import Coverage_Profile
+import nicks_intervals._operators as ops
+
+from helpers import random_interval
+
+
+def brute_force_depth(intervals, value: float) -> int:
+	return sum(1 for interval in intervals if ops.contains_value_atomic(interval, value))
+
+
+# every bound is an integer, so the integers and the half way points between them sample every segment
+SAMPLES = [step / 2 for step in range(-4, 2 * 42)]
+
+
+def test_same_as_brute_force():
+	rng = random.Random(0)
+	for _ in range(300):
+		intervals = [random_interval(rng) for _ in range(rng.randint(0, 10))]
+		profile = Coverage_Profile(intervals)
+		depths = {value: brute_force_depth(intervals, value) for value in SAMPLES}
+		for value in SAMPLES:
+			assert profile.depth_at(value) == depths[value], value
+		for _ in range(20):
+			lower, upper = sorted(rng.sample(SAMPLES, 2))
+			assert profile.max_depth_in(lower, upper) == max(depths[value] for value in SAMPLES if lower <= value <= upper)
+		for depth in range(1, 4):
+			result = profile.intervals_with_depth_at_least(depth)
+			for value in SAMPLES:
+				assert ops.contains_value(result, value) == (depths[value] >= depth), (depth, value)
+
+
+def test_profile():
+	profile = Coverage_Profile([Interval.closed_open(0, 10), Interval.closed_open(5, 15), Interval.closed_open(10, 20), Interval.degenerate(12)])
+	assert list(profile.depths) == [0, 1, 2, 3, 2, 1, 0]
+	assert profile.depth_at(10) == 2
+	assert profile.depth_at(12) == 3
+	assert profile.max_depth_in(0, 11) == 2
+	assert profile.max_depth_in(-5, -1) == 0
+	assert profile.intervals_with_depth_at_least(2) == Interval.closed_open(5, 15)
+	assert profile.intervals_with_depth_at_least(3) == Interval.degenerate(12)
+	assert profile.intervals_with_depth_at_least(4) == Multi_Interval([])
+
+
+def test_infinite_intervals():
+	profile = Coverage_Profile([Interval.inf_open(5), Interval.closed_inf(0)])
+	assert profile.depth_at(float('-inf')) == 1
+	assert profile.depth_at(2) == 2
+	assert profile.depth_at(float('inf')) == 1
+	assert profile.intervals_with_depth_at_least(1) == Interval.complete()
+	with pytest.raises(Exception):
+		profile.max_depth_in(1, 0)
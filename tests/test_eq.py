@@ -19,4 +19,18 @@ def test_eq_not():
 def test_eq_multi():
 	assert Multi_Interval([Interval.closed(0, 10), Interval.closed(0, 10)]) != Interval.closed(0, 10)
 	assert Interval.closed(0, 10) != Multi_Interval([Interval.closed(0, 10), Interval.closed(0, 10)])
-	assert Multi_Interval([Interval.closed(0, 10), Interval.closed(0, 10)]) == Multi_Interval([Interval.closed(0, 10), Interval.closed(0, 10)])
\ No newline at end of file
+	assert Multi_Interval([Interval.closed(0, 10), Interval.closed(0, 10)]) == Multi_Interval([Interval.closed(0, 10), Interval.closed(0, 10)])
+
+def test_eq_ignores_order():
+	a = [Interval.closed(index, index + 5) for index in range(1000)]
+	assert Multi_Interval(a) == Multi_Interval(reversed(a))
+	assert Multi_Interval(a) != Multi_Interval(a[:-1] + [Interval.closed_open(999, 1004)])
+	assert Multi_Interval(a + [a[0]]) != Multi_Interval(a + [a[1]])
+
+
+def test_eq_isclose():
+	# values which are math.isclose() must still be matched when their exact values sort differently
+	a = Multi_Interval([Interval.closed(1.0, 5), Interval.closed(1.0 + 1e-12, 3)])
+	b = Multi_Interval([Interval.closed(1.0 + 1e-12, 5), Interval.closed(1.0, 3)])
+	assert a == b
+	assert Multi_Interval([Interval.closed(0.1 + 0.2, 1), Interval.closed(2, 3)]) == Multi_Interval([Interval.closed(2, 3), Interval.closed(0.3, 1)])
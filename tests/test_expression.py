@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+from nicks_intervals.Interval import Interval
+from nicks_intervals.Multi_Interval import Multi_Interval
+from nicks_intervals import expression
+import nicks_intervals._sweep as sweep
+
+from helpers import random_interval
+
+
+def random_disjoint_intervals(rng: random.Random):
+	result = []
+	position = rng.randint(0, 3)
+	for _ in range(rng.randint(0, 6)):
+		length = rng.randint(1, 4)
+		result.append(rng.choice([Interval.closed_open, Interval.open_closed, Interval.open, Interval.closed])(position, position + length))
+		position += length + rng.randint(0, 2)
+	rng.shuffle(result)
+	return result
+
+
+def random_collection(rng: random.Random):
+	if rng.random() < 0.5:
+		return random_disjoint_intervals(rng)
+	return [random_interval(rng) for _ in range(rng.randint(0, 6))]
+
+
+def random_expression(rng: random.Random, depth: int) -> expression.Expression:
+	result = expression.lazy(random_collection(rng))
+	for _ in range(rng.randint(1, depth)):
+		step = rng.choice(["subtract", "intersect", "exterior", "merge_touching", "merge_intersecting", "merge_intersecting_or_touching"])
+		if step in ("subtract", "intersect"):
+			other = random_expression(rng, depth - 1) if depth > 1 and rng.random() < 0.3 else random_collection(rng)
+			result = getattr(result, step)(other)
+		elif step == "exterior":
+			result = result.exterior
+		else:
+			result = getattr(result, step)()
+	return result
+
+
+def test_fused_same_as_eager():
+	rng = random.Random(0)
+	for _ in range(1000):
+		lazy_expression = random_expression(rng, 3)
+		assert lazy_expression.evaluate() == lazy_expression._evaluate_eagerly(), lazy_expression
+
+
+def test_chain():
+	a = Multi_Interval([Interval.closed_open(0, 10), Interval.closed_open(10, 20), Interval.closed(30, 40)])
+	b = Interval.open(5, 12)
+	c = Interval.closed(0, 35)
+	result = a.lazy().subtract(b).intersect(c).merge_touching().evaluate()
+	assert result == Multi_Interval([Interval.closed(0, 5), Interval.closed_open(12, 20), Interval.closed(30, 35)])
+	assert result == a.subtract(b).intersect(c).merge_touching()
+
+
+def test_one_sort(monkeypatch):
+	calls = []
+	original_sort_events = sweep.sort_events
+	monkeypatch.setattr(sweep, "sort_events", lambda events: calls.append(len(events)) or original_sort_events(events))
+	a = [Interval.closed_open(index, index + 1) for index in range(0, 100, 2)]
+	expression.lazy(a).subtract(Interval.closed(10, 20)).intersect(Interval.closed(0, 50)).exterior.merge_touching().evaluate()
+	assert calls == [2 * (50 + 1 + 1)]
+
+
+def test_overlapping_merge_falls_back():
+	a = [Interval.closed(0, 10), Interval.closed(5, 15), Interval.closed_open(20, 25)]
+	lazy_expression = expression.lazy(a).merge_touching().subtract(Interval.closed(12, 13))
+	assert lazy_expression.evaluate() == lazy_expression._evaluate_eagerly()
+
+
+def test_incomplete_expression_cannot_be_created():
+	class Incomplete_Expression(expression.Expression):
+		def _leaves(self):
+			return []
+
+	with pytest.raises(TypeError):
+		Incomplete_Expression()
+	with pytest.raises(TypeError):
+		expression.Expression()
@@ -0,0 +1,53 @@
+import io
+
+from nicks_intervals.Interval import Interval
+from nicks_intervals.Multi_Interval import Multi_Interval
+from nicks_intervals import instrumentation
+import nicks_intervals._operators as ops
+
+
+def test_disabled_by_default():
+	assert instrumentation.is_enabled() is False
+	assert not hasattr(ops.subtract, "__wrapped__")
+
+
+def test_measure():
+	a = Multi_Interval([Interval.closed(0, 10), Interval.closed(20, 30)])
+	b = Multi_Interval([Interval.open(5, 25)])
+	with instrumentation.measure() as recorder:
+		a.subtract(b)
+		a.subtract(b)
+		a.contains_value(5)
+	assert not hasattr(ops.subtract, "__wrapped__")
+	
+	snapshot = recorder.snapshot()
+	subtract = snapshot["operators"]["subtract"]
+	assert subtract["calls"] == 2
+	assert subtract["input_size"] == 6
+	assert subtract["output_size"] == 4
+	# the first call sorts and caches the events of a (4) and b (2), then both calls sort the 6 combined events
+	assert subtract["sweep_events"] == 18
+	assert subtract["intervals_allocated"] == 4
+	assert subtract["seconds"] > 0
+	assert snapshot["operators"]["contains_value"]["calls"] == 1
+	
+	slowest = recorder.slowest_calls()
+	assert len(slowest) == 3
+	assert slowest[0]["seconds"] >= slowest[-1]["seconds"]
+	assert {call["input_shape"] for call in slowest if call["operator"] == "subtract"} == {(2, 1)}
+	output = io.StringIO()
+	recorder.dump_slowest_calls(file=output)
+	assert "subtract(2, 1)" in output.getvalue()
+
+
+def test_enable_disable():
+	recorder = instrumentation.enable()
+	try:
+		Interval.closed(0, 10).intersect(Interval.closed(5, 15))
+		assert instrumentation.snapshot()["operators"]["intersect"]["calls"] == 1
+		assert instrumentation.snapshot()["bounds_allocated"] >= 4
+	finally:
+		instrumentation.disable()
+	assert instrumentation.get_recorder() is None
+	Interval.closed(0, 10).intersect(Interval.closed(5, 15))
+	assert recorder.snapshot()["operators"]["intersect"]["calls"] == 1
@@ -0,0 +1,76 @@
+import math
+import random
+
+from nicks_intervals.Bound import Bound
+from nicks_intervals.Interval import Interval
+from nicks_intervals.Interval_Array import Interval_Array
+from nicks_intervals.Multi_Interval import Multi_Interval
+from nicks_intervals import expression, k_way
+import nicks_intervals._operators as ops
+import nicks_intervals._streaming as _streaming
+
+from helpers import random_interval
+
+
+def nudged_interval(rng: random.Random) -> Interval:
+	"""A random interval whose bounds may be moved by 1e-12, so they are math.isclose() to bounds of other intervals without being equal"""
+	interval = random_interval(rng, max_lower=5, max_length=3)
+	lower_value = interval.lower_bound.value + 1 + rng.choice([0, 1e-12, -1e-12])
+	upper_value = interval.upper_bound.value + 1 + rng.choice([0, 1e-12, -1e-12])
+	if math.isclose(lower_value, upper_value):
+		return Interval.degenerate(lower_value)
+	return Interval(Bound(lower_value, interval.lower_bound.part_of_left), Bound(upper_value, interval.upper_bound.part_of_left))
+
+
+def test_intersect():
+	a = Interval.closed(0, 10)
+	b = Interval.closed(5, 15)
+	assert a.intersect(b) == Interval.closed(5, 10)
+	assert b.intersect(a) == Interval.closed(5, 10)
+	assert a.intersect(a) == a
+
+	# touching but not intersecting
+	assert Interval.closed_open(0, 5).intersect(Interval.closed(5, 10)) == Interval.empty()
+
+	# sharing a single closed bound
+	assert Interval.closed(0, 5).intersect(Interval.closed(5, 10)) == Interval.degenerate(5)
+
+	# the structure of 'a' is preserved
+	assert Multi_Interval([Interval.closed(0, 10), Interval.closed(2, 8)]).intersect(Interval.open(4, 20)) == Multi_Interval([Interval.open_closed(4, 10), Interval.open_closed(4, 8)])
+
+	# gaps in 'b' split the sub-intervals of 'a'
+	assert a.intersect(Multi_Interval([Interval.closed_open(0, 2), Interval.open_closed(8, 10)])) == Multi_Interval([Interval.closed_open(0, 2), Interval.open_closed(8, 10)])
+
+	# changed by the line-sweep: a ∩ ∅ used to return 'a', because intersect was subtract(a, exterior(∅)) and the exterior of an empty collection is empty
+	assert a.intersect(Interval.empty()) == Interval.empty()
+	assert Interval.empty().intersect(a) == Interval.empty()
+
+
+def test_intersect_same_as_subtract_exterior():
+	rng = random.Random(0)
+	for _ in range(300):
+		a = [random_interval(rng) for _ in range(rng.randint(0, 6))]
+		b = [random_interval(rng) for _ in range(rng.randint(1, 6))]
+		assert Multi_Interval(ops.intersect(a, b)) == Multi_Interval(ops.subtract(a, ops.exterior(b)))
+
+
+def test_intersect_isclose_bounds_of_different_operands():
+	# closed bounds which are math.isclose() but not equal enclose a single value; the piece is degenerate at the value from 'a'
+	a = Interval.degenerate(11.0)
+	b = Interval.degenerate(11.000000000001)
+	assert a.intersect(b) == Interval.degenerate(11.0)
+	assert list(_streaming.intersect([a], [b])) == [Interval.degenerate(11.0)]
+	assert Interval_Array.from_intervals([a]).intersect([b]).to_multi_interval() == Interval.degenerate(11.0)
+	assert k_way.intersect([[a], [b]]) == Interval.degenerate(11.0)
+	assert expression.lazy([a]).intersect([b]).evaluate() == Interval.degenerate(11.0)
+	assert Multi_Interval(ops.subtract([Interval.closed_open(1.999999999999, 3)], [Interval.open(2.0, 5)])) == Interval.degenerate(1.999999999999)
+
+	rng = random.Random(0)
+	for _ in range(1000):
+		a = [nudged_interval(rng) for _ in range(3)]
+		b = [nudged_interval(rng) for _ in range(3)]
+		expected = Multi_Interval(ops.intersect(a, b))
+		assert Interval_Array.from_intervals(a).intersect(b) == expected
+		assert Interval_Array.from_intervals(a).subtract(b) == Multi_Interval(ops.subtract(a, b))
+		assert Multi_Interval(list(_streaming.intersect(sorted(a, key=lambda interval: interval.lower_bound), sorted(b, key=lambda interval: interval.lower_bound)))) == expected
+		assert expression.lazy(a).intersect(b).evaluate() == expression.lazy(a).intersect(b)._evaluate_eagerly()
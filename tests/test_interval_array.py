@@ -0,0 +1,90 @@
+import random
+
+import pytest
+
+from nicks_intervals.Interval import Interval
+from nicks_intervals.Interval_Array import Interval_Array
+from nicks_intervals.Multi_Interval import Multi_Interval
+import nicks_intervals._operators as ops
+import nicks_intervals._sweep as sweep
+import nicks_intervals.Interval_Array as interval_array_module
+
+from helpers import random_interval
+
+
+def test_interval_array_init():
+	a = Interval_Array([0, 5], [5, 10], [True, False], [False, True])
+	assert len(a) == 2
+	assert a == Multi_Interval([Interval.closed_open(0, 5), Interval.open_closed(5, 10)])
+	assert Interval_Array.from_intervals(a.to_multi_interval()) == a
+
+	with pytest.raises(Exception):
+		Interval_Array([0], [5, 10], [True], [True])
+	with pytest.raises(Exception):
+		Interval_Array([10], [5], [True], [True])
+	with pytest.raises(Exception):
+		Interval_Array([5], [5], [True], [False])
+	with pytest.raises(Exception):
+		Interval_Array([float('-inf')], [5], [False], [True])
+
+
+def test_interval_array_contains_value():
+	a = Interval_Array.from_intervals([Interval.closed_open(0, 5), Interval.open(5, 10)])
+	assert a.contains_value(0) is True
+	assert a.contains_value(5) is False
+	assert a.contains_value(7) is True
+	assert a.contains_value(10) is False
+
+
+def test_interval_array_merge_touching():
+	a = Interval_Array.from_intervals([Interval.open_closed(5, 10), Interval.closed_open(0, 5), Interval.degenerate(5), Interval.closed(20, 30)])
+	assert a.merge_touching() == Multi_Interval([Interval.closed(0, 10), Interval.closed(20, 30)])
+	assert Interval_Array.from_intervals([Interval.closed(0, 5), Interval.closed(5, 10)]).merge_touching() == Multi_Interval([Interval.closed(0, 5), Interval.closed(5, 10)])
+	# overlapping sub-intervals still join the components of the intervals they touch
+	overlapping = Interval_Array.from_intervals([Interval.closed_open(0, 1), Interval.closed(0.5, 0.7), Interval.closed(1, 2)])
+	assert overlapping.merge_touching() == Multi_Interval([Interval.closed(0, 2), Interval.closed(0.5, 0.7)])
+	overlapping = Interval_Array.from_intervals([Interval.closed_open(0, 2), Interval.closed(2, 3), Interval.closed(2, 4)])
+	assert overlapping.merge_touching() == Interval.closed(0, 4)
+
+
+def test_interval_array_same_as_operators():
+	rng = random.Random(0)
+	for _ in range(300):
+		a = [random_interval(rng) for _ in range(rng.randint(0, 6))]
+		b = [random_interval(rng) for _ in range(rng.randint(0, 6))]
+		a_array = Interval_Array.from_intervals(a)
+		assert a_array.subtract(b) == Multi_Interval(ops.subtract(a, b))
+		assert a_array.intersect(b) == Multi_Interval(ops.intersect(a, b))
+		assert a_array.interior == Multi_Interval(ops.interior(a))
+		assert a_array.merge_touching() == Multi_Interval(ops.union_merge_touching([], a))
+		if a:
+			assert a_array.exterior == Multi_Interval(ops.exterior(a))
+		value = rng.randint(0, 40) / 2
+		assert a_array.contains_value(value) == ops.contains_value(a, value)
+
+
+def test_interval_array_contains_value_sorted_and_disjoint():
+	rng = random.Random(1)
+	for _ in range(200):
+		intervals = []
+		position = rng.randint(0, 3)
+		for _ in range(rng.randint(0, 8)):
+			length = rng.randint(0, 3)
+			intervals.append(Interval.degenerate(position) if length == 0 else rng.choice([Interval.closed_open, Interval.open_closed, Interval.open, Interval.closed])(position, position + length))
+			position += length + rng.randint(1, 2)
+		a_array = Interval_Array.from_intervals(intervals)
+		assert a_array.is_sorted_and_disjoint == Multi_Interval(intervals).is_sorted_and_disjoint
+		for step in range(-2, 2 * position + 2):
+			assert a_array.contains_value(step / 2) == ops.contains_value(intervals, step / 2)
+	assert Interval_Array.from_intervals([Interval.closed(0, 5), Interval.closed(5, 10)]).is_sorted_and_disjoint is False
+	assert Interval_Array.from_intervals([Interval.closed_open(0, 5), Interval.closed(5, 10)]).is_sorted_and_disjoint is True
+
+
+def test_interval_array_rejects_invalid_sweep_output():
+	lower_event = (5.0, sweep.LOWER_PART_OF_LEFT, 0, 0)
+	upper_event = (5.0, sweep.UPPER_PART_OF_RIGHT, 1, 0)
+	with pytest.raises(Exception):
+		interval_array_module._from_event_pairs([(lower_event, upper_event)])
+	# closed ends which are math.isclose() are snapped to one value rather than rejected
+	snapped = interval_array_module._from_event_pairs([((5.0, sweep.LOWER_PART_OF_RIGHT, 0, 0), (5.000000000001, sweep.UPPER_PART_OF_LEFT, 1, 0))])
+	assert snapped.to_multi_interval() == Interval.degenerate(5)
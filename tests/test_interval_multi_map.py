@@ -0,0 +1,189 @@
+import itertools
+import random
+
+import pytest
+
+from nicks_intervals.Interval import Interval
+from nicks_intervals.Interval_Map import Interval_Map
+from nicks_intervals.Interval_Multi_Map import Interval_Multi_Map
+from nicks_intervals.Interval_Multi_Map_Builder import Interval_Multi_Map_Builder
+import nicks_intervals._operators as ops
+
+from helpers import random_interval
+
+
+def random_link(rng: random.Random):
+	from_lower = rng.randint(0, 50)
+	to_lower = rng.randint(0, 100)
+	return (
+		Interval.closed_open(from_lower, from_lower + rng.randint(1, 10)),
+		rng.choice([Interval.closed_open, Interval.closed])(to_lower, to_lower + rng.randint(1, 20))
+	)
+
+
+def test_map_value():
+	road_to_true = Interval_Multi_Map([
+		(Interval.closed_open(0, 10), Interval.closed_open(100, 120)),
+		(Interval.closed_open(10, 20), Interval.closed_open(120, 125)),
+	])
+	assert road_to_true.map_value(5) == [110]
+	assert road_to_true.map_value(10) == [120]
+	assert road_to_true.map_value(20) == []
+	road_to_true.compile()
+	assert road_to_true.is_compiled is True
+	assert road_to_true.map_value(5) == [110]
+	assert road_to_true.map_value(10) == [120]
+	assert road_to_true.map_value(20) == []
+	assert road_to_true.map_values([5, 10, 15, 20]) == [[110], [120], [122.5], []]
+
+
+def test_compiled_map_value_same_as_uncompiled():
+	rng = random.Random(0)
+	for _ in range(100):
+		links = [random_link(rng) for _ in range(rng.randint(0, 15))]
+		uncompiled = Interval_Multi_Map(links)
+		compiled = Interval_Multi_Map(links).compile()
+		values = [rng.randint(-4, 130) / 2 for _ in range(20)]
+		expected = [uncompiled.map_value(value) for value in values]
+		assert compiled.map_values(values) == expected
+		assert [compiled.map_value(value) for value in values] == expected
+
+
+def test_compiled_map_value_long_early_link():
+	# the first link reaches past every later link, so no query can stop early at it
+	links = [(Interval.closed(0, 1000), Interval.closed(0, 1000))]
+	links.extend((Interval.closed_open(index, index + 1), Interval.closed_open(2000 + index, 2001 + index)) for index in range(1, 500))
+	uncompiled = Interval_Multi_Map(links)
+	compiled = Interval_Multi_Map(links).compile()
+	values = [750.5, 0, 1000, 250.25, 1000.5, -1, 250.25, 499.5]
+	expected = [uncompiled.map_value(value) for value in values]
+	assert expected[0] == [750.5]
+	assert expected[3] == [250.25, 2250.25]
+	assert compiled.map_values(values) == expected
+	assert [compiled.map_value(value) for value in values] == expected
+
+
+def test_compiled_map_value_degenerate_from_interval():
+	links = [
+		(Interval.degenerate(5), Interval.closed(100, 110)),
+		(Interval.closed_open(0, 10), Interval.closed_open(200, 210)),
+	]
+	uncompiled = Interval_Multi_Map(links)
+	compiled = Interval_Multi_Map(links).compile()
+	# a value outside the degenerate from-interval never reaches its scale factor
+	assert compiled.map_value(2) == uncompiled.map_value(2) == [202]
+	for interval_multi_map in (uncompiled, compiled):
+		with pytest.raises(ZeroDivisionError):
+			interval_multi_map.map_value(5)
+
+
+def test_merge_on_predicates():
+	links = [
+		(Interval.closed_open(10, 20), Interval.closed_open(110, 120)),
+		(Interval.closed_open(0, 10), Interval.closed_open(100, 110)),
+		(Interval.closed_open(20, 30), Interval.closed_open(200, 210)),
+		(Interval.closed_open(30, 40), Interval.closed_open(210, 220)),
+	]
+	for from_predicate in (Interval_Multi_Map.predicate_touching, lambda a, b: Interval_Multi_Map.predicate_touching(a, b)):
+		merged = Interval_Multi_Map(links).merge_on_predicates(from_predicate, Interval_Multi_Map.predicate_touching)
+		assert [tuple(link) for link in sorted(merged.links, key=lambda link: link[0].lower_bound.value)] == [
+			(Interval.closed_open(0, 20), Interval.closed_open(100, 120)),
+			(Interval.closed_open(20, 40), Interval.closed_open(200, 220)),
+		]
+	
+	overlapping = Interval_Multi_Map([
+		(Interval.closed(0, 10), Interval.closed(0, 10)),
+		(Interval.closed(5, 15), Interval.closed(5, 15)),
+		(Interval.closed(15, 20), Interval.closed(30, 35)),
+	]).merge_on_predicates(Interval_Multi_Map.predicate_intersecting, Interval_Multi_Map.predicate_intersecting)
+	assert [tuple(link) for link in sorted(overlapping.links, key=lambda link: link[0].lower_bound.value)] == [
+		(Interval.closed(0, 15), Interval.closed(0, 15)),
+		(Interval.closed(15, 20), Interval.closed(30, 35)),
+	]
+
+
+def test_merge_on_predicates_sweep_reaches_fixpoint():
+	rng = random.Random(0)
+	predicates = (Interval_Multi_Map.predicate_touching, Interval_Multi_Map.predicate_intersecting, Interval_Multi_Map.predicate_touching_or_intersecting)
+	for _ in range(100):
+		links = [random_link(rng) for _ in range(rng.randint(0, 15))]
+		for from_predicate in predicates:
+			for to_predicate in predicates:
+				merged = Interval_Multi_Map(links).merge_on_predicates(from_predicate, to_predicate)
+				assert not any(
+					from_predicate(a[0], b[0]) and to_predicate(a[1], b[1])
+					for a, b in itertools.combinations(merged.links, 2)
+				)
+				assert all(any(merged_link.contains(Interval_Map(*link)) for merged_link in merged.links) for link in links)
+
+
+def test_merge_on_predicates_sweep_same_with_and_without_to_index():
+	# a lambda to_predicate can't use the index of open runs, so every open run is checked in the order the runs were started
+	rng = random.Random(2)
+	predicates = (Interval_Multi_Map.predicate_touching, Interval_Multi_Map.predicate_intersecting, Interval_Multi_Map.predicate_touching_or_intersecting)
+	for _ in range(100):
+		links = [random_link(rng) for _ in range(rng.randint(0, 30))]
+		for from_predicate in predicates:
+			for to_predicate in predicates:
+				indexed = Interval_Multi_Map(links).merge_on_predicates(from_predicate, to_predicate)
+				scanned = Interval_Multi_Map(links).merge_on_predicates(from_predicate, lambda a, b: to_predicate(a, b))
+				assert list(map(repr, indexed.links)) == list(map(repr, scanned.links))
+
+
+def test_builder_same_as_add_merge_if_contained_or_touching():
+	rng = random.Random(0)
+	for _ in range(50):
+		links = []
+		from_position = 0
+		to_position = 0
+		for _ in range(rng.randint(0, 20)):
+			from_length = rng.randint(1, 5)
+			to_length = rng.randint(1, 5)
+			if rng.random() < 0.2:
+				from_position += 1
+			links.append(Interval_Map.closed_open(from_position, from_position + from_length, to_position, to_position + to_length))
+			from_position += from_length
+			to_position += to_length
+		# re-add a few links which are contained by, or contain existing links
+		links.extend(Interval_Map(link.from_interval, link.to_interval) for link in rng.sample(links, len(links) // 4))
+		rng.shuffle(links)
+
+		expected = Interval_Multi_Map([])
+		builder = Interval_Multi_Map_Builder()
+		for link in links:
+			expected = expected.add_merge_if_contained_or_touching(link)
+			builder.add(link)
+		assert len(builder) == len(expected.links)
+		assert sorted(map(repr, builder.freeze().links)) == sorted(map(repr, expected.links))
+
+
+def test_builder_same_as_add_merge_if_contained_or_touching_overlapping_links():
+	# the first link to satisfy any check, in the order links were added, decides what happens
+	links = [Interval_Map.closed_open(2, 4, 2, 4), Interval_Map.closed_open(1, 3, 1, 3), Interval_Map.closed_open(1, 2, 1, 2)]
+	expected = Interval_Multi_Map([])
+	builder = Interval_Multi_Map_Builder()
+	for link in links:
+		expected = expected.add_merge_if_contained_or_touching(link)
+		builder.add(link)
+	assert list(map(repr, expected.links)) == [repr(Interval_Map.closed_open(1, 4, 1, 4))]
+	assert list(map(repr, builder.freeze().links)) == list(map(repr, expected.links))
+
+	rng = random.Random(1)
+	for _ in range(3000):
+		expected = Interval_Multi_Map([])
+		builder = Interval_Multi_Map_Builder()
+		for _ in range(rng.randint(0, 8)):
+			from_lower = rng.randint(0, 6)
+			to_lower = rng.randint(0, 6)
+			link = Interval_Map.closed_open(from_lower, from_lower + rng.randint(1, 3), to_lower, to_lower + rng.randint(1, 3))
+			expected = expected.add_merge_if_contained_or_touching(link)
+			builder.add(link)
+		assert list(map(repr, builder.freeze().links)) == list(map(repr, expected.links))
+
+
+def test_sweep_join_map_intervals_same_as_atomics():
+	rng = random.Random(0)
+	for _ in range(300):
+		links = [(random_interval(rng), random_interval(rng, max_lower=100, max_length=20, min_length=1)) for _ in range(rng.randint(0, 12))]
+		intervals = [random_interval(rng, max_lower=35, max_length=10) for _ in range(rng.randint(0, 8))]
+		assert ops.apply_interval_maps_to_intervals(links, intervals) == ops.apply_interval_maps_to_intervals_based_on_atomics(links, intervals)
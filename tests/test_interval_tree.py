@@ -0,0 +1,43 @@
+import random
+
+from nicks_intervals.Interval import Interval
+from nicks_intervals.Multi_Interval import Multi_Interval
+import nicks_intervals._operators as ops
+
+from helpers import random_interval
+
+
+def test_interval_tree_is_lazy():
+	a = Multi_Interval([Interval.closed(0, 10), Interval.closed(5, 15)])
+	assert a.has_interval_tree is False
+	assert len(a.interval_tree) == 2
+	assert a.has_interval_tree is True
+
+
+def test_interval_tree_queries_same_as_linear_scan():
+	rng = random.Random(0)
+	for _ in range(200):
+		intervals = [random_interval(rng) for _ in range(rng.randint(0, 30))]
+		tree = Multi_Interval(intervals).interval_tree
+		for _ in range(10):
+			query = random_interval(rng)
+			value = rng.randint(0, 80) / 2
+			assert sorted(map(id, tree.sub_intervals_intersecting(query))) == sorted(id(item) for item in intervals if ops.intersects_atomic(item, query))
+			assert sorted(map(id, tree.sub_intervals_touching(query))) == sorted(id(item) for item in intervals if ops.touches_atomic(item, query))
+			assert sorted(map(id, tree.sub_intervals_containing_interval(query))) == sorted(id(item) for item in intervals if ops.contains_interval_atomic(item, query))
+			assert sorted(map(id, tree.sub_intervals_containing_value(value))) == sorted(id(item) for item in intervals if ops.contains_value_atomic(item, value))
+			assert sorted(tree.indices_containing_value(value)) == [index for index, item in enumerate(intervals) if ops.contains_value_atomic(item, value)]
+
+
+def test_collection_predicates_use_interval_tree():
+	rng = random.Random(1)
+	for _ in range(200):
+		a_intervals = [random_interval(rng) for _ in range(rng.randint(0, 10))]
+		b_intervals = [random_interval(rng) for _ in range(rng.randint(0, 10))]
+		expected = (ops.intersects(a_intervals, b_intervals), ops.touches(a_intervals, b_intervals), ops.contains_interval(a_intervals, b_intervals))
+		a = Multi_Interval(a_intervals)
+		a.interval_tree
+		assert (ops.intersects(a, b_intervals), ops.touches(a, b_intervals), ops.contains_interval(a, b_intervals)) == expected
+		b = Multi_Interval(b_intervals)
+		b.interval_tree
+		assert (ops.intersects(a_intervals, b), ops.touches(a_intervals, b)) == expected[:2]
@@ -0,0 +1,56 @@
+import random
+
+import pytest
+
+from nicks_intervals.Interval import Interval
+from nicks_intervals.Multi_Interval import Multi_Interval
+from nicks_intervals import k_way
+import nicks_intervals._operators as ops
+
+from helpers import random_interval
+
+
+def random_layers(rng: random.Random):
+	return [Multi_Interval(random_interval(rng) for _ in range(rng.randint(0, 5))) for _ in range(rng.randint(1, 6))]
+
+
+def covering_count(layers, value: float) -> int:
+	return sum(1 for layer in layers if ops.contains_value(layer, value))
+
+
+def assert_region(result, layers, is_covered):
+	# every bound is an integer, so sampling the integers and the half way points checks every segment
+	for step in range(-2, 2 * 40):
+		value = step / 2
+		assert ops.contains_value(result, value) == is_covered(covering_count(layers, value)), value
+	# the result is a set of maximal runs
+	assert Multi_Interval(result) == Multi_Interval(result).merge_intersecting_or_touching()
+
+
+def test_k_way_same_as_point_sampling():
+	rng = random.Random(0)
+	for _ in range(300):
+		layers = random_layers(rng)
+		assert_region(k_way.union(layers), layers, lambda count: count > 0)
+		assert_region(k_way.intersect(layers), layers, lambda count: count == len(layers))
+		assert_region(k_way.at_least(layers, 2), layers, lambda count: count >= 2)
+		assert_region(k_way.symmetric_difference(layers), layers, lambda count: count % 2 == 1)
+
+
+def test_k_way_unsorted_operands():
+	layers = [
+		[Interval.closed(10, 20), Interval.closed(0, 5)],
+		(Interval.open(3, 12),),
+		Interval.closed_open(4, 11),
+	]
+	assert k_way.union(layers) == Interval.closed(0, 20)
+	assert k_way.intersect(layers) == Multi_Interval([Interval.closed(4, 5), Interval.closed_open(10, 11)])
+	assert k_way.at_least(layers, 2) == Interval.open(3, 12)
+
+
+def test_k_way_invalid_arguments():
+	with pytest.raises(Exception):
+		k_way.intersect([])
+	with pytest.raises(Exception):
+		k_way.at_least([Interval.closed(0, 1)], 0)
+	assert k_way.union([]) == Multi_Interval([])
@@ -0,0 +1,53 @@
+import threading
+
+from nicks_intervals.Interval import Interval
+from nicks_intervals.Multi_Interval import Multi_Interval
+import nicks_intervals._operators as ops
+import nicks_intervals._sweep as sweep
+
+
+def test_cached_values():
+	a = Multi_Interval([Interval.closed(20, 30), Interval.closed_open(0, 10), Interval.open(5, 15)])
+	assert a.lower_bound == Interval.closed(0, 1).lower_bound
+	assert a.upper_bound == Interval.closed(0, 30).upper_bound
+	assert a.hull() == Interval.closed(0, 30)
+	assert a.hull() is a.hull()
+	assert a.exterior == Multi_Interval([Interval.inf_open(0), Interval.closed_open(15, 20), Interval.open_inf(30)])
+	assert a.exterior is a.exterior
+	assert a.interior_merged() == Multi_Interval([Interval.closed_open(0, 15), Interval.closed(20, 30)])
+	assert a.interior_merged() is a.interior_merged()
+	assert a.hull(Interval.closed(40, 50)) == Interval.closed(0, 50)
+	assert Multi_Interval([]).lower_bound is None
+
+
+def test_sweeps_reuse_sorted_events(monkeypatch):
+	a = Multi_Interval([Interval.closed(index, index + 0.5) for index in range(100, 0, -1)])
+	b = Multi_Interval([Interval.closed(index + 0.25, index + 0.75) for index in range(100)])
+	expected = ops.subtract(list(a), list(b))
+	a.exterior
+	b.exterior
+	sorted_lengths = []
+	original_sort_events = sweep.sort_events
+	monkeypatch.setattr(sweep, "sort_events", lambda events: sorted_lengths.append(len(events)) or original_sort_events(events))
+	assert a.interior_merged() == a
+	assert ops.subtract(a, b) == expected
+	# only the combined events are sorted; each operand's events come from its cache
+	assert sorted_lengths == [400]
+
+
+def test_threads_share_one_cached_value():
+	a = Multi_Interval([Interval.closed(index, index + 2) for index in range(0, 2000, 3)])
+	barrier = threading.Barrier(8)
+	results = []
+
+	def worker():
+		barrier.wait()
+		results.append(a.exterior)
+
+	threads = [threading.Thread(target=worker) for _ in range(8)]
+	for thread in threads:
+		thread.start()
+	for thread in threads:
+		thread.join()
+	assert all(result is results[0] for result in results)
+	assert results[0] is a.exterior
@@ -0,0 +1,26 @@
+import pytest
+
+from nicks_intervals.Interval import Interval
+from nicks_intervals.Multi_Interval import Multi_Interval
+
+
+def test_from_arrays():
+	a = Multi_Interval.from_arrays([0, 5, float('-inf')], [5, 10, 0], [True, False, True], [False, True, False])
+	assert a == Multi_Interval([Interval.closed_open(0, 5), Interval.open_closed(5, 10), Interval.inf_open(0)])
+	assert [(interval.lower_bound.part_of_left, interval.upper_bound.part_of_left) for interval in a] == [(False, False), (True, True), (False, False)]
+	assert Multi_Interval.from_arrays([], [], [], []) == Interval.empty()
+
+
+def test_from_arrays_reports_every_invalid_row():
+	with pytest.raises(Exception) as error:
+		Multi_Interval.from_arrays([0, 10, 1, 5], [5, 5, 2, 5], [True, True, True, True], [True, True, True, False])
+	message = str(error.value)
+	assert "2 invalid rows" in message
+	assert "row 1:" in message
+	assert "row 3:" in message
+	assert "row 0:" not in message
+	
+	with pytest.raises(Exception):
+		Multi_Interval.from_arrays([0], [5, 10], [True], [True])
+	with pytest.raises(TypeError):
+		Multi_Interval.from_arrays(["a"], [5], [True], [True])
@@ -0,0 +1,47 @@
+import random
+
+from nicks_intervals.Interval import Interval
+from nicks_intervals.Multi_Interval import Multi_Interval
+import nicks_intervals._operators as ops
+
+
+def test_is_sorted_and_disjoint():
+	assert Multi_Interval([]).is_sorted_and_disjoint is True
+	assert Multi_Interval([Interval.closed(0, 5)]).is_sorted_and_disjoint is True
+	assert Multi_Interval([Interval.closed_open(0, 5), Interval.degenerate(5), Interval.open_closed(5, 10)]).is_sorted_and_disjoint is True
+	assert Multi_Interval([Interval.closed(0, 5), Interval.closed(5, 10)]).is_sorted_and_disjoint is False
+	assert Multi_Interval([Interval.closed(5, 10), Interval.closed(0, 4)]).is_sorted_and_disjoint is False
+
+
+def test_sub_interval_containing_value():
+	a = Multi_Interval([Interval.closed_open(0, 5), Interval.degenerate(5), Interval.open_closed(5, 10), Interval.open(20, 30)])
+	assert a.sub_interval_containing_value(-1) is None
+	assert a.sub_interval_containing_value(0) == Interval.closed_open(0, 5)
+	assert a.sub_interval_containing_value(5) == Interval.degenerate(5)
+	assert a.sub_interval_containing_value(5.5) == Interval.open_closed(5, 10)
+	assert a.sub_interval_containing_value(20) is None
+	assert a.sub_interval_containing_value(25) == Interval.open(20, 30)
+
+
+def test_sorted_point_queries_same_as_linear_scan():
+	rng = random.Random(0)
+	for _ in range(100):
+		intervals = []
+		position = 0
+		for _ in range(rng.randint(0, 20)):
+			gap = rng.randint(0, 3)
+			length = rng.randint(0, 4)
+			if length == 0:
+				# a degenerate interval may not share the closed upper bound of the previous interval
+				position += max(gap, 1)
+				intervals.append(Interval.degenerate(position))
+			else:
+				position += gap
+				intervals.append(rng.choice([Interval.open, Interval.open_closed])(position, position + length))
+			position += length
+		a = Multi_Interval(intervals)
+		assert a.is_sorted_and_disjoint is True
+		for _ in range(20):
+			value = rng.randint(-4, 2 * position + 4) / 2
+			assert a.contains_value(value) == any(ops.contains_value_atomic(interval, value) for interval in intervals)
+			assert ops.nearest_contained_value(a, value) == ops.nearest_contained_value(intervals, value)
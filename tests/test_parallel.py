@@ -0,0 +1,67 @@
+import concurrent.futures
+import random
+
+from nicks_intervals.Interval import Interval
+from nicks_intervals.Multi_Interval import Multi_Interval
+import nicks_intervals._operators as ops
+import nicks_intervals.parallel as parallel
+
+from helpers import random_interval
+
+
+def random_intervals(rng: random.Random, count: int):
+	return [random_interval(rng, max_lower=count * 4, max_length=6) for _ in range(count)]
+
+
+def test_parallel_same_as_serial():
+	rng = random.Random(0)
+	with concurrent.futures.ProcessPoolExecutor(max_workers=2) as executor:
+		for _ in range(10):
+			a = random_intervals(rng, rng.randint(0, 300))
+			b = random_intervals(rng, rng.randint(0, 300))
+			if rng.random() < 0.3:
+				a.append(rng.choice([Interval.inf_open(5), Interval.closed_inf(900)]))
+			options = dict(processes=2, executor=executor, min_slab_size=20)
+			assert Multi_Interval(parallel.subtract(a, b, **options)) == Multi_Interval(ops.subtract(a, b))
+			assert Multi_Interval(parallel.intersect(a, b, **options)) == Multi_Interval(ops.intersect(a, b))
+			assert parallel.exterior(a, **options) == ops.exterior(a)
+
+
+def test_parallel_splits_into_slabs():
+	a = [Interval.closed_open(position, position + 1) for position in range(0, 200, 2)]
+	slabs = parallel._get_slabs((a,), processes=2, min_slab_size=10)
+	assert len(slabs) > 2
+	# intervals crossing a split value are clipped there
+	network = [Interval.closed_open(position, position + 1) for position in range(200)] + [Interval.closed(50, 150)]
+	slabs = parallel._get_slabs((network,), processes=2, min_slab_size=10)
+	assert len(slabs) > 2
+	for rows, left_split_value, right_split_value in slabs:
+		for lower_value, _, upper_value, _, _, _ in rows:
+			assert left_split_value is None or lower_value >= left_split_value
+			assert right_split_value is None or upper_value <= right_split_value
+
+
+def test_parallel_contiguous_network_same_as_serial():
+	rng = random.Random(1)
+	with concurrent.futures.ProcessPoolExecutor(max_workers=2) as executor:
+		options = dict(processes=2, executor=executor, min_slab_size=20)
+		for _ in range(5):
+			network = []
+			position = 0
+			for _ in range(300):
+				length = rng.randint(1, 5)
+				network.append(Interval.closed_open(position, position + length))
+				position += length
+			network.extend(Interval.closed(lower, lower + rng.randint(0, 100)) for lower in rng.sample(range(position), 10))
+			other = random_intervals(rng, 100)
+			assert len(parallel._get_slabs((network, other), processes=2, min_slab_size=20)) > 2
+			assert Multi_Interval(parallel.subtract(network, other, **options)) == Multi_Interval(ops.subtract(network, other))
+			assert Multi_Interval(parallel.intersect(network, other, **options)) == Multi_Interval(ops.intersect(network, other))
+			assert Multi_Interval(parallel.subtract(other, network, **options)) == Multi_Interval(ops.subtract(other, network))
+			assert parallel.exterior(network, **options) == ops.exterior(network)
+			assert parallel.exterior(network + other, **options) == ops.exterior(network + other)
+
+
+def test_parallel_small_input_is_serial():
+	a = [Interval.closed(0, 10)]
+	assert parallel.subtract(a, [Interval.open(2, 3)], processes=4) == ops.subtract(a, [Interval.open(2, 3)])
@@ -0,0 +1,66 @@
+import mmap
+import random
+
+import pytest
+
+from nicks_intervals.Interval import Interval
+from nicks_intervals.Interval_Array import Interval_Array
+from nicks_intervals.Interval_Multi_Map import Interval_Multi_Map
+from nicks_intervals.Multi_Interval import Multi_Interval
+from nicks_intervals import serialization
+
+from helpers import random_interval
+
+
+def closedness(intervals):
+	return [(interval.lower_bound.part_of_left, interval.upper_bound.part_of_left) for interval in intervals]
+
+
+def test_round_trip_collection(tmp_path):
+	rng = random.Random(0)
+	for count in (0, 1, 7, 8, 9, 100):
+		intervals = [random_interval(rng, max_lower=100, max_length=20, divisor=4) for _ in range(count)] + [Interval.inf_open(-5), Interval.closed_inf(300)]
+		path = str(tmp_path / f"collection_{count}.nivl")
+		serialization.dump(Multi_Interval(intervals), path)
+		for use_mmap in (True, False):
+			loaded = serialization.load(path, use_mmap=use_mmap, validate=True)
+			assert isinstance(loaded, Interval_Array)
+			assert list(loaded) == intervals
+			assert closedness(loaded) == closedness(intervals)
+		assert serialization.loads(serialization.dumps(intervals)).to_multi_interval() == Multi_Interval(intervals)
+
+
+def test_size_is_compact():
+	intervals = [Interval.closed_open(index, index + 1) for index in range(800)]
+	assert len(serialization.dumps(intervals)) == 16 + 800 * 16 + 2 * 100
+
+
+def test_mmap_columns_are_not_copied(tmp_path):
+	path = str(tmp_path / "lazy.nivl")
+	serialization.dump([Interval.closed(0, 1), Interval.open(2, 3)], path)
+	loaded = serialization.load(path)
+	assert isinstance(loaded.lower_values.obj, mmap.mmap)
+	assert loaded.subtract([Interval.closed(0.5, 2.5)]) == Multi_Interval([Interval.closed_open(0, 0.5), Interval.open(2.5, 3)])
+
+
+def test_round_trip_multi_map(tmp_path):
+	rng = random.Random(1)
+	links = [(random_interval(rng, max_lower=100, max_length=20, divisor=4), random_interval(rng, max_lower=100, max_length=20, divisor=4)) for _ in range(50)]
+	path = str(tmp_path / "multi_map.nivl")
+	serialization.dump(Interval_Multi_Map(links), path)
+	loaded = serialization.load(path)
+	assert isinstance(loaded, Interval_Multi_Map)
+	assert [tuple(link) for link in loaded.links] == links
+	assert closedness(link[1] for link in loaded.links) == closedness(link[1] for link in links)
+
+
+def test_bad_files_are_rejected():
+	data = serialization.dumps([Interval.closed(0, 1)])
+	with pytest.raises(Exception, match="bad magic"):
+		serialization.loads(b"XXXX" + data[4:])
+	with pytest.raises(Exception, match="should be"):
+		serialization.loads(data[:-1])
+	reversed_row = bytearray(data)
+	reversed_row[16:24], reversed_row[24:32] = data[24:32], data[16:24]
+	with pytest.raises(Exception, match="invalid rows"):
+		serialization.loads(bytes(reversed_row), validate=True)
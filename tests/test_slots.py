@@ -0,0 +1,21 @@
+import weakref
+
+from nicks_intervals.Bound import Bound, PART_OF_RIGHT
+from nicks_intervals.Interval import Interval
+
+
+def test_no_instance_dict():
+	interval = Interval.closed(0, 10)
+	assert not hasattr(interval, "__dict__")
+	assert not hasattr(interval.lower_bound, "__dict__")
+	assert not hasattr(interval.get_linked_bounds()[0], "__dict__")
+	assert not hasattr(interval.link_replace(["a"]), "__dict__")
+	weakref.ref(Bound(0, PART_OF_RIGHT))
+
+
+def test_linked_objects_are_optional():
+	interval = Interval.closed(0, 10)
+	assert interval.linked_objects == tuple()
+	linked = interval.link_replace(["a"]).link_merge(["b"])
+	assert linked.linked_objects == ("a", "b")
+	assert interval.linked_objects == tuple()
@@ -0,0 +1,41 @@
+import itertools
+import random
+
+import pytest
+
+from nicks_intervals.Interval import Interval
+from nicks_intervals.Multi_Interval import Multi_Interval
+import nicks_intervals._operators as ops
+import nicks_intervals._streaming as streaming
+
+from helpers import random_interval
+
+
+def random_sorted_intervals(rng: random.Random):
+	return sorted((random_interval(rng) for _ in range(rng.randint(0, 8))), key=lambda item: (item.lower_bound.value, item.lower_bound.part_of_left))
+
+
+def test_streaming_same_as_operators():
+	rng = random.Random(0)
+	for _ in range(500):
+		a = random_sorted_intervals(rng)
+		b = random_sorted_intervals(rng)
+		assert Multi_Interval(streaming.subtract(iter(a), iter(b))) == Multi_Interval(ops.subtract(a, b))
+		assert Multi_Interval(streaming.intersect(iter(a), iter(b))) == Multi_Interval(ops.intersect(a, b))
+		assert Multi_Interval(streaming.exterior(iter(a))) == Multi_Interval(ops.exterior(a))
+		assert Multi_Interval(streaming.union_merge_intersecting(iter(a), iter(b))) == Multi_Interval(ops.union_merge_intersecting(a, b))
+		assert Multi_Interval(streaming.union_merge_intersecting_or_touching(iter(a), iter(b))) == Multi_Interval(ops.union_merge_intersecting_or_touching(a, b))
+
+
+def test_streaming_is_lazy():
+	# both inputs are unbounded; results are still produced one at a time
+	a = (Interval.closed_open(position, position + 10) for position in itertools.count(0, 10))
+	b = (Interval.closed(position, position + 1) for position in itertools.count(0, 5))
+	assert list(itertools.islice(streaming.subtract(a, b), 3)) == [Interval.open(1, 5), Interval.open(6, 10), Interval.open(11, 15)]
+
+
+def test_streaming_checks_order():
+	with pytest.raises(Exception):
+		list(streaming.subtract([Interval.closed(5, 6), Interval.closed(0, 1)], []))
+	with pytest.raises(Exception):
+		list(streaming.union_merge_intersecting([Interval.closed(0, 1)], [Interval.open(5, 6), Interval.closed(5, 6)]))
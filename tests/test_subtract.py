@@ -1,6 +1,7 @@
 
 from nicks_intervals.Interval import Interval
 from nicks_intervals.Multi_Interval import Multi_Interval
+import nicks_intervals._operators as ops
 
 
 def test_subtract():
@@ -47,3 +48,12 @@ def torture_test_subtract():
 	ints = [Interval.open(a, a + 0.5) for a in range(10000)]
 	ints_comp = [Interval.inf_closed(0), *[Interval.closed(a + 0.5, a + 1) for a in range(9999)], Interval.closed_inf(9999.5)]
 	assert inf.subtract(ints) == ints_comp
+
+
+def test_subtract_heavily_overlapping_minuend():
+	# every minuend interval overlaps every other one; each must be cut by the subtrahend independently
+	minuend = Multi_Interval([Interval.closed(0, 100 + index) for index in range(200)])
+	subtrahend = Multi_Interval([Interval.open(a, a + 1) for a in range(0, 300, 2)])
+	result = minuend.subtract(subtrahend)
+	assert len(result) == sum(len(Interval.closed(0, 100 + index).subtract(subtrahend)) for index in range(200))
+	assert ops.intersect(result, subtrahend) == []
@@ -0,0 +1,24 @@
+import itertools
+import random
+
+from nicks_intervals.Interval import Interval
+import nicks_intervals._operators as ops
+
+from helpers import random_interval
+
+
+def test_sorted_bounds_same_order_as_linked_bounds():
+	rng = random.Random(0)
+	for _ in range(200):
+		intervals = [random_interval(rng) for _ in range(rng.randint(0, 10))]
+		expected = sorted(itertools.chain.from_iterable(ops.get_linked_bounds(interval) for interval in intervals))
+		result = [bound for _, bound, _ in ops.get_sorted_linked_bounds_with_stack_height(intervals)]
+		assert [(bound.bound, bound.is_lower_bound, id(bound.interval)) for bound in result] == [(bound.bound, bound.is_lower_bound, id(bound.interval)) for bound in expected]
+
+
+def test_iter_bound_pairs_returns_original_bounds():
+	a = [Interval.closed(0, 10), Interval.open(5, 20)]
+	pairs = list(ops.iter_bound_pairs(a))
+	assert [is_interior for _, _, is_interior in pairs] == [False, True, True, True, False]
+	assert pairs[1][0] is a[0].lower_bound
+	assert pairs[3][1] is a[1].upper_bound
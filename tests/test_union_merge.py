@@ -0,0 +1,54 @@
+import random
+
+from nicks_intervals.Interval import Interval
+from nicks_intervals.Multi_Interval import Multi_Interval
+import nicks_intervals._operators as ops
+
+from helpers import random_interval
+
+
+def random_disjoint_intervals(rng: random.Random, count: int):
+	result = []
+	position = 0
+	for _ in range(count):
+		length = rng.randint(1, 4)
+		result.append(rng.choice([Interval.closed_open, Interval.open_closed, Interval.open])(position, position + length))
+		position += length + rng.randint(0, 1)
+	rng.shuffle(result)
+	return result
+
+
+def test_merge():
+	assert Multi_Interval([Interval.closed(0, 10), Interval.closed(5, 15), Interval.closed(20, 30)]).merge_intersecting() == Multi_Interval([Interval.closed(0, 15), Interval.closed(20, 30)])
+	assert Multi_Interval([Interval.closed_open(0, 10), Interval.closed(10, 15)]).merge_intersecting() == Multi_Interval([Interval.closed_open(0, 10), Interval.closed(10, 15)])
+	assert Multi_Interval([Interval.closed_open(0, 10), Interval.closed(10, 15)]).merge_touching() == Interval.closed(0, 15)
+	assert Multi_Interval([Interval.closed(0, 10), Interval.closed(10, 15)]).merge_touching() == Multi_Interval([Interval.closed(0, 10), Interval.closed(10, 15)])
+	assert Multi_Interval([Interval.closed(0, 10), Interval.closed(10, 15)]).merge_intersecting_or_touching() == Interval.closed(0, 15)
+
+	# intervals of 'a' are only merged with each other through an interval of 'b'
+	a = Multi_Interval([Interval.closed_open(0, 5), Interval.closed_open(5, 10)])
+	assert a.union_merge_touching(Interval.closed(20, 30)) == Multi_Interval([Interval.closed_open(0, 5), Interval.closed_open(5, 10), Interval.closed(20, 30)])
+	assert a.union_merge_touching(Interval.closed(10, 30)) == Interval.closed(0, 30)
+
+
+def test_union_merge_by_sweep_same_as_union_merge_on_predicate():
+	rng = random.Random(0)
+	for _ in range(300):
+		a = [random_interval(rng) for _ in range(rng.randint(0, 6))]
+		b = [random_interval(rng) for _ in range(rng.randint(0, 6))]
+		for predicate in (ops.intersects_atomic, ops.intersects_or_touches_atomic):
+			assert Multi_Interval(ops.union_merge_on_predicate(a, b, predicate)) == Multi_Interval(ops.union_merge_on_predicate(a, b, lambda x, y: predicate(x, y)))
+
+		a = random_disjoint_intervals(rng, rng.randint(0, 6))
+		b = random_disjoint_intervals(rng, rng.randint(0, 6))
+		b = [b_interval for b_interval in b if not ops.intersects(a, b_interval)]
+		assert Multi_Interval(ops.union_merge_touching(a, b)) == Multi_Interval(ops.union_merge_on_predicate(a, b, lambda x, y: ops.touches_atomic(x, y)))
+
+
+def test_union_merge_linked():
+	a = [Interval.closed_open(0, 5).link_replace(["a"])]
+	b = [Interval.closed(5, 10).link_replace(["b"]), Interval.closed(20, 30).link_replace(["c"])]
+	result = sorted(ops.union_merge_intersecting_or_touching_linked(a, b), key=lambda item: item.lower_bound.value)
+	assert result == [Interval.closed(0, 10), Interval.closed(20, 30)]
+	assert result[0].linked_objects == ("a", "b")
+	assert result[1].linked_objects == ("c",)